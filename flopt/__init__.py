@@ -2,9 +2,10 @@ from flopt.env import Environment
 
 env = Environment()
 
-from flopt.variable import Variable
+from flopt.variable import Variable, Parameter
+from flopt.constraint import MatrixConstraint
 from flopt.container import FloptNdarray as variable_ndarray
-from flopt.expression import CustomExpression
+from flopt.expression import CustomExpression, TourDistance
 from flopt.problem import Problem
 from flopt.solvers import (
     Solver,
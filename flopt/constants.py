@@ -52,6 +52,7 @@ class VariableType(enum.IntEnum):
     Permutation = 104
     Any = 105  # Number | Permutation
     Number = 106  # Continuous | Integer | Binary | Spin
+    Parameter = 107  # not a decision variable
 
     def __str__(self):
         return self.name
@@ -1,5 +1,12 @@
-from flopt.constants import ConstraintType, number_classes
-from flopt.env import setup_logger, create_variable_mode
+import numpy as np
+
+from flopt.constants import ConstraintType, number_classes, np_float
+from flopt.env import (
+    setup_logger,
+    create_variable_mode,
+    get_variable_lower_bound,
+    get_variable_upper_bound,
+)
 
 logger = setup_logger(__name__)
 
@@ -73,6 +80,54 @@ class Constraint:
         self.expression = self.expression.toSpin()
         return self
 
+    def canonicalForm(self, ndigits=12):
+        """normalized form to find equivalent constraints
+
+        Terms of a polynomial constraint are sorted by the names of variables,
+        and coefficients are scaled so that the first one is 1 (or -1 for le type).
+        So constraints which are the same up to a positive scaling
+        (any nonzero scaling for eq type) have the same form.
+
+        Parameters
+        ----------
+        ndigits : int
+            coefficients are rounded to ndigits after the scaling
+
+        Returns
+        -------
+        tuple
+            hashable form of this constraint
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            import flopt
+            a = flopt.Variable("a")
+            b = flopt.Variable("b")
+
+            (a + b >= 1).canonicalForm() == (2 - 2 * a <= 2 * b).canonicalForm()
+            >>> True
+        """
+        if not self.expression.isPolynomial():
+            return (self._type, self.expression.getName())
+        polynomial = self.expression.toPolynomial()
+        terms = sorted(
+            (tuple(sorted((var.name, exp) for var, exp in mono)), coeff * mono.coeff)
+            for mono, coeff in polynomial
+            if coeff * mono.coeff != 0
+        )
+        constant = polynomial.constant()
+        scale = terms[0][1] if terms else (constant if constant != 0 else 1)
+        if self._type == ConstraintType.Le:
+            scale = abs(scale)
+        return (
+            self._type,
+            tuple((key, round(coeff / scale, ndigits)) for key, coeff in terms),
+            round(constant / scale, ndigits),
+        )
+
     def __rshift__(self, other):
         """If self is satisfied, then other must be satisfied
 
@@ -104,13 +159,23 @@ class Constraint:
                 return v
             return vv if (vv := v - slide_epsilon) != 0 else vv - slide_epsilon
 
+        def lower_bound(expression):
+            """Lower bound of expression by interval arithmetic (big-M value)"""
+            lb, _ = expression.bounds()
+            return get_variable_lower_bound() if np.isinf(lb) else lb
+
+        def upper_bound(expression):
+            """Upper bound of expression by interval arithmetic (big-M value)"""
+            _, ub = expression.bounds()
+            return get_variable_upper_bound() if np.isinf(ub) else ub
+
         constraints = []
         x = self.expression
         y = other.expression
 
         with create_variable_mode():
             delta = flopt.Variable(f"delta", cat="Binary")
-        constraints += [sazm(x.min()) * delta <= x - epsilon]
+        constraints += [sazm(lower_bound(x)) * delta <= x - epsilon]
 
         if self.type() == ConstraintType.Le:
             indicator = delta
@@ -118,13 +183,13 @@ class Constraint:
             with create_variable_mode():
                 theta = flopt.Variable(f"theta", cat="Binary")
                 sigma = flopt.Variable(f"sigma", cat="Binary")
-            constraints += [sazp(x.max()) * theta <= x + epsilon]
+            constraints += [sazp(upper_bound(x)) * theta <= x + epsilon]
             constraints += [sigma >= theta + delta - 1]
             indicator = sigma
 
-        constraints += [y <= sazp(y.max()) * (1 - indicator)]
+        constraints += [y <= sazp(upper_bound(y)) * (1 - indicator)]
         if other.type() == ConstraintType.Eq:
-            constraints += [y >= sazm(y.min()) * (1 - indicator)]
+            constraints += [y >= sazm(lower_bound(y)) * (1 - indicator)]
 
         return constraints
 
@@ -145,3 +210,142 @@ class Constraint:
 
     def __repr__(self):
         return f"Constraint({self.expression!r}, {self._type}, {self.name})"
+
+
+class MatrixConstraint:
+    """Block of linear constraints stored as a matrix
+
+    - le type  Ax <= b
+    - eq type  Ax == b
+
+    Rows are kept in the matrix, and they are converted into Constraint
+    objects only when a solver needs their expressions.
+
+    Parameters
+    ----------
+    A : array-like or scipy.sparse matrix
+        coefficient matrix of shape (m, n)
+    x : array-like of VarElement family
+        variables of size n
+    sense : {"<=", ">=", "=="}
+    b : array-like or number
+        right-hand side of size m
+    name : str, optional
+        name of the block. rows are named "{name}_{i}"
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import numpy as np
+        import flopt
+
+        # assignment constraints: each row of X is assigned exactly once
+        n = 3
+        X = flopt.Variable.array("X", (n, n), cat="Binary")
+        A = np.kron(np.eye(n), np.ones(n))  # A.dot(X.ravel()) is the sum of rows
+
+        prob = flopt.Problem()
+        prob += flopt.MatrixConstraint(A, X.ravel(), "==", 1, name="assign")
+    """
+
+    def __init__(self, A, x, sense, b, name=None):
+        from scipy.sparse import csr_matrix
+
+        from flopt.container import FloptNdarray
+
+        assert sense in {"<=", ">=", "=="}, f"sense must be <=, >= or ==, got {sense}"
+        A = csr_matrix(A, dtype=np_float)
+        b = np.broadcast_to(np.asarray(b, dtype=np_float), (A.shape[0],))
+        if sense == ">=":
+            A, b = -A, -b
+        x = np.asarray(x, dtype=object).ravel()
+        assert A.shape[1] == len(x), f"A has {A.shape[1]} columns, but x has {len(x)}"
+        self.A = A
+        self.x = FloptNdarray(x)
+        self.b = np.array(b)
+        self._type = ConstraintType.Eq if sense == "==" else ConstraintType.Le
+        self.name = name
+        self.constraints = None
+
+    def clone(self):
+        """
+        Returns
+        -------
+        MatrixConstraint
+        """
+        sense = "==" if self._type == ConstraintType.Eq else "<="
+        return MatrixConstraint(self.A, self.x, sense, self.b, self.name)
+
+    def type(self):
+        return self._type
+
+    def value(self, solution=None):
+        """
+        Returns
+        -------
+        np.ndarray
+            Ax - b
+        """
+        var_dict = solution.toDict() if solution is not None else {}
+        values = np.array(
+            [var_dict.get(var.name, var).value() for var in self.x], dtype=np_float
+        )
+        return self.A.dot(values) - self.b
+
+    def feasible(self, solution=None):
+        values = self.value(solution)
+        if self._type == ConstraintType.Eq:
+            return bool(np.all(values == 0))
+        # self._type == ConstraintType.Le
+        return bool(np.all(values <= 0))
+
+    def getVariables(self):
+        return set(self.x)
+
+    def isLinear(self):
+        return True
+
+    def getNames(self):
+        """
+        Returns
+        -------
+        list of str or None
+            names of rows
+        """
+        if self.name is None:
+            return [None] * len(self)
+        return [f"{self.name}_{i}" for i in range(len(self))]
+
+    def toConstraints(self):
+        """
+        Returns
+        -------
+        list of Constraint
+            constraint of each row, which is created at the first call
+        """
+        if self.constraints is None:
+            from flopt.expression import Sum
+
+            self.constraints = []
+            A = self.A
+            for i, name in enumerate(self.getNames()):
+                begin, end = A.indptr[i], A.indptr[i + 1]
+                coeffs, indices = A.data[begin:end], A.indices[begin:end]
+                expression = Sum(
+                    [coeff * var for coeff, var in zip(coeffs, self.x[indices])]
+                )
+                const = Constraint(expression - self.b[i], self._type, name)
+                self.constraints.append(const)
+        return self.constraints
+
+    def __len__(self):
+        return self.A.shape[0]
+
+    def __str__(self):
+        type_str = "==" if self._type == ConstraintType.Eq else "<="
+        return f"A x {type_str} b, A: {self.A.shape[0]}x{self.A.shape[1]} ({self.A.nnz} nonzeros)"
+
+    def __repr__(self):
+        return f"MatrixConstraint({self.A.shape}, {self._type}, {self.name})"
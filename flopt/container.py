@@ -4,6 +4,9 @@ import functools
 
 import numpy as np
 
+from flopt.constraint import MatrixConstraint
+from flopt.constants import number_classes, np_float
+
 
 class FloptNdarray(np.ndarray):
     def __new__(cls, array, *args, **kwargs):
@@ -44,3 +47,166 @@ class FloptNdarray(np.ndarray):
         for i in itertools.product(*map(range, self.shape)):
             self[i].simplify()
         return self
+
+    def __rmatmul__(self, other):
+        """A @ x of a numeric matrix A and a variable vector x is MatrixExpression"""
+        from flopt.variable import VarElement
+
+        A = other
+        if not hasattr(other, "tocsr"):  # not scipy.sparse
+            A = np.asarray(other)
+        if (
+            A.ndim == 2
+            and self.ndim == 1
+            and A.dtype.kind in "biuf"
+            and all(isinstance(var, VarElement) for var in self)
+        ):
+            return MatrixExpression(A, self)
+        return super().__rmatmul__(other)
+
+
+def is_numeric(x):
+    return isinstance(x, number_classes) or np.asarray(x).dtype.kind in "biuf"
+
+
+class MatrixExpression:
+    """Linear expressions A x + c of the rows of a matrix
+
+    It is created by A @ x of a numeric matrix A (numpy.ndarray or list)
+    and a one dimensional FloptNdarray x of variables.
+    The comparison with numbers creates one MatrixConstraint,
+    and the expression of each row is created only when it is accessed.
+
+    scipy.sparse matrices do not defer @ to FloptNdarray,
+    so MatrixConstraint(A, x, sense, b) is used for them directly.
+
+    Parameters
+    ----------
+    A : array-like or scipy.sparse matrix
+        coefficient matrix of shape (m, n)
+    x : FloptNdarray
+        variables of size n
+    c : array-like or number
+        constant of size m
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import numpy as np
+        import flopt
+
+        x = flopt.Variable.array("x", 3, lowBound=0)
+        A = np.array([[1, 2, 0], [0, 1, 1]])
+
+        prob = flopt.Problem()
+        prob += A @ x <= [4, 3]  # one MatrixConstraint
+    """
+
+    __array_ufunc__ = None  # numpy defers the operators (e.g. b >= A @ x)
+
+    def __init__(self, A, x, c=0):
+        from scipy.sparse import csr_matrix
+
+        self.A = csr_matrix(A, dtype=np_float)
+        self.x = x
+        self.c = np.broadcast_to(np.asarray(c, dtype=np_float), (self.A.shape[0],))
+        self.array = None
+
+    @property
+    def shape(self):
+        return (self.A.shape[0],)
+
+    @property
+    def ndim(self):
+        return 1
+
+    def value(self, solution=None, var_dict=None):
+        """
+        Returns
+        -------
+        np.ndarray
+            Ax + c
+        """
+        return self.A.dot(self.x.value(solution, var_dict)) + self.c
+
+    def toArray(self):
+        """
+        Returns
+        -------
+        FloptNdarray
+            expression of each row, which is created at the first call
+        """
+        if self.array is None:
+            from flopt.expression import Sum
+
+            A = self.A
+            rows = []
+            for i in range(A.shape[0]):
+                begin, end = A.indptr[i], A.indptr[i + 1]
+                coeffs, indices = A.data[begin:end], A.indices[begin:end]
+                terms = [coeff * var for coeff, var in zip(coeffs, self.x[indices])]
+                rows.append(Sum(terms) + self.c[i])
+            self.array = FloptNdarray(rows)
+        return self.array
+
+    def __le__(self, other):
+        if is_numeric(other):
+            return MatrixConstraint(self.A, self.x, "<=", other - self.c)
+        return self.toArray() <= other
+
+    def __ge__(self, other):
+        if is_numeric(other):
+            return MatrixConstraint(self.A, self.x, ">=", other - self.c)
+        return self.toArray() >= other
+
+    def __eq__(self, other):
+        if is_numeric(other):
+            return MatrixConstraint(self.A, self.x, "==", other - self.c)
+        return self.toArray() == other
+
+    __hash__ = None
+
+    def __add__(self, other):
+        if is_numeric(other):
+            return MatrixExpression(self.A, self.x, self.c + other)
+        return self.toArray() + other
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        if is_numeric(other):
+            return MatrixExpression(self.A, self.x, self.c - other)
+        return self.toArray() - other
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        if isinstance(other, number_classes):
+            return MatrixExpression(self.A * other, self.x, self.c * other)
+        return self.toArray() * other
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __neg__(self):
+        return MatrixExpression(-self.A, self.x, -self.c)
+
+    def __len__(self):
+        return self.A.shape[0]
+
+    def __iter__(self):
+        return iter(self.toArray())
+
+    def __getitem__(self, key):
+        return self.toArray()[key]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.toArray(), dtype=dtype)
+
+    def __repr__(self):
+        m, n = self.A.shape
+        return f"MatrixExpression({m}x{n}, {self.A.nnz} nonzeros)"
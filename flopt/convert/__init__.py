@@ -9,3 +9,5 @@ from flopt.convert.structure import (
 from flopt.convert._pulp import flopt_to_pulp, pulp_to_flopt
 from flopt.convert.linearize import linearize
 from flopt.convert.binarize import binarize
+from flopt.convert.presolve import presolve, PostsolveMap
+from flopt.convert.serialize import save_problem, load_problem
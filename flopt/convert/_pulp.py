@@ -1,6 +1,5 @@
 import flopt
 from flopt.solution import Solution
-from flopt.solvers.pulp_search import PulpSearch
 
 
 def flopt_to_pulp(prob):
@@ -40,6 +39,8 @@ def flopt_to_pulp(prob):
         from flopt.solvers.convert import flopt_to_pulp
         lp_prob, lp_solution = flopt_to_pulp(prob)
     """
+    from flopt.solvers.pulp_search import PulpSearch
+
     assert PulpSearch().available(prob, verbose=True)
     solution = Solution(prob.getVariables())
     lp_prob, lp_solution = PulpSearch().createLpProblem(solution, prob)
@@ -76,7 +76,8 @@ def binarize(prob):
     """
     binarizes = {}
     prob.obj = binarize_expression(prob.obj, binarizes)
-    for const in prob.getConstraints():
+    # matrix constraints are kept since the variables are linked to their binaries
+    for const in prob.constraints:
         const.expression = binarize_expression(const.expression, binarizes)
 
     for source, binaries in binarizes.items():
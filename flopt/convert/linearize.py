@@ -1,5 +1,7 @@
-from flopt.variable import Variable, VarElement
-from flopt.expression import Expression, Const
+from flopt.variable import Variable
+from flopt.constraint import MatrixConstraint
+from flopt.polynomial import Monomial, Polynomial
+from flopt.expression import polynomial_to_expression
 from flopt.convert.binarize import binarize
 from flopt.constants import VariableType
 from flopt.env import setup_logger, create_variable_mode
@@ -11,13 +13,15 @@ class LinearizeError(Exception):
     pass
 
 
-class NeedToBinarize(Exception):
-    pass
-
-
 def linearize(prob):
     """linearize of problem
 
+    Each product of variables in the polynomial forms of the objective and
+    constraints is replaced with a new variable. Product variables are shared by
+    all expressions, and their constraints are added as one MatrixConstraint.
+    If a product includes spin variables or more than one integer or continuous
+    variable, the problem is binarized before the linearization.
+
     Parameters
     ----------
     prob : Problem
@@ -55,194 +59,210 @@ def linearize(prob):
         >>>  Name: None
         >>>   Type         : Problem
         >>>   sense        : minimize
-        >>>   objective    : 0-mul_1+x_0-(2*x_1)
+        >>>   objective    : x_0+(-2*x_1)+(-1*__1_mul)
         >>>   #constraints : 6
         >>>   #variables   : 5 (Binary 5)
 
-        >>>   C 0, name for_mul_0_1, mul_0-x_0 <= 0
-        >>>   C 1, name for_mul_0_2, mul_0-x_1 <= 0
-        >>>   C 2, name for_mul_0_3, mul_0-(x_0+x_1-1) >= 0
-        >>>   C 3, name for_mul_1_1, mul_1-mul_0 <= 0
-        >>>   C 4, name for_mul_1_2, mul_1-x_2 <= 0
-        >>>   C 5, name for_mul_1_3, mul_1-(mul_0+x_2-1) >= 0
+        >>>   M 0, name for_mul, A x <= b, A: 6x5 (14 nonzeros)
 
     """
+
+    def nonlinear_polynomials():
+        # matrix constraints are linear
+        targets = [const for const in prob.constraints if not const.isLinear()]
+        if not prob.obj.isLinear():
+            targets.append(prob)
+        polynomials = []
+        for target in targets:
+            expression = target.obj if target is prob else target.expression
+            if not expression.isPolynomial():
+                raise LinearizeError()
+            polynomials.append((target, expression.toPolynomial().simplify()))
+        return polynomials
+
     try:
-        var_muls = {}
-        prob.setObjective(linearize_expression(prob.obj, var_muls))
-        for const in prob.getConstraints():
-            const.expression = linearize_expression(const.expression, var_muls)
-    except NeedToBinarize:
-        logger.info(
-            f"problem will be binarized because it includes dislinearable multipry"
-        )
-        return linearize(binarize(prob))
-    except LinearizeError as e:
+        polynomials = nonlinear_polynomials()
+        if any(
+            need_binarize(mono)
+            for _, polynomial in polynomials
+            for mono, _ in polynomial
+        ):
+            logger.info(
+                f"problem will be binarized because it includes dislinearable multipry"
+            )
+            binarize(prob)
+            polynomials = nonlinear_polynomials()
+    except LinearizeError:
         logger.error(f"this problem can not be linearized")
-    except Exception as e:
-        raise e
+        return prob
+
+    products = dict()
+    for target, polynomial in polynomials:
+        expression = polynomial_to_expression(
+            linearize_polynomial(polynomial, products)
+        )
+        if target is prob:
+            prob.setObjective(expression, prob.obj_name)
+        else:
+            target.expression = expression
+    prob.clearCache()
 
     # add constraints for variable-multipry
-    for (var_a, var_b), var_mul in var_muls.items():
-        # (Binary, Binary)
-        if {var_a.type(), var_b.type()} == {VariableType.Binary}:
-            prob += var_mul <= var_a, f"for_{var_mul.name}_1"
-            prob += var_mul <= var_b, f"for_{var_mul.name}_2"
-            prob += var_mul >= var_a + var_b - 1, f"for_{var_mul.name}_3"
-        # (Binary, Integer)
-        elif {var_a.type(), var_b.type()} == {
-            VariableType.Binary,
-            VariableType.Integer,
-        }:
-            if var_a.type() == VariableType.Binary:
-                var_bin, var_int = var_a, var_b
-            else:
-                var_bin, var_int = var_b, var_a
-            l = var_int.getLb(number=True)
-            u = var_int.getUb(number=True)
-            prob += var_mul >= l * var_bin, f"for_{var_mul.name}_1"
-            prob += var_mul <= u * var_bin, f"for_{var_mul.name}_2"
-            prob += var_mul >= var_int - u * (1 - var_bin), f"for_{var_mul.name}_3"
-            prob += var_mul <= var_int - l * (1 - var_bin), f"for_{var_mul.name}_4"
-        #  (Binary, Continuous)
-        elif {var_a.type(), var_b.type()} == {
-            VariableType.Binary,
-            VariableType.Continuous,
-        }:
-            if var_a.type() == VariableType.Binary:
-                var_bin, var_con = var_a, var_b
-            else:
-                var_bin, var_con = var_b, var_a
-            l = var_con.getLb(number=True)
-            u = var_con.getUb(number=True)
-            prob += var_mul >= l * var_bin, f"for_{var_mul.name}_1"
-            prob += var_mul <= u * var_bin, f"for_{var_mul.name}_2"
-            prob += var_mul >= var_con - l * (1 - var_bin), f"for_{var_mul.name}_3"
-            prob += var_mul <= var_con - u * (1 - var_bin), f"for_{var_mul.name}_4"
+    if products:
+        prob += mccormick_constraint(products.values())
 
     return prob
 
 
-def linearize_expression(e, var_muls):
-    """linearize a expression
-
+def need_binarize(mono):
+    """
     Parameters
     ----------
-    e : Expresson or VarElement
-    var_muls : dict
-        var_muls[var_a, var_b] = var_c, where var_c = var_a * var_b
-    """
-    if isinstance(e, (VarElement, Const)):
-        return e
-    if e.isLinear():
-        return e
-    e.resetlinkChildren()
-
-    finish = False
-    while not finish:
-        finish, e = linearize_traverse(e, var_muls)
-        if finish and not e.isLinear():
-            e = e.expand()
-            e.resetlinkChildren()
-            finish = False
-    return e
+    mono : Monomial
+        simplified monomial
 
+    Returns
+    -------
+    bool
+        return true if mono must be binarized for linearize else false
 
-def linearize_traverse(e, var_muls):
-    """subroutine of linearize_expression
+    Raises
+    ------
+    LinearizeError
+        if mono includes a product of continuous variables
+    """
+    if mono.isLinear():
+        return False
+    degree, continuous_degree = 0, 0
+    for var, exp in mono:
+        if var.type() == VariableType.Spin:
+            return True
+        elif var.type() == VariableType.Integer:
+            degree += exp
+        elif var.type() == VariableType.Continuous:
+            degree += exp
+            continuous_degree += exp
+    if continuous_degree > 1:
+        raise LinearizeError()
+    return degree > 1
+
+
+def linearize_polynomial(polynomial, products):
+    """replace products of variables in polynomial with product variables
 
     Parameters
     ----------
-    e : Expresson or VarElement
-    var_muls : dict
-        var_muls[var_a, var_b] = var_c, where var_c = var_a * var_b
+    polynomial : Polynomial
+        simplified polynomial whose monomials include at most one integer or
+        continuous variable with exponent 1 except for binary variables
+    products : dict
+        products[name_a, name_b] = (var_mul, var_a, var_b), where var_mul = var_a * var_b
 
     Returns
     -------
-    bool
-        return true if a expession is linearized else false
+    Polynomial
     """
-    if is_var_mul(e):
-        if not is_linearable(e):
-            raise LinearizeError()
-        elif need_binarize(e):
-            raise NeedToBinarize()
-        var_mul = create_var_mul(e, var_muls)
-        return True, var_mul
-
-    for node in e.traverse():
-        if isinstance(node, Expression):
-            update = False
-            if is_var_mul(node.elmA):
-                if not is_linearable(node.elmA):
-                    raise LinearizeError()
-                elif need_binarize(node.elmA):
-                    raise NeedToBinarize()
-                node.elmA = create_var_mul(node.elmA, var_muls)
-                update = True
-            if is_var_mul(node.elmB):
-                if not is_linearable(node.elmB):
-                    raise LinearizeError()
-                elif need_binarize(node.elmB):
-                    raise NeedToBinarize()
-                node.elmB = create_var_mul(node.elmB, var_muls)
-                update = True
-            if update:
-                node.resetName()
-                node.polynomial = None
-                for parent in node.traverseAncestors():
-                    parent.resetName()
-                    parent.polynomial = None
-                return False, e
-    return True, e
-
-
-def create_var_mul(node, var_muls):
-    """create new variable and replace variable-multiply to it
+    terms = dict()
+    for mono, coeff in polynomial:
+        if not mono.isLinear():
+            var_mono, param_terms = mono.splitParameters()
+            # binary variables are multiplied first
+            variables = sorted(
+                var_mono.terms,
+                key=lambda var: (var.type() != VariableType.Binary, var.name),
+            )
+            var_mul = variables[0]
+            for var in variables[1:]:
+                var_mul = get_product(var_mul, var, products)
+            mono = Monomial({**param_terms, var_mul: 1}, mono.coeff)
+        terms[mono] = terms.get(mono, 0) + coeff
+    terms = {mono: coeff for mono, coeff in terms.items() if coeff != 0}
+    return Polynomial(terms, polynomial.constant())
+
+
+def get_product(var_a, var_b, products):
+    """get the variable of var_a * var_b, where var_a is binary
+
     Parameters
     ----------
-    node : Expression
-    var_muls : dict
-        stocked multiplized variables
+    var_a : VarBinary
+    var_b : VarElement family
+    products : dict
+        products[name_a, name_b] = (var_mul, var_a, var_b), where var_mul = var_a * var_b
+
+    Returns
+    -------
+    VarElement family
     """
-    var_a, var_b = sorted([node.elmA, node.elmB], key=lambda x: x.name)
-    if (var_a, var_b) not in var_muls:
-        # (Binary, Binary)
-        if {var_a.type(), var_b.type()} == {VariableType.Binary}:
-            with create_variable_mode():
-                var_mul = Variable(
-                    f"mul",
-                    cat="Binary",
-                    ini_value=var_a.value() * var_b.value(),
-                )
-        # (Binary, Integer)
-        elif {var_a.type(), var_b.type()} == {
-            VariableType.Binary,
-            VariableType.Integer,
-        }:
-            with create_variable_mode():
-                var_mul = Variable(
-                    f"mul",
-                    lowBound=get_lower_bound(var_a, var_b),
-                    upBound=get_upper_bound(var_a, var_b),
-                    cat="Integer",
-                    ini_value=var_a.value() * var_b.value(),
-                )
-        #  (Binary, Continuous)
-        elif {var_a.type(), var_b.type()} == {
-            VariableType.Binary,
-            VariableType.Continuous,
-        }:
-            with create_variable_mode():
+    if var_b.type() == VariableType.Binary and var_b.name < var_a.name:
+        var_a, var_b = var_b, var_a
+    key = var_a.name, var_b.name
+    if key not in products:
+        ini_value = var_a.value() * var_b.value()
+        with create_variable_mode():
+            if var_b.type() == VariableType.Binary:
+                var_mul = Variable("mul", cat="Binary", ini_value=ini_value)
+            else:
                 var_mul = Variable(
-                    f"mul",
+                    "mul",
                     lowBound=get_lower_bound(var_a, var_b),
                     upBound=get_upper_bound(var_a, var_b),
-                    cat="Continuous",
-                    ini_value=var_a.value() * var_b.value(),
+                    cat=var_b.type(),
+                    ini_value=ini_value,
                 )
-        var_muls[var_a, var_b] = var_mul
-    return var_muls[var_a, var_b]
+        products[key] = (var_mul, var_a, var_b)
+    return products[key][0]
+
+
+def mccormick_constraint(products):
+    """create the constraints of product variables as a matrix
+
+    - (Binary, Binary): z <= a, z <= b, z >= a + b - 1
+    - (Binary, Integer or Continuous in [l, u]):
+      z >= l a, z <= u a, z >= b - u (1 - a), z <= b - l (1 - a)
+
+    Parameters
+    ----------
+    products : iterable of tuple
+        (var_mul, var_a, var_b), where var_mul = var_a * var_b and var_a is binary
+
+    Returns
+    -------
+    MatrixConstraint
+    """
+    from scipy.sparse import csr_matrix
+
+    x, index = [], dict()
+
+    def col(var):
+        if var.name not in index:
+            index[var.name] = len(x)
+            x.append(var)
+        return index[var.name]
+
+    data, indices, indptr, b = [], [], [0], []
+
+    def add_row(row, rhs):
+        for var, coeff in row:
+            indices.append(col(var))
+            data.append(coeff)
+        indptr.append(len(indices))
+        b.append(rhs)
+
+    for z, var_a, var_b in products:
+        if var_b.type() == VariableType.Binary:
+            add_row([(z, 1), (var_a, -1)], 0)
+            add_row([(z, 1), (var_b, -1)], 0)
+            add_row([(var_a, 1), (var_b, 1), (z, -1)], 1)
+        else:
+            l = var_b.getLb(number=True)
+            u = var_b.getUb(number=True)
+            add_row([(var_a, l), (z, -1)], 0)
+            add_row([(z, 1), (var_a, -u)], 0)
+            add_row([(var_b, 1), (var_a, u), (z, -1)], u)
+            add_row([(z, 1), (var_b, -1), (var_a, -l)], -l)
+    A = csr_matrix((data, indices, indptr), shape=(len(b), len(x)))
+    return MatrixConstraint(A, x, "<=", b, name="for_mul")
 
 
 def get_lower_bound(var_a, var_b):
@@ -283,71 +303,3 @@ def get_upper_bound(var_a, var_b):
     if var_other.upBound is None:
         return None
     return max(0, var_other.upBound)
-
-
-def is_var_mul(node):
-    """
-    Parameters
-    ----------
-    node : Expression or VarElement
-
-    Returns
-    -------
-    bool
-        return true if node is Expression and variable-multiply else false
-    """
-    return (
-        isinstance(node, Expression)
-        and node.operator == "*"
-        and isinstance(node.elmA, VarElement)
-        and isinstance(node.elmB, VarElement)
-    )
-
-
-def is_linearable(node):
-    """
-    Parameters
-    ----------
-    node : Expression or VarElement
-
-    Returns
-    -------
-    bool
-        return true if node is Expression and variable-multiply
-    """
-    assert is_var_mul(node)
-    linearable_pairs = [
-        {VariableType.Binary, VariableType.Binary},
-        {VariableType.Binary, VariableType.Integer},
-        {VariableType.Binary, VariableType.Continuous},
-        {VariableType.Binary, VariableType.Spin},
-        {VariableType.Spin, VariableType.Spin},
-        {VariableType.Spin, VariableType.Integer},
-        {VariableType.Spin, VariableType.Continuous},
-        {VariableType.Integer, VariableType.Integer},
-        {VariableType.Integer, VariableType.Continuous},
-    ]
-    return {node.elmA.type(), node.elmB.type()} in linearable_pairs
-
-
-def need_binarize(node):
-    """
-    Parameters
-    ----------
-    node : Expression or VarElement
-
-    Returns
-    -------
-    bool
-        return true if node must be binarized for linearize else false
-    """
-    assert is_var_mul(node)
-    need_binarize_pairs = [
-        {VariableType.Binary, VariableType.Spin},
-        {VariableType.Spin, VariableType.Spin},
-        {VariableType.Spin, VariableType.Integer},
-        {VariableType.Spin, VariableType.Continuous},
-        {VariableType.Integer, VariableType.Integer},
-        {VariableType.Integer, VariableType.Continuous},
-    ]
-    return {node.elmA.type(), node.elmB.type()} in need_binarize_pairs
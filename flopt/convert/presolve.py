@@ -0,0 +1,481 @@
+import math
+
+import numpy as np
+
+from flopt.expression import Expression, Const, SelfReturn
+from flopt.constraint import Constraint, MatrixConstraint
+from flopt.polynomial import Monomial, Polynomial
+from flopt.solution import Solution
+from flopt.constants import VariableType, ConstraintType, number_classes
+from flopt.env import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class PresolveInfeasible(Exception):
+    pass
+
+
+class PostsolveMap:
+    """Map from solutions of a presolved problem to the original problem
+
+    Parameters
+    ----------
+    variables : list of VarElement family
+        variables of the original problem
+    fixed : dict
+        key is the name of a removed variable and value is its fixed value
+    reduced_variables : dict
+        key is the name of a variable and value is the variable of the presolved problem
+
+    Attributes
+    ----------
+    variables : list of VarElement family
+    fixed : dict
+    reduced_variables : dict
+    """
+
+    def __init__(self, variables, fixed, reduced_variables):
+        self.variables = sorted(variables, key=lambda var: var.name)
+        self.fixed = fixed
+        self.reduced_variables = reduced_variables
+
+    def restore(self, solution=None):
+        """set values of the original variables from a solution of the presolved problem
+
+        Parameters
+        ----------
+        solution : Solution or None
+            solution of the presolved problem,
+            if it is None, the current values of the presolved variables are used
+
+        Returns
+        -------
+        Solution
+            solution of the original problem
+        """
+        var_dict = solution.toDict() if solution is not None else {}
+        for var in self.variables:
+            if var.name in self.fixed:
+                var.setValue(self.fixed[var.name])
+                continue
+            reduced_var = var_dict.get(var.name, self.reduced_variables[var.name])
+            if reduced_var is var:
+                continue
+            value = reduced_var.value()
+            if var.type() in {VariableType.Continuous, VariableType.Integer}:
+                # a variable which is not in the presolved problem can be out of bounds
+                if (lb := reduced_var.getLb()) is not None:
+                    value = max(value, lb)
+                if (ub := reduced_var.getUb()) is not None:
+                    value = min(value, ub)
+            var.setValue(value)
+        return Solution(self.variables)
+
+    def __len__(self):
+        return len(self.fixed)
+
+
+def presolve(prob, max_pass=10, tol=1e-9):
+    """reduce the problem before conversion and solving
+
+    - remove fixed variables, whose lower and upper bounds are the same
+      (e.g. variables fixed by VarElement.fixValue())
+    - convert linear constraints with one variable into bounds of the variable
+    - tighten bounds of variables by the activity of linear constraints
+    - remove linear constraints which are always satisfied within the bounds
+      or dominated by a parallel constraint
+
+    Bounds of the original variables are not changed.
+    The presolved problem has cloned variables with the same names.
+
+    Parameters
+    ----------
+    prob : Problem
+    max_pass : int
+        maximum number of passes over the constraints
+    tol : float
+        tolerance of the feasibility and the bound tightening
+
+    Returns
+    -------
+    Problem
+        presolved problem
+    PostsolveMap
+        map from solutions of the presolved problem to those of prob
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import flopt
+
+        x = flopt.Variable.array("x", 3, lowBound=0, upBound=10, cat="Integer")
+        x[2].setValue(3)
+        x[2].fixValue()
+
+        prob = flopt.Problem()
+        prob += x[0] + 2 * x[1] + x[2]
+        prob += x[0] + x[2] >= 5
+        prob += x[0] + x[1] <= 30
+
+        presolved, postsolve = flopt.convert.presolve(prob)
+        presolved.show()
+        >>> Name: None
+        >>>   Type         : Problem
+        >>>   sense        : Minimize
+        >>>   objective    : x_0+(2*x_1)+3
+        >>>   #constraints : 0
+        >>>   #variables   : 2 (Integer 2)
+        >>>
+        >>>   V 0, name x_0, Integer 2 <= x_0 <= 10
+        >>>   V 1, name x_1, Integer 0 <= x_1 <= 10
+
+        presolved.solve(solver="ScipyMilp")
+        solution = postsolve.restore(presolved.getSolution())
+    """
+    try:
+        return Presolver(prob, tol).run(max_pass)
+    except PresolveInfeasible as e:
+        logger.warning(f"presolve detects infeasibility ({e}), problem is not reduced")
+        variables = prob.getVariables()
+        return prob.clone(), PostsolveMap(
+            variables, {}, {var.name: var for var in variables}
+        )
+
+
+class Presolver:
+    """Reductions of presolve
+
+    Linear constraints are kept as rows (coeffs, constant, is_eq, name),
+    that represents sum(coeff * var) + constant <= 0 (or == 0).
+    name of a row of MatrixConstraint is (name of row, index of block).
+    Other constraints are kept as they are except for the substitution of fixed variables.
+    """
+
+    def __init__(self, prob, tol):
+        self.prob = prob
+        self.tol = tol
+        self.variables = {var.name: var for var in prob.getVariables()}
+        self.lb, self.ub, self.fixed = dict(), dict(), dict()
+        for name, var in self.variables.items():
+            if var.type() not in VariableType.Number.expand():
+                continue
+            lb, ub = var.getLb(), var.getUb()
+            self.lb[name] = lb if lb is not None else -math.inf
+            self.ub[name] = ub if ub is not None else math.inf
+            if self.lb[name] > self.ub[name]:
+                raise PresolveInfeasible(f"bounds of {name}")
+            if self.lb[name] == self.ub[name]:
+                self.fixed[name] = lb
+
+        self.rows, self.others = [], []
+        for const in prob.constraints:
+            if (linear := self.linearCoeffs(const)) is None:
+                self.others.append(const)
+                continue
+            is_eq = const.type() == ConstraintType.Eq
+            self.rows.append((*linear, is_eq, const.name))
+        self.blocks = []
+        for const in prob.matrix_constraints:
+            if any(var.name not in self.lb for var in const.x):
+                self.others += const.toConstraints()
+                continue
+            is_eq = const.type() == ConstraintType.Eq
+            A, names = const.A, [var.name for var in const.x]
+            for i, name in enumerate(const.getNames()):
+                coeffs = dict()
+                for j in range(A.indptr[i], A.indptr[i + 1]):
+                    var_name = names[A.indices[j]]
+                    coeffs[var_name] = coeffs.get(var_name, 0) + A.data[j]
+                self.rows.append((coeffs, -const.b[i], is_eq, (name, len(self.blocks))))
+            self.blocks.append(const)
+        self.alive = [True] * len(self.rows)
+
+    def linearCoeffs(self, const):
+        if not const.isLinear():
+            return None
+        polynomial = const.expression.toPolynomial()
+        if polynomial.hasParameters():
+            return None
+        coeffs = dict()
+        for mono, coeff in polynomial:
+            (var,) = mono.terms
+            if var.name not in self.lb:
+                return None
+            coeffs[var.name] = coeffs.get(var.name, 0) + coeff * mono.coeff
+        return coeffs, polynomial.constant()
+
+    def run(self, max_pass):
+        n_rows = len(self.rows)
+        for _ in range(max_pass):
+            changed = False
+            for i in range(len(self.rows)):
+                if self.alive[i]:
+                    changed |= self.reduceRow(i)
+            changed |= self.removeParallelRows()
+            if not changed:
+                break
+        logger.debug(
+            f"presolve removes {len(self.fixed)} variables "
+            f"and {n_rows - sum(self.alive)} linear constraints"
+        )
+        return self.createProblem()
+
+    def tighten(self, name, lb=-math.inf, ub=math.inf):
+        """tighten the bounds of variable, and return True if they are changed"""
+        var_type = self.variables[name].type()
+        if var_type == VariableType.Continuous:
+            # small improvements are ignored to avoid endless tightening
+            eps = 1e3 * self.tol * max(1.0, abs(lb))
+            lb = lb if lb > self.lb[name] + eps else self.lb[name]
+            eps = 1e3 * self.tol * max(1.0, abs(ub))
+            ub = ub if ub < self.ub[name] - eps else self.ub[name]
+        elif var_type == VariableType.Spin:
+            lb = 1 if lb > -1 + self.tol else self.lb[name]
+            ub = -1 if ub < 1 - self.tol else self.ub[name]
+        else:  # integer or binary
+            if lb > -math.inf:
+                lb = math.ceil(lb - self.tol)
+            if ub < math.inf:
+                ub = math.floor(ub + self.tol)
+            lb, ub = max(self.lb[name], lb), min(self.ub[name], ub)
+        if lb == self.lb[name] and ub == self.ub[name]:
+            return False
+        if lb > ub + self.tol:
+            raise PresolveInfeasible(f"bounds of {name}")
+        if ub - lb <= self.tol:
+            self.fixed[name] = lb
+            lb = ub = lb
+        self.lb[name], self.ub[name] = lb, ub
+        return True
+
+    def substituteFixed(self, i):
+        coeffs, constant, is_eq, name = self.rows[i]
+        if any(var_name in self.fixed for var_name in coeffs):
+            for var_name in [var_name for var_name in coeffs if var_name in self.fixed]:
+                constant += coeffs.pop(var_name) * self.fixed[var_name]
+            self.rows[i] = (coeffs, constant, is_eq, name)
+        return self.rows[i]
+
+    def reduceRow(self, i):
+        coeffs, constant, is_eq, name = self.substituteFixed(i)
+        coeffs = {var_name: a for var_name, a in coeffs.items() if a != 0}
+        self.rows[i] = (coeffs, constant, is_eq, name)
+
+        # empty row
+        if not coeffs:
+            if constant > self.tol or (is_eq and constant < -self.tol):
+                raise PresolveInfeasible(f"constraint {name}")
+            self.alive[i] = False
+            return True
+
+        # singleton row
+        if len(coeffs) == 1:
+            ((var_name, a),) = coeffs.items()
+            value = -constant / a
+            if is_eq:
+                self.tighten(var_name, value, value)
+            elif a > 0:
+                self.tighten(var_name, ub=value)
+            else:
+                self.tighten(var_name, lb=value)
+            self.alive[i] = False
+            return True
+
+        # activity: min_act <= sum(coeff * var) <= max_act
+        min_terms = {
+            var_name: a * (self.lb[var_name] if a > 0 else self.ub[var_name])
+            for var_name, a in coeffs.items()
+        }
+        max_terms = {
+            var_name: a * (self.ub[var_name] if a > 0 else self.lb[var_name])
+            for var_name, a in coeffs.items()
+        }
+        min_act, n_min_inf = activity(min_terms.values())
+        max_act, n_max_inf = activity(max_terms.values())
+        if n_min_inf == 0 and min_act + constant > self.tol:
+            raise PresolveInfeasible(f"constraint {name}")
+        if is_eq and n_max_inf == 0 and max_act + constant < -self.tol:
+            raise PresolveInfeasible(f"constraint {name}")
+        if not is_eq and n_max_inf == 0 and max_act + constant <= 0:
+            # always satisfied within the bounds
+            self.alive[i] = False
+            return True
+
+        changed = False
+        for var_name, a in coeffs.items():
+            # a * var <= - constant - (minimum activity of the other terms)
+            if (rest := residual(min_act, n_min_inf, min_terms[var_name])) is not None:
+                value = (-constant - rest) / a
+                if a > 0:
+                    changed |= self.tighten(var_name, ub=value)
+                else:
+                    changed |= self.tighten(var_name, lb=value)
+            if not is_eq:
+                continue
+            # a * var >= - constant - (maximum activity of the other terms)
+            if (rest := residual(max_act, n_max_inf, max_terms[var_name])) is not None:
+                value = (-constant - rest) / a
+                if a > 0:
+                    changed |= self.tighten(var_name, lb=value)
+                else:
+                    changed |= self.tighten(var_name, ub=value)
+        return changed
+
+    def removeParallelRows(self):
+        """remove rows dominated by a parallel row
+
+        Each row is normalized so that its first coefficient is 1 or -1,
+        rows are grouped by the normalized coefficients in a dictionary.
+        """
+        groups = dict()
+        for i in range(len(self.rows)):
+            if not self.alive[i]:
+                continue
+            coeffs, constant, is_eq, name = self.rows[i]
+            items = sorted(coeffs.items())
+            scale = abs(items[0][1])
+            if is_eq and items[0][1] < 0:
+                scale = -scale
+            key = tuple((var_name, round(a / scale, 12)) for var_name, a in items)
+            # normalized row: key * x <= rhs (or == rhs)
+            groups.setdefault(key, []).append((is_eq, -constant / scale, i))
+
+        changed = False
+        for key, rows in groups.items():
+            neg_key = tuple((var_name, -a) for var_name, a in key)
+            eq_rows = [(rhs, i) for is_eq, rhs, i in rows if is_eq]
+            le_rows = [(rhs, i) for is_eq, rhs, i in rows if not is_eq]
+            if eq_rows:
+                rhs, _ = eq_rows[0]
+                if any(abs(other - rhs) > self.tol for other, _ in eq_rows):
+                    raise PresolveInfeasible(f"parallel equality constraints")
+                dominated = [i for _, i in eq_rows[1:]]
+                for le_rhs, i in le_rows:
+                    if le_rhs < rhs - self.tol:
+                        raise PresolveInfeasible(f"parallel constraints")
+                    dominated.append(i)
+                for le_rhs, i in [
+                    (le_rhs, i)
+                    for is_eq, le_rhs, i in groups.get(neg_key, [])
+                    if not is_eq
+                ]:
+                    # -key * x <= le_rhs is satisfied by key * x == rhs
+                    if -le_rhs > rhs + self.tol:
+                        raise PresolveInfeasible(f"parallel constraints")
+                    dominated.append(i)
+            elif le_rows:
+                dominated = [i for _, i in sorted(le_rows)[1:]]
+            else:
+                dominated = []
+            for i in dominated:
+                self.alive[i] = False
+            changed |= bool(dominated)
+        return changed
+
+    def createProblem(self):
+        from flopt.problem import Problem
+
+        prob = self.prob
+        reduced_variables, var_dict = dict(), dict()
+        for name, var in self.variables.items():
+            if name in self.fixed:
+                value = self.fixed[name]
+                if var.type() != VariableType.Continuous:
+                    value = round(value)
+                self.fixed[name] = value
+                # plain number, since the arithmetic of Expression assumes that
+                # negative ExpressionElements are in the form of -1 * elm
+                var_dict[name] = SelfReturn(value)
+                continue
+            if name in self.lb:
+                var = var.clone()
+                if var.type() in {VariableType.Continuous, VariableType.Integer}:
+                    lb, ub = self.lb[name], self.ub[name]
+                    var.lowBound = lb if lb > -math.inf else None
+                    var.upBound = ub if ub < math.inf else None
+            reduced_variables[name] = var
+            var_dict[name] = SelfReturn(var)
+
+        presolved = Problem(name=prob.name, sense=prob.sense)
+        presolved.setObjective(prob.obj.value(var_dict=var_dict), prob.obj_name)
+        for const in self.others:
+            expression = const.expression.value(var_dict=var_dict)
+            if isinstance(expression, number_classes):
+                expression = Const(expression)
+            presolved.addConstraint(
+                Constraint(expression, const.type(), const.name), const.name
+            )
+        block_rows = [[] for _ in self.blocks]
+        for i, (coeffs, constant, is_eq, name) in enumerate(self.rows):
+            if not self.alive[i]:
+                continue
+            coeffs, constant, is_eq, name = self.substituteFixed(i)
+            if isinstance(name, tuple):
+                block_rows[name[1]].append((coeffs, constant))
+                continue
+            polynomial = Polynomial(
+                {
+                    Monomial({reduced_variables[var_name]: 1}): a
+                    for var_name, a in coeffs.items()
+                },
+                constant,
+            )
+            expression = Expression.fromPolynomial(polynomial)
+            const_type = ConstraintType.Eq if is_eq else ConstraintType.Le
+            presolved.addConstraint(Constraint(expression, const_type, name), name)
+        for const, rows in zip(self.blocks, block_rows):
+            if rows:
+                presolved.addConstraint(
+                    self.createBlock(const, rows, reduced_variables)
+                )
+
+        postsolve = PostsolveMap(
+            list(self.variables.values()), self.fixed, reduced_variables
+        )
+        return presolved, postsolve
+
+    def createBlock(self, const, rows, reduced_variables):
+        from scipy.sparse import csr_matrix
+
+        names = sorted({var_name for coeffs, _ in rows for var_name in coeffs})
+        index = {var_name: j for j, var_name in enumerate(names)}
+        indptr, indices, data = [0], [], []
+        for coeffs, _ in rows:
+            indices += [index[var_name] for var_name in coeffs]
+            data += list(coeffs.values())
+            indptr.append(len(indices))
+        A = csr_matrix((data, indices, indptr), shape=(len(rows), len(names)))
+        b = np.array([-constant for _, constant in rows])
+        x = [reduced_variables[var_name] for var_name in names]
+        sense = "==" if const.type() == ConstraintType.Eq else "<="
+        return MatrixConstraint(A, x, sense, b, name=const.name)
+
+
+def activity(terms):
+    """
+    Returns
+    -------
+    float
+        sum of finite terms
+    int
+        number of infinite terms
+    """
+    finite, n_inf = 0.0, 0
+    for term in terms:
+        if math.isinf(term):
+            n_inf += 1
+        else:
+            finite += term
+    return finite, n_inf
+
+
+def residual(act, n_inf, term):
+    """activity without term, None if it is not finite"""
+    if n_inf == 0:
+        return act - term
+    if n_inf == 1 and math.isinf(term):
+        return act
+    return None
@@ -0,0 +1,660 @@
+import json
+import struct
+import zipfile
+
+import numpy as np
+
+from flopt.variable import (
+    VarElement,
+    VarContinuous,
+    VarInteger,
+    VarBinary,
+    VarSpin,
+    VarPermutation,
+    Parameter,
+)
+from flopt.expression import (
+    Expression,
+    CustomExpression,
+    Const,
+    Reduction,
+    Sum,
+    Prod,
+    MathOperation,
+    Exp,
+    Cos,
+    Sin,
+    Tan,
+    Log,
+    Abs,
+    Floor,
+    Ceil,
+    polynomial_to_expression,
+)
+from flopt.constraint import Constraint, MatrixConstraint
+from flopt.polynomial import Monomial, Polynomial
+from flopt.constants import VariableType, ConstraintType, number_classes, np_float
+from flopt.env import setup_logger
+
+logger = setup_logger(__name__)
+
+
+FORMAT_VERSION = 1
+
+# kinds of expressions
+POLYNOMIAL, TREE = 0, 1
+
+# kinds of nodes of non-polynomial expressions
+VAR, CONST_INT, CONST_FLOAT, OPERATION, SUM, PROD, MATH = range(7)
+operators = ["+", "-", "*", "/", "^", "%", "&", "|"]
+# the orders of operators are a part of the format
+math_operations = [Exp, Cos, Sin, Tan, Log, Abs, Floor, Ceil]
+
+
+def save_problem(prob, path):
+    """Save the problem in the compact binary format
+
+    The problem is stored in an uncompressed npz archive of flat arrays;
+
+    - the table of variables and parameters (names, types, bounds and values),
+    - the polynomial objective and constraints as the sparse blocks of
+      constants, linear terms, quadratic terms and higher degree monomials,
+    - the non-polynomial expressions as a flat array of nodes,
+      whose children are stored before their parents,
+    - the blocks of MatrixConstraint as concatenated CSR arrays.
+
+    Parameters
+    ----------
+    prob : Problem
+    path : str or file-like
+        if it is str and does not end with .npz, .npz is appended
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        prob.save("model.npz")
+        prob = flopt.Problem.load("model.npz")
+
+        # workers that only read the problem can map the arrays
+        prob = flopt.Problem.load("model.npz", mmap_mode="r")
+    """
+    header = {
+        "format": "flopt",
+        "version": FORMAT_VERSION,
+        "name": prob.name,
+        "sense": prob.sense,
+        "obj_name": prob.obj_name,
+    }
+    encoder = ProblemEncoder(sorted(prob.getVariables(), key=lambda var: var.name))
+    encoder.addExpression(prob.obj)
+    for const in prob.constraints:
+        encoder.addExpression(const.expression)
+    for const in prob.matrix_constraints:
+        encoder.addMatrixConstraint(const)
+
+    arrays = encoder.toArrays()
+    arrays["header"] = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+    arrays["const_type"] = np.array(
+        [const.type().value for const in prob.constraints], dtype=np.int16
+    )
+    arrays["const_name_data"], arrays["const_name_ptr"], arrays["const_named"] = (
+        pack_strings([const.name for const in prob.constraints])
+    )
+    np.savez(path, **arrays)
+
+
+def load_problem(path, mmap_mode=None):
+    """Load the problem saved by save_problem()
+
+    Parameters
+    ----------
+    path : str or file-like
+    mmap_mode : {None, "r", "c"}
+        if it is not None, the arrays are memory-mapped from the file,
+        and the blocks of MatrixConstraint refer to them without copying
+
+    Returns
+    -------
+    Problem
+    """
+    from flopt.problem import Problem
+
+    arrays = load_arrays(path, mmap_mode=mmap_mode)
+    header = json.loads(bytes(arrays["header"]).decode())
+    if header.get("format") != "flopt" or header.get("version") != FORMAT_VERSION:
+        raise ValueError(
+            f"unsupported format {header.get('format')} version {header.get('version')}"
+        )
+
+    decoder = ProblemDecoder(arrays)
+    prob = Problem(name=header["name"], sense=header["sense"])
+    prob.setObjective(decoder.expression(0), header["obj_name"])
+    names = unpack_strings(
+        arrays["const_name_data"], arrays["const_name_ptr"], arrays["const_named"]
+    )
+    for i, (_type, name) in enumerate(zip(arrays["const_type"].tolist(), names)):
+        const = Constraint(decoder.expression(i + 1), ConstraintType(_type))
+        prob.addConstraint(const, name)
+    for const in decoder.matrixConstraints():
+        prob.addConstraint(const, const.name)
+    return prob
+
+
+def load_arrays(path, mmap_mode=None):
+    """Load the arrays of the npz archive saved by save_problem()
+
+    numpy.load() does not map the members of npz archives,
+    so the members, which are not compressed, are mapped at their offsets.
+
+    Parameters
+    ----------
+    path : str or file-like
+    mmap_mode : {None, "r", "c"}
+        path must be the name of file if it is not None
+
+    Returns
+    -------
+    dict
+        key is the name of array and value is numpy.ndarray or numpy.memmap
+    """
+    if mmap_mode is None:
+        with np.load(path) as f:
+            return {key: f[key] for key in f.files}
+
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            assert info.compress_type == zipfile.ZIP_STORED
+            # skip the local file header
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            key = info.filename.removesuffix(".npy")
+            if np.prod(shape) == 0:
+                arrays[key] = np.empty(shape, dtype=dtype)
+                continue
+            arrays[key] = np.memmap(
+                path,
+                dtype=dtype,
+                mode=mmap_mode,
+                offset=f.tell(),
+                shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return arrays
+
+
+def pack_strings(strings):
+    """
+    Parameters
+    ----------
+    strings : list of str or None
+
+    Returns
+    -------
+    data : numpy.ndarray
+        utf-8 bytes of the concatenated strings
+    ptr : numpy.ndarray
+        strings[i] is data[ptr[i]:ptr[i+1]]
+    named : numpy.ndarray
+        named[i] is false if strings[i] is None
+    """
+    encoded = [b"" if s is None else s.encode() for s in strings]
+    ptr = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in encoded], out=ptr[1:])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    named = np.array([s is not None for s in strings], dtype=bool)
+    return data, ptr, named
+
+
+def unpack_strings(data, ptr, named):
+    data = bytes(data)
+    ptr = ptr.tolist()
+    return [
+        data[ptr[i] : ptr[i + 1]].decode() if is_named else None
+        for i, is_named in enumerate(named.tolist())
+    ]
+
+
+class ProblemEncoder:
+    """Encoder of the expressions and the matrix constraints into flat arrays
+
+    Parameters
+    ----------
+    variables : list of VarElement family
+        variables of the problem, parameters are added when they are found
+    """
+
+    def __init__(self, variables):
+        self.symbols = []
+        self.symbol_index = {}
+        for var in variables:
+            self.symbol(var)
+
+        self.kinds = []
+        self.roots = []
+        self.constants = []
+        self.linear = CsrBuilder(2)  # symbol, coeff
+        self.quadratic = CsrBuilder(3)  # symbol, symbol, coeff
+        self.monomials = CsrBuilder(1)  # coeff
+        self.monomial_terms = CsrBuilder(2)  # symbol, exponent
+
+        self.node_index = {}
+        self.nodes = []  # kind, arg, value
+        self.children = CsrBuilder(1)
+
+        self.matrices = []
+
+    def symbol(self, var):
+        if (index := self.symbol_index.get(var.name)) is None:
+            index = self.symbol_index[var.name] = len(self.symbols)
+            self.symbols.append(var)
+        return index
+
+    def addExpression(self, expression):
+        if isinstance(expression, VarElement):
+            expression = Expression(expression, Const(0), "+")
+        if expression.isPolynomial():
+            self.kinds.append(POLYNOMIAL)
+            self.roots.append(-1)
+            self.addPolynomial(expression.toPolynomial())
+        else:
+            self.kinds.append(TREE)
+            self.roots.append(self.addTree(expression))
+            self.addPolynomial(Polynomial())
+
+    def addPolynomial(self, polynomial):
+        constant = polynomial.constant()
+        for mono, coeff in polynomial:
+            coeff = coeff * mono.coeff
+            terms = [(self.symbol(var), exp) for var, exp in mono]
+            if not terms:
+                constant += coeff
+            elif len(terms) == 1 and terms[0][1] == 1:
+                self.linear.append(terms[0][0], coeff)
+            elif len(terms) == 1 and terms[0][1] == 2:
+                self.quadratic.append(terms[0][0], terms[0][0], coeff)
+            elif len(terms) == 2 and terms[0][1] == 1 and terms[1][1] == 1:
+                self.quadratic.append(terms[0][0], terms[1][0], coeff)
+            else:
+                self.monomials.append(coeff)
+                for term in terms:
+                    self.monomial_terms.append(*term)
+                self.monomial_terms.close()
+        self.constants.append(constant)
+        self.linear.close()
+        self.quadratic.close()
+        self.monomials.close()
+
+    def addTree(self, root):
+        """add the nodes of tree in post-order, and return the index of root"""
+        stack = [(root, False)]
+        while stack:
+            elm, expanded = stack.pop()
+            if id(elm) in self.node_index:
+                continue
+            if isinstance(elm, VarElement):
+                self.addNode(elm, VAR, self.symbol(elm), [])
+                continue
+            if isinstance(elm, (Const, *number_classes)):
+                value = elm._value if isinstance(elm, Const) else elm
+                kind = (
+                    CONST_INT if isinstance(value, (int, np.integer)) else CONST_FLOAT
+                )
+                self.addNode(elm, kind, 0, [], value=value)
+                continue
+            if isinstance(elm, CustomExpression) or not isinstance(
+                elm, (Expression, Reduction, MathOperation)
+            ):
+                raise ValueError(f"{type(elm).__name__} cannot be saved")
+            children = list(elm.getChildren())
+            if not expanded:
+                stack.append((elm, True))
+                stack.extend((child, False) for child in reversed(children))
+                continue
+            children = [self.node_index[id(child)] for child in children]
+            if isinstance(elm, Expression):
+                self.addNode(elm, OPERATION, operators.index(elm.operator), children)
+            elif isinstance(elm, Sum):
+                self.addNode(elm, SUM, 0, children)
+            elif isinstance(elm, Prod):
+                self.addNode(elm, PROD, 0, children)
+            else:
+                self.addNode(elm, MATH, math_operations.index(type(elm)), children)
+        return self.node_index[id(root)]
+
+    def addNode(self, elm, kind, arg, children, value=np.nan):
+        self.node_index[id(elm)] = len(self.nodes)
+        self.nodes.append((kind, arg, value))
+        for child in children:
+            self.children.append(child)
+        self.children.close()
+
+    def addMatrixConstraint(self, const):
+        for var in const.x:
+            self.symbol(var)
+        self.matrices.append(const)
+
+    def toArrays(self):
+        """
+        Returns
+        -------
+        dict
+            key is the name of array and value is numpy.ndarray
+        """
+        arrays = {}
+
+        # variables and parameters
+        n = len(self.symbols)
+        types = np.array([var.type().value for var in self.symbols], dtype=np.int16)
+        lb = np.full(n, np.nan, dtype=np_float)
+        ub = np.full(n, np.nan, dtype=np_float)
+        values = np.full(n, np.nan, dtype=np_float)
+        permutations = []
+        perm_ptr = np.zeros(n + 1, dtype=np.int64)
+        for i, var in enumerate(self.symbols):
+            if var.lowBound is not None:
+                lb[i] = var.lowBound
+            if var.upBound is not None:
+                ub[i] = var.upBound
+            if var.type() == VariableType.Permutation:
+                permutations.append(var.view())
+                perm_ptr[i + 1] = len(var.view())
+            elif var._value is not None:
+                values[i] = var._value
+        np.cumsum(perm_ptr, out=perm_ptr)
+        arrays["var_name_data"], arrays["var_name_ptr"], _ = pack_strings(
+            [var.name for var in self.symbols]
+        )
+        arrays["var_type"] = types
+        arrays["var_lb"] = lb
+        arrays["var_ub"] = ub
+        arrays["var_value"] = values
+        arrays["perm_ptr"] = perm_ptr
+        arrays["perm_data"] = np.concatenate(
+            [np.zeros(0, dtype=np.int64)] + permutations, dtype=np.int64
+        )
+
+        # expressions
+        arrays["expr_kind"] = np.array(self.kinds, dtype=np.int8)
+        arrays["expr_root"] = np.array(self.roots, dtype=np.int64)
+        arrays["poly_constant"] = np.array(self.constants, dtype=np_float)
+        arrays["lin_ptr"], (arrays["lin_var"], arrays["lin_coeff"]) = (
+            self.linear.toArrays([np.int64, np_float])
+        )
+        arrays["quad_ptr"], (
+            arrays["quad_i"],
+            arrays["quad_j"],
+            arrays["quad_coeff"],
+        ) = self.quadratic.toArrays([np.int64, np.int64, np_float])
+        arrays["mono_ptr"], (arrays["mono_coeff"],) = self.monomials.toArrays(
+            [np_float]
+        )
+        arrays["mono_term_ptr"], (arrays["mono_var"], arrays["mono_exp"]) = (
+            self.monomial_terms.toArrays([np.int64, np.int64])
+        )
+
+        # nodes of non-polynomial expressions
+        kinds, args, node_values = zip(*self.nodes) if self.nodes else ([], [], [])
+        arrays["node_kind"] = np.array(kinds, dtype=np.int8)
+        arrays["node_arg"] = np.array(args, dtype=np.int64)
+        arrays["node_value"] = np.array(node_values, dtype=np_float)
+        arrays["node_child_ptr"], (arrays["node_child"],) = self.children.toArrays(
+            [np.int64]
+        )
+
+        # blocks of matrix constraints
+        matrices = self.matrices
+        arrays["mat_type"] = np.array(
+            [const.type().value for const in matrices], dtype=np.int16
+        )
+        arrays["mat_shape"] = np.array(
+            [const.A.shape for const in matrices], dtype=np.int64
+        ).reshape(-1, 2)
+        arrays["mat_nnz"] = np.array(
+            [const.A.nnz for const in matrices], dtype=np.int64
+        )
+        arrays["mat_data"] = np.concatenate(
+            [np.zeros(0, dtype=np_float)] + [const.A.data for const in matrices],
+            dtype=np_float,
+        )
+        arrays["mat_indices"] = np.concatenate(
+            [np.zeros(0, dtype=np.int32)] + [const.A.indices for const in matrices],
+            dtype=np.int32,
+        )
+        arrays["mat_indptr"] = np.concatenate(
+            [np.zeros(0, dtype=np.int64)] + [const.A.indptr for const in matrices],
+            dtype=np.int64,
+        )
+        arrays["mat_x"] = np.array(
+            [self.symbol_index[var.name] for const in matrices for var in const.x],
+            dtype=np.int64,
+        )
+        arrays["mat_b"] = np.concatenate(
+            [np.zeros(0, dtype=np_float)] + [const.b for const in matrices],
+            dtype=np_float,
+        )
+        arrays["mat_name_data"], arrays["mat_name_ptr"], arrays["mat_named"] = (
+            pack_strings([const.name for const in matrices])
+        )
+        return arrays
+
+
+class CsrBuilder:
+    """Builder of the rows of CSR arrays
+
+    Parameters
+    ----------
+    n_fields : int
+        number of values of each entry
+    """
+
+    def __init__(self, n_fields):
+        self.fields = [[] for _ in range(n_fields)]
+        self.ptr = [0]
+
+    def append(self, *values):
+        for field, value in zip(self.fields, values):
+            field.append(value)
+
+    def close(self):
+        """close the current row"""
+        self.ptr.append(len(self.fields[0]))
+
+    def toArrays(self, dtypes):
+        """
+        Returns
+        -------
+        ptr : numpy.ndarray
+            entries of i-th row are ptr[i]:ptr[i+1]
+        fields : list of numpy.ndarray
+        """
+        return np.array(self.ptr, dtype=np.int64), [
+            np.array(field, dtype=dtype) for field, dtype in zip(self.fields, dtypes)
+        ]
+
+
+class ProblemDecoder:
+    """Decoder of the arrays created by ProblemEncoder
+
+    Parameters
+    ----------
+    arrays : dict
+        key is the name of array and value is numpy.ndarray
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.symbols = self.createSymbols()
+        self.nodes = None
+
+    def createSymbols(self):
+        arrays = self.arrays
+        names = unpack_strings(
+            arrays["var_name_data"],
+            arrays["var_name_ptr"],
+            np.ones(len(arrays["var_type"]), dtype=bool),
+        )
+        perm_ptr = arrays["perm_ptr"].tolist()
+        perm_data = arrays["perm_data"]
+        # nan is None
+        lbs, ubs, values = (
+            [None if v != v else v for v in arrays[key].tolist()]
+            for key in ["var_lb", "var_ub", "var_value"]
+        )
+        continuous = VariableType.Continuous.value
+        symbols = []
+        for i, (name, _type, lb, ub, value) in enumerate(
+            zip(names, arrays["var_type"].tolist(), lbs, ubs, values)
+        ):
+            if _type == continuous:
+                symbols.append(VarContinuous(name, lb, ub, value))
+                continue
+            # bounds and values of the others are integers
+            _type = VariableType(_type)
+            lb, ub, value = (v if v is None else int(v) for v in (lb, ub, value))
+            if _type == VariableType.Integer:
+                symbols.append(VarInteger(name, lb, ub, value))
+            elif _type == VariableType.Binary:
+                symbols.append(VarBinary(name, value))
+            elif _type == VariableType.Spin:
+                symbols.append(VarSpin(name, value))
+            elif _type == VariableType.Permutation:
+                value = perm_data[perm_ptr[i] : perm_ptr[i + 1]].tolist()
+                symbols.append(VarPermutation(name, lb, ub, value))
+            else:  # _type == VariableType.Parameter
+                symbols.append(Parameter(name, value))
+        return symbols
+
+    def expression(self, i):
+        """
+        Parameters
+        ----------
+        i : int
+            index of expression, 0 is the objective and i is the (i-1)-th constraint
+
+        Returns
+        -------
+        Expression family
+        """
+        arrays = self.arrays
+        if arrays["expr_kind"][i] == TREE:
+            if self.nodes is None:
+                self.nodes = self.createNodes()
+            return self.nodes[arrays["expr_root"][i]]
+        polynomial = self.polynomial(i)
+        expression = polynomial_to_expression(polynomial)
+        expression.polynomial = polynomial
+        return expression
+
+    def polynomial(self, i):
+        arrays, symbols = self.arrays, self.symbols
+        terms = {}
+
+        lo, hi = arrays["lin_ptr"][i : i + 2]
+        for var, coeff in zip(
+            arrays["lin_var"][lo:hi].tolist(), arrays["lin_coeff"][lo:hi].tolist()
+        ):
+            terms[symbols[var].monomial] = coeff
+
+        lo, hi = arrays["quad_ptr"][i : i + 2]
+        for var_i, var_j, coeff in zip(
+            arrays["quad_i"][lo:hi].tolist(),
+            arrays["quad_j"][lo:hi].tolist(),
+            arrays["quad_coeff"][lo:hi].tolist(),
+        ):
+            if var_i == var_j:
+                terms[Monomial({symbols[var_i]: 2})] = coeff
+            else:
+                terms[Monomial({symbols[var_i]: 1, symbols[var_j]: 1})] = coeff
+
+        lo, hi = arrays["mono_ptr"][i : i + 2]
+        term_ptr = arrays["mono_term_ptr"]
+        for k, coeff in zip(range(lo, hi), arrays["mono_coeff"][lo:hi].tolist()):
+            s, t = term_ptr[k : k + 2]
+            mono = Monomial(
+                {
+                    symbols[var]: exp
+                    for var, exp in zip(
+                        arrays["mono_var"][s:t].tolist(),
+                        arrays["mono_exp"][s:t].tolist(),
+                    )
+                }
+            )
+            terms[mono] = coeff
+
+        return Polynomial(terms, constant=arrays["poly_constant"][i].item())
+
+    def createNodes(self):
+        arrays, symbols = self.arrays, self.symbols
+        child_ptr = arrays["node_child_ptr"].tolist()
+        child_data = arrays["node_child"].tolist()
+        nodes = []
+        for k, (kind, arg, value) in enumerate(
+            zip(
+                arrays["node_kind"].tolist(),
+                arrays["node_arg"].tolist(),
+                arrays["node_value"].tolist(),
+            )
+        ):
+            children = [nodes[c] for c in child_data[child_ptr[k] : child_ptr[k + 1]]]
+            if kind == VAR:
+                nodes.append(symbols[arg])
+            elif kind == CONST_INT:
+                nodes.append(Const(int(value)))
+            elif kind == CONST_FLOAT:
+                nodes.append(Const(value))
+            elif kind == OPERATION:
+                nodes.append(Expression(*children, operators[arg]))
+            elif kind == SUM:
+                nodes.append(Sum(children))
+            elif kind == PROD:
+                nodes.append(Prod(children))
+            else:  # kind == MATH
+                nodes.append(math_operations[arg](*children))
+        return nodes
+
+    def matrixConstraints(self):
+        """
+        Returns
+        -------
+        list of MatrixConstraint
+            the matrices refer to the loaded arrays without copying
+        """
+        from scipy.sparse import csr_matrix
+
+        arrays, symbols = self.arrays, self.symbols
+        names = unpack_strings(
+            arrays["mat_name_data"], arrays["mat_name_ptr"], arrays["mat_named"]
+        )
+        matrix_constraints = []
+        row, col, nz, ptr = 0, 0, 0, 0
+        for (m, n), nnz, _type, name in zip(
+            arrays["mat_shape"].tolist(),
+            arrays["mat_nnz"].tolist(),
+            arrays["mat_type"].tolist(),
+            names,
+        ):
+            A = csr_matrix(
+                (
+                    arrays["mat_data"][nz : nz + nnz],
+                    arrays["mat_indices"][nz : nz + nnz],
+                    arrays["mat_indptr"][ptr : ptr + m + 1],
+                ),
+                shape=(m, n),
+                copy=False,
+            )
+            x = [symbols[var] for var in arrays["mat_x"][col : col + n].tolist()]
+            sense = "==" if ConstraintType(_type) == ConstraintType.Eq else "<="
+            b = arrays["mat_b"][row : row + m]
+            matrix_constraints.append(MatrixConstraint(A, x, sense, b, name))
+            # indptr of each block has m+1 entries
+            row, col, nz, ptr = row + m, col + n, nz + nnz, ptr + m + 1
+        return matrix_constraints
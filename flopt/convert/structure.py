@@ -1,3 +1,5 @@
+import copy
+
 import numpy as np
 
 from flopt import Variable, Problem
@@ -10,6 +12,14 @@ from flopt.env import setup_logger, create_variable_mode
 logger = setup_logger(__name__)
 
 
+type2str = {
+    VariableType.Continuous: "Continuous",
+    VariableType.Integer: "Integer",
+    VariableType.Binary: "Binary",
+    VariableType.Spin: "Spin",
+}
+
+
 # -------------------------------------------------------
 #   Utils
 # -------------------------------------------------------
@@ -52,6 +62,660 @@ def shape(array):
     return array.shape
 
 
+def linear_constraints_to_sparse(constraints, x):
+    """create the sparse matrix of linear constraints
+
+    ::
+
+      lb <= Ax <= ub
+
+    where an inequality constraint is a row with lb = -inf and
+    an equality constraint is a row with lb == ub.
+    Variables not in x are treated as constants.
+
+    Parameters
+    ----------
+    constraints : list of Constraint
+        linear constraints
+    x : list of VarElement family
+
+    Returns
+    -------
+    A : scipy.sparse.csr_matrix
+    lb : np.ndarray
+    ub : np.ndarray
+    """
+    from scipy.sparse import csr_matrix
+
+    mono_to_index = {var.toMonomial(): i for i, var in enumerate(x)}
+    rows, cols, data = [], [], []
+    lb = np.empty((len(constraints),), dtype=np_float)
+    ub = np.empty((len(constraints),), dtype=np_float)
+    for i, const in enumerate(constraints):
+        assert const.isLinear()
+        polynomial = const.expression.toPolynomial().evaluateParameters()
+        C = polynomial.constant()
+        for mono, coeff in polynomial:
+            if mono not in mono_to_index:
+                C += coeff * mono.value()
+            else:
+                rows.append(i)
+                cols.append(mono_to_index[mono])
+                data.append(coeff)
+        # c.T.dot(x) + C <= 0 or c.T.dot(x) + C == 0
+        ub[i] = -C
+        lb[i] = -np.inf if const.type() == ConstraintType.Le else -C
+    A = csr_matrix(
+        (np.array(data, dtype=np_float), (rows, cols)),
+        shape=(len(constraints), len(x)),
+    )
+    return A, lb, ub
+
+
+def quadratic_to_sparse(expression, x):
+    """create the sparse quadratic form of the quadratic expression
+
+    ::
+
+      1/2 x.T.dot(Q).dot(x) + c.T.dot(x) + C
+
+    Variables not in x are treated as constants.
+
+    Parameters
+    ----------
+    expression : Expression family
+        quadratic expression
+    x : list of VarElement family
+
+    Returns
+    -------
+    Q : scipy.sparse.csr_matrix
+        symmetric matrix
+    c : np.ndarray
+    C : float
+    """
+    from scipy.sparse import csr_matrix
+
+    mono_to_index = {var.toMonomial(): i for i, var in enumerate(x)}
+    rows, cols, data = [], [], []
+    c = np.zeros((len(x),), dtype=np_float)
+    polynomial = expression.toPolynomial().simplify()
+    C = polynomial.constant()
+    for mono, coeff in polynomial:
+        coeff *= mono.coeff
+        indices = []
+        for var, exponent in mono.terms.items():
+            var_mono = var.toMonomial()
+            if var_mono in mono_to_index:
+                indices += [mono_to_index[var_mono]] * exponent
+            else:
+                coeff *= var.value() ** exponent
+        if len(indices) == 0:
+            C += coeff
+        elif len(indices) == 1:
+            c[indices[0]] += coeff
+        else:
+            i, j = indices
+            rows += [i, j]
+            cols += [j, i]
+            data += [coeff, coeff]
+    Q = csr_matrix(
+        (np.array(data, dtype=np_float), (rows, cols)), shape=(len(x), len(x))
+    )
+    return Q, c, C
+
+
+def is_zero(array):
+    """
+    Parameters
+    ----------
+    array : None, np.ndarray or scipy.sparse matrix
+
+    Returns
+    -------
+    bool
+        true if array is None or all elements of array are zero
+    """
+    if array is None:
+        return True
+    if hasattr(array, "count_nonzero"):  # scipy.sparse matrix
+        return array.count_nonzero() == 0
+    return np.all(array == 0)
+
+
+def identity_rows(indices, n, sparse=False):
+    """
+    Parameters
+    ----------
+    indices : np.ndarray
+        row indices of the identity matrix
+    n : int
+        size of the identity matrix
+    sparse : bool
+        if it is true, scipy.sparse.csr_matrix is returned
+
+    Returns
+    -------
+    np.ndarray or scipy.sparse.csr_matrix
+        rows of the identity matrix of size n
+    """
+    num_rows = len(indices)
+    if sparse:
+        from scipy.sparse import csr_matrix
+
+        return csr_matrix(
+            (np.ones((num_rows,), dtype=np_float), (np.arange(num_rows), indices)),
+            shape=(num_rows, n),
+        )
+    I = np.zeros((num_rows, n), dtype=np_float)
+    I[np.arange(num_rows), indices] = 1
+    return I
+
+
+def vstack_func(sparse=False):
+    """
+    Returns
+    -------
+    function
+        np.vstack, or scipy.sparse.vstack that returns csr_matrix if sparse is true
+    """
+    if sparse:
+        from scipy.sparse import vstack
+
+        return lambda arrays: vstack(arrays, format="csr")
+    return np.vstack
+
+
+def sorted_variables(prob):
+    """
+    Returns
+    -------
+    FloptNdarray
+        variables of the problem sorted by name, where auxiliary ones come last
+    """
+    variables = list(prob.getVariables())
+    return FloptNdarray(sorted(variables, key=lambda v: ("__" in v.name, v.name)))
+
+
+def split_matrix_constraint(const, mono_to_index):
+    """split the columns of MatrixConstraint into variables in x and the others
+
+    Parameters
+    ----------
+    const : MatrixConstraint
+    mono_to_index : dict
+        key is the monomial of variable in x, value is its index in x
+
+    Returns
+    -------
+    M : scipy.sparse.csr_matrix
+        matrix whose columns correspond to x
+    F : scipy.sparse.csr_matrix or None
+        matrix whose columns correspond to fixed
+    fixed : list of VarElement family
+        variables of const not in x
+    """
+    from scipy.sparse import csr_matrix
+
+    cols = np.array(
+        [mono_to_index.get(var.toMonomial(), -1) for var in const.x], dtype=np.int64
+    )
+    is_fixed = cols < 0
+    A = const.A.tocoo()
+    if is_fixed.any():
+        F = const.A.tocsc()[:, np.flatnonzero(is_fixed)].tocsr()
+        fixed = list(const.x[is_fixed])
+        keep = ~is_fixed[A.col]
+        A.data, A.row, A.col = A.data[keep], A.row[keep], A.col[keep]
+    else:
+        F, fixed = None, []
+    M = csr_matrix(
+        (A.data, (A.row, cols[A.col])), shape=(len(const), len(mono_to_index))
+    )
+    return M, F, fixed
+
+
+def matrix_constraint_to_sparse(const, x):
+    """
+    Parameters
+    ----------
+    const : MatrixConstraint
+    x : list of VarElement family
+
+    Returns
+    -------
+    M : scipy.sparse.csr_matrix
+    rhs : np.ndarray
+        Mx <= rhs (const is le type) or Mx == rhs (const is eq type),
+        where variables not in x are treated as constants
+    """
+    mono_to_index = {var.toMonomial(): i for i, var in enumerate(x)}
+    M, F, fixed = split_matrix_constraint(const, mono_to_index)
+    return M, fixed_rhs(const.b, F, fixed)
+
+
+def fixed_rhs(b, F, fixed):
+    if F is None:
+        return b
+    return b - F.dot(np.array([var.value() for var in fixed], dtype=np_float))
+
+
+def constraint_names(prob, const_type):
+    """
+    Returns
+    -------
+    list of str or None
+        names of the rows of const_type in the order of the rows of structures,
+        where the rows of matrix constraints follow the constraints
+    """
+    names = [const.name for const in prob.constraints if const.type() == const_type]
+    for const in prob.matrix_constraints:
+        if const.type() == const_type:
+            names += const.getNames()
+    return names
+
+
+def sparse_rows(constraints, const_type, x, matrix_constraints=()):
+    """
+    Parameters
+    ----------
+    constraints : list of Constraint
+    const_type : ConstraintType
+    x : list of VarElement family
+    matrix_constraints : list of MatrixConstraint
+        rows of them are appended after constraints
+
+    Returns
+    -------
+    M : scipy.sparse.csr_matrix or None
+    rhs : np.ndarray or None
+        Mx <= rhs (const_type is Le) or Mx == rhs (const_type is Eq)
+        for the constraints of const_type
+    """
+    constraints = [const for const in constraints if const.type() == const_type]
+    blocks = [
+        matrix_constraint_to_sparse(const, x)
+        for const in matrix_constraints
+        if const.type() == const_type
+    ]
+    if constraints:
+        M, _, rhs = linear_constraints_to_sparse(constraints, x)
+        blocks.insert(0, (M, rhs))
+    if not blocks:
+        return None, None
+    if len(blocks) == 1:
+        return blocks[0]
+    Ms, rhss = zip(*blocks)
+    return vstack_func(sparse=True)(Ms), np.hstack(rhss)
+
+
+class ParameterTerm:
+    """Term of a structure depending on parameters
+
+    ::
+
+      structure.target[index] includes coeff * prod(elm ^ exp for elm, exp in terms)
+
+    where terms are the parameters and the variables not in x of the structure.
+
+    Parameters
+    ----------
+    target : {"Q", "c", "C", "G", "h", "A", "b"}
+    index : tuple of int or None
+    coeff : float
+    terms : list of (VarElement family, int)
+    """
+
+    def __init__(self, target, index, coeff, terms):
+        self.target = target
+        self.index = index
+        self.coeff = coeff
+        self.terms = terms
+        self.last_value = self.value()
+
+    def value(self):
+        value = self.coeff
+        for elm, exp in self.terms:
+            value *= elm.value() ** exp
+        return value
+
+    def getParameters(self):
+        return {elm for elm, _ in self.terms if elm.type() == VariableType.Parameter}
+
+
+def collect_parameter_terms(prob, x):
+    """collect the terms of QpStructure of the problem depending on parameters
+
+    Parameters
+    ----------
+    prob : Problem
+    x : list of VarElement family
+
+    Returns
+    -------
+    list of ParameterTerm
+    """
+    mono_to_index = {var.toMonomial(): i for i, var in enumerate(x)}
+
+    def split(mono):
+        indices, terms = [], []
+        for elm, exp in mono.terms.items():
+            elm_mono = elm.toMonomial()
+            if elm.type() != VariableType.Parameter and elm_mono in mono_to_index:
+                indices += [mono_to_index[elm_mono]] * exp
+            else:
+                terms.append((elm, exp))
+        return indices, terms
+
+    parameter_terms = []
+
+    # objective: 1/2 x.T.dot(Q).dot(x) + c.T.dot(x) + C
+    for mono, coeff in prob.obj.toPolynomial().simplify():
+        if not mono.hasParameters():
+            continue
+        indices, terms = split(mono)
+        coeff *= mono.coeff
+        if len(indices) == 0:
+            parameter_terms.append(ParameterTerm("C", None, coeff, terms))
+        elif len(indices) == 1:
+            parameter_terms.append(ParameterTerm("c", (indices[0],), coeff, terms))
+        elif indices[0] == indices[1]:
+            parameter_terms.append(ParameterTerm("Q", tuple(indices), 2 * coeff, terms))
+        else:
+            i, j = indices
+            parameter_terms.append(ParameterTerm("Q", (i, j), coeff, terms))
+            parameter_terms.append(ParameterTerm("Q", (j, i), coeff, terms))
+
+    # constraints: Gx <= h, Ax == b
+    rows = {ConstraintType.Le: 0, ConstraintType.Eq: 0}
+    targets = {ConstraintType.Le: ("G", "h"), ConstraintType.Eq: ("A", "b")}
+    for const in prob.constraints:
+        const_type = const.type()
+        row = rows[const_type]
+        rows[const_type] += 1
+        matrix, rhs = targets[const_type]
+        for mono, coeff in const.expression.toPolynomial():
+            if not mono.hasParameters():
+                continue
+            indices, terms = split(mono)
+            coeff *= mono.coeff
+            if len(indices) == 0:
+                parameter_terms.append(ParameterTerm(rhs, (row,), -coeff, terms))
+            else:
+                index = (row, indices[0])
+                parameter_terms.append(ParameterTerm(matrix, index, coeff, terms))
+    return parameter_terms
+
+
+def update_parameter_terms(structure, parameters=None):
+    """update the entries of structure depending on parameters
+
+    Parameters
+    ----------
+    structure : QpStructure or LpStructure
+    parameters : list of Parameter, optional
+        if it is given, only the terms containing these parameters are updated
+
+    Returns
+    -------
+    int
+        number of updated entries
+    """
+    if parameters is not None:
+        parameters = set(parameters)
+    num_updated = 0
+    for term in structure.parameter_terms:
+        if parameters is not None and parameters.isdisjoint(term.getParameters()):
+            continue
+        value = term.value()
+        delta = value - term.last_value
+        if delta == 0:
+            continue
+        term.last_value = value
+        if term.target == "C":
+            structure.C += delta
+        else:
+            getattr(structure, term.target)[term.index] += delta
+        num_updated += 1
+    return num_updated
+
+
+class StructureCache:
+    """Sparse QpStructure of a problem kept by Problem.structure_cache
+
+    The objective part (Q, c, C) is recreated only when the objective is replaced,
+    and the rows of the constraints added after the last build are appended to
+    G, h, A and b. Any other change of the problem creates a new cache.
+    The entries depending on parameters or variables not in x are recorded
+    as ParameterTerm and updated by their current values in toQp().
+
+    Parameters
+    ----------
+    x : FloptNdarray
+        variables of the structure
+    """
+
+    def __init__(self, x):
+        self.x = x
+        self.mono_to_index = {var.toMonomial(): i for i, var in enumerate(x)}
+        self.version = None
+        self.obj = None
+        self.Q, self.c, self.C = None, None, 0
+        self.obj_terms = []
+        self.constraints = []  # list of (Constraint, Expression) already converted
+        self.G, self.h, self.A, self.b = None, None, None, None
+        self.const_terms = []
+        self.matrix_constraints = []  # list of (MatrixConstraint, M, F, fixed)
+
+    def isValid(self, prob, x=None):
+        """
+        Parameters
+        ----------
+        prob : Problem
+        x : None or list of VarElement family
+            if it is None, the variables of this cache must be
+            all the variables of prob sorted by sorted_variables()
+
+        Returns
+        -------
+        bool
+            true if this cache can be updated into the structure of prob with x
+        """
+        if x is None:
+            x = sorted_variables(prob)
+        if len(x) != len(self.x) or any(a is not b for a, b in zip(x, self.x)):
+            return False
+        if prob.version == self.version and prob.obj is self.obj:
+            return len(prob.constraints) == len(self.constraints) and len(
+                prob.matrix_constraints
+            ) == len(self.matrix_constraints)
+        if len(prob.constraints) < len(self.constraints) or not all(
+            const is cached and const.expression is expression
+            for const, (cached, expression) in zip(prob.constraints, self.constraints)
+        ):
+            return False
+        if len(prob.matrix_constraints) < len(self.matrix_constraints) or not all(
+            const is cached[0]
+            for const, cached in zip(prob.matrix_constraints, self.matrix_constraints)
+        ):
+            return False
+        return True
+
+    def split(self, mono):
+        """
+        Returns
+        -------
+        indices : list of int
+            indices in x of the variables of mono
+        terms : list of (VarElement family, int)
+            parameters and variables not in x of mono
+        """
+        indices, terms = [], []
+        for elm, exp in mono.terms.items():
+            index = self.mono_to_index.get(elm.toMonomial())
+            if index is None or elm.type() == VariableType.Parameter:
+                terms.append((elm, exp))
+            else:
+                indices += [index] * exp
+        return indices, terms
+
+    def update(self, prob):
+        """convert the objective if it is replaced and the constraints added"""
+        if prob.obj is not self.obj:
+            self.setObjective(prob.obj)
+        if len(prob.constraints) > len(self.constraints):
+            self.addConstraints(prob.constraints[len(self.constraints) :])
+        for const in prob.matrix_constraints[len(self.matrix_constraints) :]:
+            M, F, fixed = split_matrix_constraint(const, self.mono_to_index)
+            self.matrix_constraints.append((const, M, F, fixed))
+        self.version = prob.version
+
+    def setObjective(self, obj):
+        from scipy.sparse import csr_matrix
+
+        assert obj.isQuadratic()
+        num_x = len(self.x)
+        rows, cols, data = [], [], []
+        c = np.zeros((num_x,), dtype=np_float)
+        polynomial = obj.toPolynomial().simplify()
+        C = polynomial.constant()
+        self.obj_terms = []
+        for mono, coeff in polynomial:
+            coeff *= mono.coeff
+            indices, terms = self.split(mono)
+            if len(indices) == 0:
+                targets = [("C", None)]
+            elif len(indices) == 1:
+                targets = [("c", (indices[0],))]
+            else:
+                i, j = indices
+                targets = [("Q", (i, j)), ("Q", (j, i))]
+            if terms:
+                parameter_terms = [
+                    ParameterTerm(target, index, coeff, terms)
+                    for target, index in targets
+                ]
+                self.obj_terms += parameter_terms
+                coeff = parameter_terms[0].last_value
+            if len(indices) == 0:
+                C += coeff
+            elif len(indices) == 1:
+                c[indices[0]] += coeff
+            else:
+                rows += [i, j]
+                cols += [j, i]
+                data += [coeff, coeff]
+        self.Q = csr_matrix(
+            (np.array(data, dtype=np_float), (rows, cols)), shape=(num_x, num_x)
+        )
+        self.c, self.C = c, C
+        self.obj = obj
+
+    def addConstraints(self, constraints):
+        from scipy.sparse import csr_matrix
+
+        vstack = vstack_func(sparse=True)
+        for const_type, matrix, rhs in [
+            (ConstraintType.Le, "G", "h"),
+            (ConstraintType.Eq, "A", "b"),
+        ]:
+            consts = [const for const in constraints if const.type() == const_type]
+            if not consts:
+                continue
+            M = getattr(self, matrix)
+            offset = 0 if M is None else M.shape[0]
+            rows, cols, data = [], [], []
+            b = np.empty((len(consts),), dtype=np_float)
+            for i, const in enumerate(consts):
+                assert const.isLinear()
+                polynomial = const.expression.toPolynomial()
+                # c.T.dot(x) + C <= 0 or c.T.dot(x) + C == 0
+                C = polynomial.constant()
+                for mono, coeff in polynomial:
+                    coeff *= mono.coeff
+                    indices, terms = self.split(mono)
+                    if terms:
+                        if indices:
+                            index = (offset + i, indices[0])
+                            term = ParameterTerm(matrix, index, coeff, terms)
+                            coeff = term.last_value
+                        else:
+                            term = ParameterTerm(rhs, (offset + i,), -coeff, terms)
+                            coeff = -term.last_value
+                        self.const_terms.append(term)
+                    if indices:
+                        rows.append(i)
+                        cols.append(indices[0])
+                        data.append(coeff)
+                    else:
+                        C += coeff
+                b[i] = -C
+            new_M = csr_matrix(
+                (np.array(data, dtype=np_float), (rows, cols)),
+                shape=(len(consts), len(self.x)),
+            )
+            if M is None:
+                setattr(self, matrix, new_M)
+                setattr(self, rhs, b)
+            else:
+                setattr(self, matrix, vstack([M, new_M]))
+                setattr(self, rhs, np.hstack([getattr(self, rhs), b]))
+        self.constraints += [(const, const.expression) for const in constraints]
+
+    def toQp(self):
+        """
+        Returns
+        -------
+        QpStructure
+            structure sharing Q, c, G, h, A and b with this cache
+            if there are no matrix constraints
+        """
+        lb = np.array([var.lowBound for var in self.x], dtype=np_float)
+        ub = np.array([var.upBound for var in self.x], dtype=np_float)
+        types = [type2str[var.type()] for var in self.x]
+
+        qp = QpStructure(
+            self.Q,
+            self.c,
+            self.C,
+            self.G,
+            self.h,
+            self.A,
+            self.b,
+            lb,
+            ub,
+            types,
+            self.x,
+        )
+        qp.parameter_terms = self.obj_terms + self.const_terms
+        qp.updateParameters()
+        self.C = qp.C
+        if not self.matrix_constraints:
+            return qp
+
+        # rows of matrix constraints follow the rows of constraints,
+        # and the stacked matrices are owned by qp with its own parameter terms
+        rows = {
+            ConstraintType.Le: ([qp.G], [qp.h]),
+            ConstraintType.Eq: ([qp.A], [qp.b]),
+        }
+        for const, M, F, fixed in self.matrix_constraints:
+            Ms, rhss = rows[const.type()]
+            Ms.append(M)
+            rhss.append(fixed_rhs(const.b, F, fixed))
+        vstack = vstack_func(sparse=True)
+        for const_type, matrix, rhs in [
+            (ConstraintType.Le, "G", "h"),
+            (ConstraintType.Eq, "A", "b"),
+        ]:
+            Ms, rhss = rows[const_type]
+            if len(Ms) > 1:
+                setattr(qp, matrix, vstack([M for M in Ms if M is not None]))
+                setattr(qp, rhs, np.hstack([r for r in rhss if r is not None]))
+        qp.parameter_terms = [copy.copy(term) for term in qp.parameter_terms]
+        return qp
+
+
 # -------------------------------------------------------
 #   Expression Structures
 # -------------------------------------------------------
@@ -146,6 +810,7 @@ class QpStructure:
         self.ub = to_nparray_or_None(ub)
         self.types = types
         self.x = to_nparray_or_None(x)
+        self.parameter_terms = []
 
     def numVariables(self):
         if self.x is not None:
@@ -156,7 +821,9 @@ class QpStructure:
             return self.A.shape[1]
 
     @classmethod
-    def fromFlopt(cls, prob, x=None, option=None, progress=False):
+    def fromFlopt(
+        cls, prob, x=None, option=None, progress=False, sparse=False, cache=False
+    ):
         """
         Parameters
         ----------
@@ -164,6 +831,14 @@ class QpStructure:
         x : None or list of VarElement family
         progress: bool
         option : {"ineq", "eq"}
+        sparse : bool
+            if it is true, Q, G and A are created as scipy.sparse.csr_matrix
+            (option must be None)
+        cache : bool
+            if it is true, the structure is created from prob.structure_cache,
+            which is updated incrementally by the objective and constraints
+            changed after the last call (sparse must be true).
+            The returned structure shares its matrices with the cache.
 
         Returns
         -------
@@ -173,16 +848,29 @@ class QpStructure:
             "ineq",
             "eq",
         }, f"option must be None, ineq or eq, but got {option}"
+        assert not (sparse and option is not None), "sparse supports only option=None"
+        assert not cache or sparse, "cache supports only sparse=True"
+        if cache:
+            structure_cache = prob.structure_cache
+            if x is None:
+                x = sorted_variables(prob)
+            if structure_cache is None or not structure_cache.isValid(prob, x):
+                structure_cache = StructureCache(FloptNdarray(x))
+                prob.structure_cache = structure_cache
+            structure_cache.update(prob)
+            return structure_cache.toQp()
         assert prob.obj.isQuadratic()
-        assert all(const.isLinear() for const in prob.getConstraints())
+        assert all(const.isLinear() for const in prob.constraints)
         if x is None:
-            variables = list(prob.getVariables())
-            x = FloptNdarray(sorted(variables, key=lambda v: ("__" in v.name, v.name)))
+            x = sorted_variables(prob)
         elif not isinstance(x, np.ndarray):
             x = FloptNdarray(x)
 
-        quadratic = prob.obj.toQuadratic(x)
-        Q, c, C = quadratic.Q, quadratic.c, quadratic.C
+        if sparse:
+            Q, c, C = quadratic_to_sparse(prob.obj, x)
+        else:
+            quadratic = prob.obj.toQuadratic(x)
+            Q, c, C = quadratic.Q, quadratic.c, quadratic.C
         if Q is not None:
             num_x = Q.shape[0]
         elif c is not None:
@@ -203,9 +891,13 @@ class QpStructure:
 
         # create G, h
         num_ineq_consts = sum(
-            const.type() == ConstraintType.Le for const in prob.getConstraints()
+            const.type() == ConstraintType.Le for const in prob.constraints
         )
-        if num_ineq_consts == 0:
+        if sparse:
+            G, h = sparse_rows(
+                prob.constraints, ConstraintType.Le, x, prob.matrix_constraints
+            )
+        elif num_ineq_consts == 0:
             G = None
             h = None
         else:
@@ -213,7 +905,7 @@ class QpStructure:
             h = np.zeros((num_ineq_consts,), dtype=np_float)
             i = 0
             for const in iter_wrapper(
-                prob.getConstraints(), desc="convert ineq constraints"
+                prob.constraints, desc="convert ineq constraints"
             ):
                 if const.type() == ConstraintType.Le:
                     # c.T.dot(x) + C <= 0
@@ -225,18 +917,20 @@ class QpStructure:
 
         # create A, b
         num_eq_consts = sum(
-            const.type() == ConstraintType.Eq for const in prob.getConstraints()
+            const.type() == ConstraintType.Eq for const in prob.constraints
         )
-        if num_eq_consts == 0:
+        if sparse:
+            A, b = sparse_rows(
+                prob.constraints, ConstraintType.Eq, x, prob.matrix_constraints
+            )
+        elif num_eq_consts == 0:
             A = None
             b = None
         else:
             A = np.zeros((num_eq_consts, num_x), dtype=np_float)
             b = np.zeros((num_eq_consts,), dtype=np_float)
             i = 0
-            for const in iter_wrapper(
-                prob.getConstraints(), desc="convert eq constraints"
-            ):
+            for const in iter_wrapper(prob.constraints, desc="convert eq constraints"):
                 if const.type() == ConstraintType.Eq:
                     linear = const.expression.toLinear(x)
                     A[i, :] = linear.c.T
@@ -244,20 +938,26 @@ class QpStructure:
                     i += 1
             assert i == num_eq_consts
 
+        # append rows of matrix constraints
+        if not sparse:
+            for const in prob.matrix_constraints:
+                M, rhs = matrix_constraint_to_sparse(const, x)
+                if const.type() == ConstraintType.Le:
+                    G = merge(np.vstack, [(G, 1), (M.toarray(), 1)])
+                    h = merge(np.hstack, [(h, 1), (rhs, 1)])
+                else:
+                    A = merge(np.vstack, [(A, 1), (M.toarray(), 1)])
+                    b = merge(np.hstack, [(b, 1), (rhs, 1)])
+
         # create lb, ub
         lb = np.array([var.lowBound for var in x], dtype=np_float)
         ub = np.array([var.upBound for var in x], dtype=np_float)
 
         # create types
-        type2str = {
-            VariableType.Continuous: "Continuous",
-            VariableType.Integer: "Integer",
-            VariableType.Binary: "Binary",
-            VariableType.Spin: "Spin",
-        }
         types = [type2str[var.type()] for var in x]
 
         qp = cls(Q, c, C, G, h, A, b, lb, ub, types, x)
+        qp.parameter_terms = collect_parameter_terms(prob, x)
 
         if option == "ineq":
             return qp.toIneq()
@@ -352,22 +1052,42 @@ class QpStructure:
         -------
         QpStructure
         """
-        G = np.array(self.G) if self.G is not None else None
-        h = np.array(self.h) if self.h is not None else None
-        if self.lb is not None:
-            I = np.identity(self.numVariables(), dtype=np_float)
-            non_none_ix = np.logical_not(np.isnan(self.lb))
-            G = merge(np.vstack, [(G, 1), (I[non_none_ix], -1)])
-            h = merge(np.hstack, [(h, 1), (self.lb[non_none_ix], -1)])
-        if self.ub is not None:
-            I = np.identity(self.numVariables(), dtype=np_float)
-            non_none_ix = np.logical_not(np.isnan(self.ub))
-            G = merge(np.vstack, [(G, 1), (I[non_none_ix], 1)])
-            h = merge(np.hstack, [(h, 1), (self.ub[non_none_ix], 1)])
+        from scipy.sparse import issparse
+
+        # bounds rows are sparse if the constraint matrices are sparse
+        sparse = any(issparse(M) for M in (self.Q, self.G, self.A))
+        G, h = self.G, self.h
+        for bounds, sign in [(self.lb, -1), (self.ub, 1)]:
+            if bounds is None:
+                continue
+            non_none_ix = np.flatnonzero(np.logical_not(np.isnan(bounds)))
+            if len(non_none_ix) == 0:
+                continue
+            I = identity_rows(non_none_ix, self.numVariables(), sparse)
+            G = merge(vstack_func(sparse), [(G, 1), (I, sign)])
+            h = merge(np.hstack, [(h, 1), (bounds[non_none_ix], sign)])
         lb, ub = None, None
-        return QpStructure(
+        qp = QpStructure(
             self.Q, self.c, self.C, G, h, self.A, self.b, lb, ub, self.types, self.x
         )
+        # rows of bounds are appended after G, so the parameter terms are kept
+        qp.parameter_terms = self.parameter_terms
+        return qp
+
+    def updateParameters(self, parameters=None):
+        """update the entries depending on parameters by their current values
+
+        Parameters
+        ----------
+        parameters : list of Parameter, optional
+            if it is given, only the entries containing these parameters are updated
+
+        Returns
+        -------
+        int
+            number of updated entries
+        """
+        return update_parameter_terms(self, parameters)
 
     def toFlopt(self, var_name="x"):
         """
@@ -395,7 +1115,7 @@ class QpStructure:
         return prob
 
     def isLp(self):
-        return self.Q is None or np.all(self.Q == 0)
+        return is_zero(self.Q)
 
     def toLp(self):
         """
@@ -408,17 +1128,18 @@ class QpStructure:
         ConversionError
             If this cannot be conversion to LpStructure
         """
-        if self.Q is not None and not np.all(self.Q == 0):
+        if not is_zero(self.Q):
             logger.info(f"linearization will be done because it is not linearize")
             prob = self.toFlopt()
             linearize(prob)
+            # matrix constraints are linear
             if prob.obj.isLinear() and all(
-                const.isLinear() for const in prob.getConstraints()
+                const.isLinear() for const in prob.constraints
             ):
                 return LpStructure.fromFlopt(prob)
             else:
                 raise ConversionError()
-        return LpStructure(
+        lp = LpStructure(
             self.c,
             self.C,
             self.G,
@@ -430,6 +1151,8 @@ class QpStructure:
             self.types,
             self.x,
         )
+        lp.parameter_terms = self.parameter_terms
+        return lp
 
     def toIsing(self):
         """
@@ -530,6 +1253,7 @@ class LpStructure:
         self.ub = to_nparray_or_None(ub)
         self.types = types
         self.x = to_nparray_or_None(x)
+        self.parameter_terms = []
 
     def numVariables(self):
         if self.x is not None:
@@ -556,7 +1280,9 @@ class LpStructure:
         return self.toQp().toEq().toLp()
 
     @classmethod
-    def fromFlopt(cls, prob, x=None, option=None, progress=False):
+    def fromFlopt(
+        cls, prob, x=None, option=None, progress=False, sparse=False, cache=False
+    ):
         """
         ::
 
@@ -568,6 +1294,12 @@ class LpStructure:
         x : None or list of Variable family
         option : {"ineq", "eq"}
         progress : bool
+        sparse : bool
+            if it is true, G and A are created as scipy.sparse.csr_matrix
+            (option must be None)
+        cache : bool
+            if it is true, the structure is created from prob.structure_cache
+            (see QpStructure.fromFlopt)
 
         Returns
         -------
@@ -577,13 +1309,30 @@ class LpStructure:
             "ineq",
             "eq",
         }, f"option must be None, ineq or eq, but got {option}"
-        qp = QpStructure.fromFlopt(prob, x, progress=progress)
+        qp = QpStructure.fromFlopt(
+            prob, x, progress=progress, sparse=sparse, cache=cache
+        )
         if option == "ineq":
             return qp.toIneq().toLp()
         elif option == "eq":
             return qp.toEq().toLp()
         return qp.toLp()
 
+    def updateParameters(self, parameters=None):
+        """update the entries depending on parameters by their current values
+
+        Parameters
+        ----------
+        parameters : list of Parameter, optional
+            if it is given, only the entries containing these parameters are updated
+
+        Returns
+        -------
+        int
+            number of updated entries
+        """
+        return update_parameter_terms(self, parameters)
+
     def toFlopt(self, var_name="x"):
         """
         ::
@@ -648,6 +1397,89 @@ class LpStructure:
         assert self.G is None and self.A is None
         return self.toIsing().toQubo()
 
+    def writeMps(self, path, name="flopt"):
+        """write the minimization problem into a (fixed format) mps file
+
+        Variables are renamed to X0000000, X0000001, ... and
+        constraints are renamed to C0000000, C0000001, ...
+        (rows of G follow by rows of A)
+
+        Parameters
+        ----------
+        path : str
+            mps file path
+        name : str
+            problem name
+
+        Returns
+        -------
+        list of str
+            variable names in the mps file
+        """
+        from scipy.sparse import csr_matrix, vstack
+
+        num_x = self.numVariables()
+        var_names = [f"X{i:07d}" for i in range(num_x)]
+        matrices, senses = [], []
+        if self.G is not None:
+            matrices.append(csr_matrix(self.G))
+            senses += ["L"] * self.G.shape[0]
+        if self.A is not None:
+            matrices.append(csr_matrix(self.A))
+            senses += ["E"] * self.A.shape[0]
+        rhs = merge(np.hstack, [(self.h, 1), (self.b, 1)])
+        const_names = [f"C{i:07d}" for i in range(len(senses))]
+        if matrices:
+            M = vstack(matrices, format="csc")
+        else:
+            M = csr_matrix((0, num_x)).tocsc()
+        c = np.zeros((num_x,), dtype=np_float) if self.c is None else self.c
+        types = self.types
+        if isinstance(types, str):
+            types = [types] * num_x
+
+        lines = [f"NAME          {name}", "ROWS", " N  OBJ"]
+        lines += [f" {sense}  {cname}" for sense, cname in zip(senses, const_names)]
+        lines.append("COLUMNS")
+        is_integer = False
+        for j in range(num_x):
+            if (types[j] != "Continuous") != is_integer:
+                is_integer = not is_integer
+                marker = "'INTORG'" if is_integer else "'INTEND'"
+                lines.append(f"    MARK      'MARKER'                 {marker}")
+            if c[j] != 0:
+                lines.append(f"    {var_names[j]:<8}  {'OBJ':<8}  {c[j]: .12e}")
+            for k in range(M.indptr[j], M.indptr[j + 1]):
+                lines.append(
+                    f"    {var_names[j]:<8}  {const_names[M.indices[k]]:<8}  {M.data[k]: .12e}"
+                )
+        if is_integer:
+            lines.append("    MARK      'MARKER'                 'INTEND'")
+        lines.append("RHS")
+        for cname, value in zip(const_names, [] if rhs is None else rhs):
+            if value != 0:
+                lines.append(f"    RHS       {cname:<8}  {value: .12e}")
+        lines.append("BOUNDS")
+        lb = np.full((num_x,), np.nan) if self.lb is None else self.lb
+        ub = np.full((num_x,), np.nan) if self.ub is None else self.ub
+        for var_name, l, u in zip(var_names, lb, ub):
+            if np.isnan(l) and np.isnan(u):
+                lines.append(f" FR BND       {var_name:<8}")
+                continue
+            if np.isnan(l):
+                lines.append(f" MI BND       {var_name:<8}")
+            else:
+                # lower bound is always written because integer variables
+                # without bounds are regarded as binary variables by some solvers
+                lines.append(f" LO BND       {var_name:<8}  {l: .12e}")
+            if not np.isnan(u):
+                lines.append(f" UP BND       {var_name:<8}  {u: .12e}")
+        lines.append("ENDATA")
+
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        return var_names
+
     def show(self, to_str=False):
         s = f"LpStructure\n"
         s += f"obj  c.T.dot(x) + C\n"
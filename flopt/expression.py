@@ -1,3 +1,4 @@
+import math
 import types
 import operator
 import functools
@@ -123,14 +124,17 @@ class ExpressionElement:
         return ExpressionType.Nonlinear
 
     def constant(self):
+        """
+        Returns
+        -------
+        float or int
+            constant term of the expanded expression
+        """
         if self.isPolynomial():
             return self.toPolynomial().constant()
-        else:
-            import sympy
-
-            return float(
-                sympy.sympify(self.getName()).expand().as_coefficients_dict()[1]
-            )
+        if not self.getVariables():
+            return self.value()
+        return 0
 
     def isMonomial(self):
         if self.isPolynomial():
@@ -196,7 +200,7 @@ class ExpressionElement:
         ), f"All elements of x must be VarElement family"
 
         num_variables = len(x)
-        polynomial = self.toPolynomial().simplify()
+        polynomial = self.toPolynomial().evaluateParameters().simplify()
         mono_to_index = {
             x[i].toMonomial(): i for i in itertools.product(*map(range, x.shape))
         }
@@ -217,8 +221,8 @@ class ExpressionElement:
                 if mono in mono_to_index:
                     c[mono_to_index[mono]] += coeff
                 else:
-                    # C += mono.toExpression()
-                    C += mono.value()
+                    # C += coeff * mono.toExpression()
+                    C += coeff * mono.value()
             elif mono.isQuadratic():
                 if len(mono.terms) == 1:
                     mono_a = list(mono.terms)[0].toMonomial()
@@ -226,8 +230,8 @@ class ExpressionElement:
                         a_ix = mono_to_index[mono_a]
                         Q[a_ix, a_ix] = 2 * coeff
                     else:
-                        # C += mono.toExpression() ** 2
-                        C += coeff * mono.value() ** 2
+                        # C += coeff * mono.toExpression()
+                        C += coeff * mono.value()
                 else:
                     var_a, var_b = list(mono.terms.keys())
                     mono_a, mono_b = var_a.toMonomial(), var_b.toMonomial()
@@ -300,7 +304,7 @@ class ExpressionElement:
         ), f"All elements of x must be VarElement family"
 
         num_variables = len(x)
-        polynomial = self.toPolynomial()
+        polynomial = self.toPolynomial().evaluateParameters()
         mono_to_index = {
             x[i].toMonomial(): i for i in itertools.product(*map(range, x.shape))
         }
@@ -309,8 +313,8 @@ class ExpressionElement:
         c = np.zeros((num_variables,), dtype=np_float)
         for mono, coeff in polynomial:
             if mono not in mono_to_index:
-                # C += mono.toExpression()
-                C += mono.value()
+                # C += coeff * mono.toExpression()
+                C += coeff * mono.value()
             else:
                 c[mono_to_index[mono]] = coeff
 
@@ -392,55 +396,64 @@ class ExpressionElement:
             return self.elmB * (self.elmA ** (self.elmB - 1)) * self.elmA.diff(x)
         return None
 
-    def simplify(self):
-        """
+    def simplify(self, use_sympy=False):
+        """simplify this expression
+
+        Polynomial expressions are simplified by Polynomial.simplify(),
+        e.g. x*x = x for binary and s*s = 1 for spin variables.
+        Otherwise, polynomial sub-expressions are simplified.
+
+        Parameters
+        ----------
+        use_sympy : bool
+            if it is true, non-polynomial expressions are simplified by sympy
+
         Returns
         -------
         Expression
         """
-        import sympy
+        if self.isPolynomial():
+            return polynomial_to_expression(self.toPolynomial().simplify())
+        if use_sympy:
+            import sympy
 
-        _locals = dict(
-            Exp=Exp, Cos=Cos, Sin=Sin, Tan=Tan, Log=Log, Abs=Abs, Floor=Floor, Ceil=Ceil
-        )
-        _locals.update({var.name: var for var in self.getVariables()})
+            return self.fromSympy(sympy.sympify(self.getName()).simplify())
+        return to_expression(expand_tree(self, simplify=True))
 
-        expr = eval(
-            str(sympy.sympify(self.getName()).simplify()),
-            _locals,
-        )
-        if isinstance(expr, number_classes):
-            expr = Const(expr)
-        return expr
+    def expand(self, use_sympy=False):
+        """expand this expression
+
+        Polynomial expressions are expanded by Polynomial.
+        Otherwise, polynomial sub-expressions are expanded.
+
+        Parameters
+        ----------
+        use_sympy : bool
+            if it is true, non-polynomial expressions are expanded by sympy
 
-    def expand(self):
-        """
         Returns
         -------
         Expression
         """
-        import sympy
+        if self.isPolynomial():
+            return polynomial_to_expression(self.toPolynomial())
+        if use_sympy:
+            import sympy
 
+            return self.fromSympy(sympy.sympify(self.getName()).expand())
+        return to_expression(expand_tree(self))
+
+    def fromSympy(self, sympy_expr):
+        """create the expression of the variables of self from sympy expression"""
         _locals = dict(
             Exp=Exp, Cos=Cos, Sin=Sin, Tan=Tan, Log=Log, Abs=Abs, Floor=Floor, Ceil=Ceil
         )
         _locals.update({var.name: var for var in self.getVariables()})
 
-        expr = eval(
-            str(sympy.simplify(self.getName()).expand()),
-            _locals,
-        )
+        expr = eval(str(sympy_expr), _locals)
         if isinstance(expr, number_classes):
-            expr = Const(expr)
-            return expr
-        elif isinstance(expr, Expression):
-            expr = eval(
-                str(sympy.sympify(expr.getName()).expand()),
-                _locals,
-            )
-            return expr
-        # VarElement family
-        return Expression(expr, Const(0), "+")
+            return Const(expr)
+        return to_expression(expr)
 
     def toBinary(self):
         """create expression replased binary to spin
@@ -463,6 +476,8 @@ class ExpressionElement:
             )
             for var in self.getVariables()
         }
+        if self.isPolynomial():
+            return substitute_polynomial(self.toPolynomial(), var_dict)
         return self.value(var_dict=var_dict).expand()
 
     def toSpin(self):
@@ -486,6 +501,8 @@ class ExpressionElement:
             )
             for var in self.getVariables()
         }
+        if self.isPolynomial():
+            return substitute_polynomial(self.toPolynomial(), var_dict)
         return self.value(var_dict=var_dict).expand()
 
     def __calculate(self, sense, solver, default_value, *args, **kwargs):
@@ -525,6 +542,34 @@ class ExpressionElement:
             )
             return default_value
 
+    def bounds(self):
+        """Calculate lower and upper bounds of expression by interval arithmetic
+
+        Bounds of variables are propagated through the expression tree.
+        Polynomial expressions are bounded term by term of the polynomial form,
+        so that cancelling terms such as x - x are handled.
+        The bounds are valid but may not be tight.
+
+        Returns
+        -------
+        tuple of float
+            lower and upper bounds, which are infinite if they cannot be bounded
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            import flopt
+            a = flopt.Variable("a", lowBound=-1, upBound=2)
+            b = flopt.Variable("b", lowBound=1, upBound=3)
+            (a * b + flopt.exp(b)).bounds()
+            >>> (-0.2817181715409549, 26.085536923187668)
+        """
+        if self.isPolynomial():
+            return polynomial_bounds(self.toPolynomial())
+        return -math.inf, math.inf
+
     def max(self, *args, **kwargs):
         """Calculate max value of expression when expression is linear or quadratic
 
@@ -1090,6 +1135,53 @@ class Expression(ExpressionElement):
                 hess[i, j] = jac[i].diff(x[j])
         return FloptNdarray(hess)
 
+    def constant(self):
+        """
+        Returns
+        -------
+        float or int
+            constant term of the expanded expression
+        """
+        if self.isPolynomial() or not self.getVariables():
+            return super().constant()
+        if self.operator == "+":
+            return self.elmA.constant() + self.elmB.constant()
+        elif self.operator == "-":
+            return self.elmA.constant() - self.elmB.constant()
+        elif self.operator == "*":
+            # (a0 + A)(b0 + B) = a0 b0 + (terms without constant)
+            return self.elmA.constant() * self.elmB.constant()
+        elif self.operator == "/" and not self.elmB.getVariables():
+            return self.elmA.constant() / self.elmB.value()
+        elif (
+            self.operator == "^"
+            and not self.elmB.getVariables()
+            and isinstance(exp := self.elmB.value(), int)
+            and exp >= 0
+        ):
+            return self.elmA.constant() ** exp
+        return 0
+
+    def bounds(self):
+        if self.isPolynomial():
+            return super().bounds()
+        (la, ua), (lb, ub) = self.elmA.bounds(), self.elmB.bounds()
+        if self.operator == "+":
+            return la + lb, ua + ub
+        elif self.operator == "-":
+            return la - ub, ua - lb
+        elif self.operator == "*":
+            return interval_mul((la, ua), (lb, ub))
+        elif self.operator == "/" and (lb > 0 or ub < 0):
+            return interval_mul((la, ua), (1 / ub, 1 / lb))
+        elif self.operator == "^" and lb == ub:
+            return interval_pow((la, ua), lb)
+        elif self.operator == "%" and lb == ub and lb > 0:
+            return 0, lb
+        elif self.operator in {"&", "|"}:
+            return 0, 1
+        return -math.inf, math.inf
+
     def traverse(self):
         yield self
         yield from self.elmA.traverse()
@@ -1328,6 +1420,61 @@ class CustomExpression(ExpressionElement):
         return f"CustomExpression({self.func.__name__, self.args, self.getName()})"
 
 
+class TourDistance(CustomExpression):
+    """Total distance of the closed tour represented by a permutation variable.
+
+    The value is D[perm[0], perm[1]] + ... + D[perm[-1], perm[0]].
+    Solvers for permutation (e.g. 2-Opt) can use the distance matrix
+    to evaluate a move from the changed edges only.
+
+    Parameters
+    ----------
+    D : array-like
+      distance matrix, D[i, j] is the distance from i to j
+    perm : VarPermutation
+      permutation variable whose values are indices of D
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+      D = [[0, 3, 2], [3, 0, 1], [2, 1, 0]]
+      perm = Variable("perm", lowBound=0, upBound=2, cat="Permutation")
+      prob = Problem("TSP")
+      prob += TourDistance(D, perm)
+    """
+
+    def __init__(self, D, perm, name=None):
+        self.D = np.asarray(D, dtype=np_float)
+        self.perm = perm
+
+        def tour_distance(perm):
+            perm = np.asarray(perm)
+            return float(self.D[perm, np.roll(perm, -1)].sum())
+
+        super().__init__(func=tour_distance, args=[perm], name=name)
+
+    def clone(self, *args, **kwargs):
+        return TourDistance(self.D, self.perm, self.name)
+
+    def value(self, solution=None, var_dict=None):
+        assert not (solution is not None and var_dict is not None)
+        if solution is not None:
+            var_dict = solution.toDict()
+        from flopt.variable import VarPermutation
+
+        perm = self.perm if var_dict is None else var_dict[self.perm.name]
+        if not isinstance(perm, VarPermutation):
+            perm = perm.value()
+        if isinstance(perm, VarPermutation):
+            perm = perm.view()
+        return self.func(perm)
+
+    def __repr__(self):
+        return f"TourDistance(D, {self.perm.name}, {self.getName()})"
+
+
 class Const(ExpressionElement):
     """
     It is the expression of constant value.
@@ -1537,7 +1684,7 @@ class Reduction(ExpressionElement):
         yield from self.elms
 
     def getVariables(self):
-        return functools.reduce(operator.or_, (elm.getVariables() for elm in self.elms))
+        return set().union(*(elm.getVariables() for elm in self.elms))
 
     def differentiable(self):
         return all(elm.differentiable() for elm in self.elms)
@@ -1605,7 +1752,29 @@ class Sum(Reduction):
         return all(elm.isPolynomial() for elm in self.elms)
 
     def setPolynomial(self):
-        self.polynomial = sum(elm.toPolynomial() for elm in self.elms)
+        # accumulate terms in a dictionary instead of creating a polynomial for each addition
+        terms, constant = dict(), 0
+        for elm in self.elms:
+            polynomial = elm.toPolynomial()
+            for mono, coeff in polynomial:
+                terms[mono] = terms.get(mono, 0) + coeff
+            constant += polynomial.constant()
+        terms = {mono: coeff for mono, coeff in terms.items() if coeff != 0}
+        self.polynomial = Polynomial(terms, constant)
+
+    def constant(self):
+        if self.isPolynomial():
+            return super().constant()
+        return sum(elm.constant() for elm in self.elms)
+
+    def bounds(self):
+        if self.isPolynomial():
+            return super().bounds()
+        lb, ub = 0, 0
+        for elm in self.elms:
+            elm_lb, elm_ub = elm.bounds()
+            lb, ub = lb + elm_lb, ub + elm_ub
+        return lb, ub
 
     def diff(self, x):
         return Sum([elm.diff(x) for elm in self.elms])
@@ -1703,6 +1872,16 @@ class Prod(Reduction):
             operator.mul, (elm.toPolynomial() for elm in self.elms)
         )
 
+    def constant(self):
+        if self.isPolynomial():
+            return super().constant()
+        return functools.reduce(operator.mul, (elm.constant() for elm in self.elms))
+
+    def bounds(self):
+        if self.isPolynomial():
+            return super().bounds()
+        return functools.reduce(interval_mul, (elm.bounds() for elm in self.elms))
+
     def __repr__(self):
         return f"Prod({self.elms})"
 
@@ -1713,6 +1892,8 @@ class Prod(Reduction):
 
 
 class MathOperation(ExpressionElement):
+    monotone = False
+
     def __init__(self, elm):
         self.elm = elm
         super().__init__()
@@ -1742,11 +1923,21 @@ class MathOperation(ExpressionElement):
         assert not (solution is not None and var_dict is not None)
         if solution is not None:
             var_dict = solution.toDict()
+        if var_dict is not None and self.elm.name in var_dict:
+            return self.func(var_dict[self.elm.name].value())
         return self.func(self.elm.value(var_dict=var_dict))
 
     def getVariables(self):
         return self.elm.getVariables()
 
+    def bounds(self):
+        """bounds of func(elm), where func is monotonically increasing if monotone is true"""
+        if not self.monotone:
+            return -math.inf, math.inf
+        lb, ub = self.elm.bounds()
+        with np.errstate(all="ignore"):
+            return float(self.func(lb)), float(self.func(ub))
+
     def isNeg(self):
         return False
 
@@ -1778,6 +1969,7 @@ class Exp(MathOperation):
     """
 
     operator = "Exp"
+    monotone = True
     func = np.exp
 
     def differentiable(self):
@@ -1798,6 +1990,9 @@ class Cos(MathOperation):
     operator = "Cos"
     func = np.cos
 
+    def bounds(self):
+        return -1, 1
+
     def differentiable(self):
         return self.elm.differentiable()
 
@@ -1816,6 +2011,9 @@ class Sin(MathOperation):
     operator = "Sin"
     func = np.sin
 
+    def bounds(self):
+        return -1, 1
+
     def differentiable(self):
         return self.elm.differentiable()
 
@@ -1852,6 +2050,12 @@ class Log(MathOperation):
     operator = "Log"
     func = np.log
 
+    def bounds(self):
+        lb, ub = self.elm.bounds()
+        if ub <= 0:
+            return -math.inf, math.inf
+        return (math.log(lb) if lb > 0 else -math.inf), math.log(ub)
+
     def differentiable(self):
         return self.elm.differentiable()
 
@@ -1870,6 +2074,14 @@ class Abs(MathOperation):
     operator = "Abs"
     func = np.abs
 
+    def bounds(self):
+        lb, ub = self.elm.bounds()
+        if lb >= 0:
+            return lb, ub
+        elif ub <= 0:
+            return -ub, -lb
+        return 0, max(-lb, ub)
+
     def differentiable(self):
         return False
 
@@ -1883,6 +2095,7 @@ class Floor(MathOperation):
     """
 
     operator = "Floor"
+    monotone = True
     func = np.floor
 
     def differentiable(self):
@@ -1898,7 +2111,179 @@ class Ceil(MathOperation):
     """
 
     operator = "Ceil"
+    monotone = True
     func = np.ceil
 
     def differentiable(self):
         return False
+
+
+# ------------------------------------------------
+#   Expand Functions
+# ------------------------------------------------
+def to_expression(elm):
+    """wrap a variable as Expression"""
+    if isinstance(elm, (Expression, Const)):
+        return elm
+    return Expression(elm, Const(0), "+")
+
+
+def balanced_tree(elms, operator):
+    """create an Expression tree of depth log(len(elms)) by pairing the elements"""
+    assert len(elms) > 0
+    while len(elms) > 1:
+        paired = [Expression(a, b, operator) for a, b in zip(elms[::2], elms[1::2])]
+        if len(elms) % 2 == 1:
+            paired.append(elms[-1])
+        elms = paired
+    return elms[0]
+
+
+def polynomial_to_expression(polynomial):
+    """create the expanded Expression of polynomial
+
+    Unlike Expression.fromPolynomial(), the result is a tree of Expression,
+    so that it can be traversed by Expression nodes.
+
+    Parameters
+    ----------
+    polynomial : Polynomial
+
+    Returns
+    -------
+    Expression or Const
+    """
+    elms = []
+    for mono, coeff in polynomial:
+        elm = balanced_tree(
+            [
+                var if exp == 1 else Expression(var, Const(exp), "^")
+                for var, exp in mono
+            ],
+            "*",
+        )
+        if (coeff := coeff * mono.coeff) != 1:
+            elm = Expression(Const(coeff), elm, "*")
+        elms.append(elm)
+    if polynomial.constant() != 0 or not elms:
+        elms.append(Const(polynomial.constant()))
+    return to_expression(balanced_tree(elms, "+"))
+
+
+def substitute_polynomial(polynomial, var_dict):
+    """substitute expressions for variables of polynomial
+
+    Parameters
+    ----------
+    polynomial : Polynomial
+    var_dict : dict
+        key is the name of variable and value is SelfReturn of polynomial expression
+
+    Returns
+    -------
+    Expression or Const
+        simplified expression
+    """
+    polynomials = {name: elm.value().toPolynomial() for name, elm in var_dict.items()}
+    terms, constant = dict(), polynomial.constant()
+    for mono, coeff in polynomial:
+        term = Polynomial(constant=coeff * mono.coeff)
+        for var, exp in mono:
+            term = term * polynomials.get(var.name, var.toPolynomial()) ** exp
+        for mono_, coeff_ in term:
+            terms[mono_] = terms.get(mono_, 0) + coeff_
+        constant += term.constant()
+    return polynomial_to_expression(Polynomial(terms, constant).simplify())
+
+
+def expand_tree(elm, simplify=False):
+    """expand polynomial sub-expressions of elm
+
+    Parameters
+    ----------
+    elm : VarElement family or Expression family
+    simplify : bool
+        if it is true, polynomial sub-expressions are simplified
+
+    Returns
+    -------
+    VarElement family or Expression family
+    """
+    if not isinstance(elm, ExpressionElement):
+        return elm  # variable
+    if elm.isPolynomial():
+        polynomial = elm.toPolynomial()
+        if simplify:
+            polynomial = polynomial.simplify()
+        return polynomial_to_expression(polynomial)
+    if isinstance(elm, Expression):
+        return Expression(
+            expand_tree(elm.elmA, simplify),
+            expand_tree(elm.elmB, simplify),
+            elm.operator,
+        )
+    elif isinstance(elm, Reduction):
+        elms = [expand_tree(_elm, simplify) for _elm in elm.elms]
+        return balanced_tree(elms, elm.operator)
+    elif isinstance(elm, MathOperation):
+        return elm.__class__(expand_tree(elm.elm, simplify))
+    return elm  # CustomExpression
+
+
+# ------------------------------------------------
+#   Interval Functions
+# ------------------------------------------------
+def interval_mul(a, b):
+    """product of intervals a = (la, ua) and b = (lb, ub)"""
+    products = [
+        0 if x == 0 or y == 0 else x * y for x, y in itertools.product(a, b)
+    ]  # 0 * inf = 0
+    return min(products), max(products)
+
+
+def interval_pow(a, exp):
+    """interval of x^exp for x in a = (la, ua)"""
+    la, ua = a
+    if isinstance(exp, int) or float(exp).is_integer():
+        exp = int(exp)
+        if exp == 0:
+            return 1, 1
+        if exp < 0:
+            if la <= 0 <= ua:
+                return -math.inf, math.inf
+            return interval_pow((1 / ua, 1 / la), -exp)
+        if exp % 2 == 1:
+            return la**exp, ua**exp
+        if la >= 0:
+            return la**exp, ua**exp
+        elif ua <= 0:
+            return ua**exp, la**exp
+        return 0, max(la**exp, ua**exp)
+    if la < 0:
+        return -math.inf, math.inf
+    if exp > 0:
+        return la**exp, ua**exp
+    if la == 0:
+        return ua**exp, math.inf
+    return ua**exp, la**exp
+
+
+def polynomial_bounds(polynomial):
+    """bounds of polynomial by the bounds of its monomials
+
+    Parameters
+    ----------
+    polynomial : Polynomial
+
+    Returns
+    -------
+    tuple of float
+    """
+    polynomial = polynomial.simplify()
+    lb = ub = polynomial.constant()
+    for mono, coeff in polynomial:
+        mono_bounds = (coeff * mono.coeff, coeff * mono.coeff)
+        for var, exp in mono:
+            mono_bounds = interval_mul(mono_bounds, interval_pow(var.bounds(), exp))
+        lb, ub = lb + mono_bounds[0], ub + mono_bounds[1]
+    return lb, ub
@@ -3,7 +3,7 @@ import itertools
 
 import numpy as np
 
-from flopt import Variable, CustomExpression, Problem, Sum
+from flopt import Variable, TourDistance, Problem, Sum
 from flopt.constants import VariableType, ExpressionType
 import flopt.env
 from flopt.env import setup_logger
@@ -180,13 +180,7 @@ class TSPInstance(BaseInstance):
         perm = Variable("perm", lowBound=0, upBound=self.dim - 1, cat="Permutation")
 
         # Object
-        def tsp_dist(perm):
-            distance = 0
-            for head, tail in zip(perm, perm[1:] + [perm[0]]):
-                distance += self.D[head][tail]
-            return distance
-
-        tsp_obj = CustomExpression(func=tsp_dist, args=[perm])
+        tsp_obj = TourDistance(self.D, perm)
 
         # Problem
         prob = Problem(name=f"TSP:{self.name}")
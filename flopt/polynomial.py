@@ -25,6 +25,7 @@ class Monomial:
         self.coeff = coeff
         self.max_degree = None
         self.is_linear = None
+        self.has_parameters = None
         self._hash = None
 
     def clone(self):
@@ -49,9 +50,60 @@ class Monomial:
             maximum degree of variables
         """
         if self.max_degree is None:
-            self.max_degree = max([0] + [exp for val, exp in self.terms.items()])
+            self.max_degree = max(
+                [0]
+                + [
+                    exp
+                    for var, exp in self.terms.items()
+                    if var.type() != VariableType.Parameter
+                ]
+            )
         return self.max_degree
 
+    def degree(self):
+        """
+        Returns
+        -------
+        int
+            sum of the exponents of variables (parameters are not counted)
+        """
+        return sum(
+            exp
+            for var, exp in self.terms.items()
+            if var.type() != VariableType.Parameter
+        )
+
+    def hasParameters(self):
+        """
+        Returns
+        -------
+        bool
+            return True if this monomial contains parameters else False
+        """
+        if self.has_parameters is None:
+            self.has_parameters = any(
+                var.type() == VariableType.Parameter for var in self.terms
+            )
+        return self.has_parameters
+
+    def splitParameters(self):
+        """split this monomial into the monomial of variables and the parameter part
+
+        Returns
+        -------
+        Monomial
+            monomial of variables (the coefficient is not included)
+        dict
+            terms of parameters, key is Parameter and value is exponent
+        """
+        var_terms, param_terms = {}, {}
+        for var, exp in self.terms.items():
+            if var.type() == VariableType.Parameter:
+                param_terms[var] = exp
+            else:
+                var_terms[var] = exp
+        return Monomial(var_terms), param_terms
+
     def diff(self, x):
         """
         Parameters
@@ -90,7 +142,7 @@ class Monomial:
             Return True if it is linear else False
         """
         if self.is_linear is None:
-            self.is_linear = self.maxDegree() <= 1 and len(self.terms) <= 1
+            self.is_linear = self.degree() <= 1
         return self.is_linear
 
     def isQuadratic(self):
@@ -100,7 +152,7 @@ class Monomial:
         bool
             Return True if it is quadratic else False
         """
-        return sum(self.terms.values()) <= 2
+        return self.degree() <= 2
 
     def toPolynomial(self):
         """
@@ -163,6 +215,7 @@ class Monomial:
             self.coeff *= other.coeff
             self.max_degree = None
             self.is_linear = None
+            self.has_parameters = None
         else:
             return NotImplemented
         self._hash = None
@@ -306,6 +359,41 @@ class Polynomial:
         """
         return len(self.terms) == 0 or (len(self.terms) == 1 and self._constant == 0)
 
+    def hasParameters(self):
+        """
+        Returns
+        -------
+        bool
+            return True if this polynomial contains parameters else False
+        """
+        return any(mono.hasParameters() for mono in self.terms)
+
+    def evaluateParameters(self):
+        """
+        Returns
+        -------
+        Polynomial
+            polynomial whose parameters are replaced by their current values.
+            Terms whose coefficients become zero are kept.
+        """
+        if not self.hasParameters():
+            return self
+        terms = {}
+        constant = self._constant
+        for mono, coeff in self:
+            if mono.hasParameters():
+                coeff *= mono.coeff
+                mono, param_terms = mono.splitParameters()
+                for param, exp in param_terms.items():
+                    coeff *= param.value() ** exp
+            if mono.isConstant():
+                constant += coeff * mono.coeff
+            elif mono in terms:
+                terms[mono] += coeff
+            else:
+                terms[mono] = coeff
+        return Polynomial(terms, constant)
+
     def toMonomial(self):
         """
         Returns
@@ -366,12 +454,14 @@ class Polynomial:
         """
         terms = {}
         constant = 0
-        for mono in self.terms.keys():
+        for mono, coeff in self.terms.items():
             _mono = mono.simplify()
             if _mono.isConstant():
-                constant += _mono.coeff
+                constant += _mono.coeff * coeff
             else:
-                terms[_mono] = self.terms[mono]
+                # monomials can be the same after simplification, e.g. x*x and x
+                terms[_mono] = terms.get(_mono, 0) + coeff
+        terms = {mono: coeff for mono, coeff in terms.items() if coeff != 0}
         return Polynomial(terms, constant + self._constant)
 
     def __add__(self, other):
@@ -1,7 +1,7 @@
 import flopt
 from flopt.variable import VarElement
 from flopt.expression import Expression, CustomExpression, Const, SelfReturn
-from flopt.constraint import Constraint
+from flopt.constraint import Constraint, MatrixConstraint
 from flopt.solvers import Solver
 from flopt.solution import Solution
 from flopt.constants import (
@@ -9,11 +9,11 @@ from flopt.constants import (
     ExpressionType,
     ConstraintType,
     OptimizationType,
+    SolverTerminateState,
     array_classes,
 )
 from flopt.env import setup_logger, create_variable_mode
 
-
 logger = setup_logger(__name__)
 
 
@@ -40,6 +40,11 @@ class Problem:
     solver : Solver or None
     time : float
         solving time
+    version : int
+        incremented whenever the objective or constraints are changed
+    structure_cache : StructureCache or None
+        sparse structure of this problem created by
+        QpStructure.fromFlopt(prob, cache=True)
 
     Examples
     --------
@@ -66,10 +71,14 @@ class Problem:
         self.obj = Const(0)
         self.obj_name = None
         self.constraints = []
+        self.matrix_constraints = []
         self.__variables = set()
         self.solver = None
         self.time = None
         self.best_bound = None
+        self.version = 0
+        self.structure_cache = None
+        self.__negative_obj = None
 
     def clone(self, variable_clone=False):
         """create clone object
@@ -90,16 +99,22 @@ class Problem:
             prob.setObjective(self.obj.clone(), self.obj_name)
             for const in self.constraints:
                 prob.addConstraint(const.clone(), const.name)
+            for const in self.matrix_constraints:
+                prob.addConstraint(const.clone(), const.name)
             return prob
 
         var_dict = {var.name: SelfReturn(var.clone()) for var in self.getVariables()}
         prob.setObjective(self.obj.value(var_dict=var_dict), self.obj_name)
         for const in self.constraints:
             const_exp = const.expression.value(var_dict=var_dict)
-            if const.type == ConstraintType.Eq:
+            if const.type() == ConstraintType.Eq:
                 prob.addConstraint(const_exp == 0, const.name)
             else:
                 prob.addConstraint(const_exp <= 0, const.name)
+        for const in self.matrix_constraints:
+            x = [var_dict[var.name].value() for var in const.x]
+            sense = "==" if const.type() == ConstraintType.Eq else "<="
+            prob.addConstraint(MatrixConstraint(const.A, x, sense, const.b), const.name)
         return prob
 
     def setObjective(self, obj, name=None):
@@ -116,6 +131,7 @@ class Problem:
             obj = Expression(obj, Const(0), "+")
         self.obj = obj
         self.obj_name = name
+        self.version += 1
 
     def setBestBound(self, best_bound):
         """
@@ -131,8 +147,8 @@ class Problem:
 
         Parameters
         ----------
-        const : Constraint
-            constraint
+        const : Constraint or MatrixConstraint
+            constraint, or block of linear constraints
         name : str or None
             constraint name
 
@@ -149,10 +165,16 @@ class Problem:
 
         """
         assert isinstance(
-            const, Constraint
-        ), f"assume Constraint class, but got {type(const)}"
-        const.name = name
-        self.constraints.append(const)
+            const, (Constraint, MatrixConstraint)
+        ), f"assume Constraint or MatrixConstraint class, but got {type(const)}"
+        if isinstance(const, MatrixConstraint):
+            if name is not None:
+                const.name = name
+            self.matrix_constraints.append(const)
+        else:
+            const.name = name
+            self.constraints.append(const)
+        self.version += 1
 
     def addConstraints(self, consts, name=None):
         for i, const in enumerate(consts):
@@ -186,10 +208,25 @@ class Problem:
             len(prob.constraints)
             >>> 1
 
+        Constraints are compared by Constraint.canonicalForm(),
+        and the first one of the equivalent constraints is kept.
         """
+        forms = set()
+        constraints = []
         for const in self.constraints:
-            const.expression = const.expression.expand()
-        self.constraints = list(set(self.constraints))
+            if (form := const.canonicalForm()) not in forms:
+                forms.add(form)
+                constraints.append(const)
+        self.constraints = constraints
+        self.clearCache()
+
+    def clearCache(self):
+        """Discard the cached structure of this problem.
+        Call this after changing the objective or constraints directly,
+        not through setObjective() or addConstraint().
+        """
+        self.structure_cache = None
+        self.version += 1
 
     def getObjectiveValue(self):
         """
@@ -210,6 +247,8 @@ class Problem:
         self.__variables = self.obj.getVariables()
         for const in self.constraints:
             self.__variables |= const.getVariables()
+        for const in self.matrix_constraints:
+            self.__variables |= const.getVariables()
 
         return self.__variables
 
@@ -218,9 +257,144 @@ class Problem:
         Returns
         -------
         list of Constraint
-            list of constraints in this problem
+            list of constraints in this problem,
+            which includes the rows of matrix constraints
         """
-        return self.constraints
+        if not self.matrix_constraints:
+            return self.constraints
+        constraints = list(self.constraints)
+        for const in self.matrix_constraints:
+            constraints += const.toConstraints()
+        return constraints
+
+    def getNumConstraints(self):
+        """
+        Returns
+        -------
+        int
+            number of constraints including the rows of matrix constraints
+        """
+        return len(self.constraints) + sum(map(len, self.matrix_constraints))
+
+    def createConstraintEvaluator(self, variables=None):
+        """create the evaluator of all constraints of this problem
+
+        Parameters
+        ----------
+        variables : None or list of VarElement family
+            variables whose values are given to the evaluator,
+            default is all variables of this problem
+
+        Returns
+        -------
+        ConstraintEvaluator
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            import flopt
+            x = flopt.Variable.array("x", 2, lowBound=0, upBound=2)
+            prob = flopt.Problem()
+            prob += x[0] + x[1] <= 1
+
+            evaluator = prob.createConstraintEvaluator(x)
+            evaluator.violations(np.array([[1, 1], [0, 1]]))
+            >>> array([[1.],
+                       [0.]])
+        """
+        from flopt.solvers.solver_utils import ConstraintEvaluator
+
+        if variables is None:
+            variables = sorted(self.getVariables(), key=lambda var: var.name)
+        return ConstraintEvaluator(self, variables)
+
+    def presolve(self, max_pass=10, tol=1e-9):
+        """Create a problem reduced by presolve
+
+        Fixed variables are removed, linear constraints with one variable are
+        converted into bounds, bounds are tightened by the activity of linear constraints,
+        and redundant or dominated linear constraints are removed.
+        Variables of this problem are not changed.
+
+        Parameters
+        ----------
+        max_pass : int
+            maximum number of passes over the constraints
+        tol : float
+            tolerance of the feasibility and the bound tightening
+
+        Returns
+        -------
+        prob : Problem
+            presolved problem
+        postsolve : PostsolveMap
+            postsolve.restore(solution) sets the values of the variables of this problem
+            from a solution of the presolved problem
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            presolved, postsolve = prob.presolve()
+            presolved.solve(solver="ScipyMilp")
+            solution = postsolve.restore(presolved.getSolution())
+
+        Or simply,
+
+        .. code-block:: python
+
+            prob.solve(solver="ScipyMilp", presolve=True)
+        """
+        from flopt.convert.presolve import presolve
+
+        return presolve(self, max_pass=max_pass, tol=tol)
+
+    def save(self, path):
+        """Save this problem in the compact binary format
+
+        Variables, polynomial expressions as sparse linear, quadratic and
+        higher degree blocks, non-polynomial expressions as a flat array of nodes
+        and the blocks of MatrixConstraint are stored in an uncompressed npz archive.
+        CustomExpression cannot be saved.
+
+        Parameters
+        ----------
+        path : str or file-like
+            if it is str and does not end with .npz, .npz is appended
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            prob.save("model.npz")
+            prob = flopt.Problem.load("model.npz")
+        """
+        from flopt.convert.serialize import save_problem
+
+        save_problem(self, path)
+
+    @staticmethod
+    def load(path, mmap_mode=None):
+        """Load the problem saved by Problem.save()
+
+        Parameters
+        ----------
+        path : str or file-like
+        mmap_mode : {None, "r", "c"}
+            if it is not None, the arrays are memory-mapped from the file,
+            and the blocks of MatrixConstraint refer to them without copying
+
+        Returns
+        -------
+        Problem
+        """
+        from flopt.convert.serialize import load_problem
+
+        return load_problem(path, mmap_mode=mmap_mode)
 
     def solve(
         self,
@@ -229,6 +403,7 @@ class Problem:
         lowerbound=None,
         optimized_variables=None,
         msg=False,
+        presolve=False,
         **kwargs,
     ):
         """solve this problem
@@ -243,6 +418,9 @@ class Problem:
             if it is specified, solver will optimize only the variables in optimized_variables
         msg : bool
             if true, display the message from solver
+        presolve : bool
+            if true, the solver solves the problem reduced by presolve(),
+            and the best solution is restored to the variables of this problem
 
         Returns
         -------
@@ -281,6 +459,31 @@ class Problem:
             solver = Solver("auto")
         elif isinstance(solver, str):
             solver = Solver(solver)
+
+        if presolve:
+            presolved, postsolve = self.presolve()
+            if not presolved.getVariables():
+                # presolve fixes all variables, so the solver is not needed
+                solver.reset()
+                self.solver, self.time = solver, 0.0
+                solver.best_solution = postsolve.restore()
+                solver.best_obj_value = self.obj.value()
+                if all(const.feasible() for const in self.getConstraints()):
+                    return SolverTerminateState.Normal, solver.log
+                return SolverTerminateState.Infeasible, solver.log
+            if optimized_variables is not None:
+                optimized_variables = [
+                    postsolve.reduced_variables[var.name]
+                    for var in optimized_variables
+                    if var.name not in postsolve.fixed
+                ]
+            status, log = presolved.solve(
+                solver, timelimit, lowerbound, optimized_variables, msg, **kwargs
+            )
+            self.solver, self.time = presolved.solver, presolved.time
+            self.solver.best_solution = postsolve.restore(self.solver.best_solution)
+            return status, log
+
         if timelimit is not None:
             solver.setParams(timelimit=timelimit)
         if lowerbound is not None:
@@ -288,8 +491,12 @@ class Problem:
         solver.setParams(**kwargs)
         self.solver = solver
 
+        obj = self.obj
         if self.sense.lower() == "maximize":
-            self.obj = -self.obj
+            # reuse the negative objective so that the cached structure is kept
+            if self.__negative_obj is None or self.__negative_obj[0] is not obj:
+                self.__negative_obj = (obj, -obj)
+            self.obj = self.__negative_obj[1]
 
         if optimized_variables is None:
             solution = Solution(self.getVariables())
@@ -307,8 +514,7 @@ class Problem:
             msg=msg,
         )
 
-        if self.sense.lower() == "maximize":
-            self.obj = -self.obj
+        self.obj = obj
 
         return status, log
 
@@ -382,12 +588,14 @@ class Problem:
                 break
 
         # constraint
-        if not self.constraints:
+        if not self.constraints and not self.matrix_constraints:
             problem_type["Constraint"] = ExpressionType.Non
         else:
             prob_expression_types = set(
-                const.expression.type() for const in self.getConstraints()
+                const.expression.type() for const in self.constraints
             )
+            if self.matrix_constraints:
+                prob_expression_types.add(ExpressionType.Linear)
             for expression_type in expression_types:
                 if prob_expression_types <= expression_type.expand():
                     problem_type["Constraint"] = expression_type
@@ -404,7 +612,7 @@ class Problem:
         """
         prob = self.clone()
         constraints = []
-        for const in prob.constraints:
+        for const in prob.getConstraints():
             if const.type() == ConstraintType.Eq:
                 constraints.append(const)
             else:  # ConstraintType.Le
@@ -414,6 +622,7 @@ class Problem:
                     )
                 constraints.append(const.expression + s == 0)
         prob.constraints = constraints
+        prob.matrix_constraints = []
         return prob
 
     def toIneq(self):
@@ -425,13 +634,14 @@ class Problem:
         """
         prob = self.clone()
         constraints = []
-        for const in prob.constraints:
+        for const in prob.getConstraints():
             if const.type() == ConstraintType.Le:
                 constraints.append(const)
             else:  # ConstraintType.Eq
                 constraints.append(const.expression <= 0)
                 constraints.append(const.expression >= 0)
         prob.constraints = constraints
+        prob.matrix_constraints = []
         return prob
 
     def boundsToIneq(self):
@@ -562,6 +772,8 @@ class Problem:
         for var, value in correspondence_dict.items():
             var_dict[var.name] = SelfReturn(value)
         prob.setObjective(prob.obj.value(var_dict=var_dict), prob.obj_name)
+        prob.constraints = prob.getConstraints()
+        prob.matrix_constraints = []
         for const in prob.constraints:
             const.expression = const.expression.value(var_dict=var_dict)
         return prob
@@ -569,7 +781,7 @@ class Problem:
     def __iadd__(self, other):
         if not isinstance(other, tuple):
             other = (other,)
-        if isinstance(other[0], Constraint):
+        if isinstance(other[0], (Constraint, MatrixConstraint)):
             self.addConstraint(*other)
         elif isinstance(other[0], array_classes):
             self.addConstraints(*other)
@@ -594,7 +806,7 @@ class Problem:
         s += f"{prefix}  Type         : {self.type}\n"
         s += f"{prefix}  sense        : {self.sense}\n"
         s += f"{prefix}  objective    : {obj_name}\n"
-        s += f"{prefix}  #constraints : {len(self.constraints)}\n"
+        s += f"{prefix}  #constraints : {self.getNumConstraints()}\n"
         s += f"{prefix}  #variables   : {len(self.getVariables())} ({variables_str})"
         return s
 
@@ -602,6 +814,8 @@ class Problem:
         s = str(self) + "\n\n"
         for ix, const in enumerate(self.constraints):
             s += f"  C {ix}, name {const.name}, {const}\n"
+        for ix, const in enumerate(self.matrix_constraints):
+            s += f"  M {ix}, name {const.name}, {const}\n"
         s += "\n"
         for ix, var in enumerate(self.getVariables()):
             s += f"  V {ix}, name {var.name}, {var.type()} {var.getLb()} <= {var.name} <= {var.getUb()}\n"
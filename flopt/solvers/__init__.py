@@ -7,11 +7,15 @@ algo_list = [
     "Random",
     "2-Opt",
     "SteepestDescent",
+    "Tabu",
     "OptunaTPE",
     "OptunaCmaEs",
     "OptunaNSGAII",
     "Hyperopt",
     "SFLA",
+    "DifferentialEvolution",
+    "ParticleSwarm",
+    "CmaEs",
     "Gurobi",
     "Pulp",
     "Scipy",
@@ -68,6 +72,10 @@ def Solver(algo="auto"):
         from flopt.solvers.steepest_descent import SteepestDescentSearch
 
         return SteepestDescentSearch()
+    elif algo == "tabu":
+        from flopt.solvers.tabu_search import TabuSearch
+
+        return TabuSearch()
     elif algo == "optunatpe":
         from flopt.solvers.optuna_searches import OptunaTPESearch
 
@@ -88,6 +96,20 @@ def Solver(algo="auto"):
         from flopt.solvers.shuffled_frog_leaping_search import ShuffledFrogLeapingSearch
 
         return ShuffledFrogLeapingSearch()
+    elif algo == "differentialevolution":
+        from flopt.solvers.differential_evolution_search import (
+            DifferentialEvolutionSearch,
+        )
+
+        return DifferentialEvolutionSearch()
+    elif algo == "particleswarm":
+        from flopt.solvers.particle_swarm_search import ParticleSwarmSearch
+
+        return ParticleSwarmSearch()
+    elif algo == "cmaes":
+        from flopt.solvers.cma_es_search import CmaEsSearch
+
+        return CmaEsSearch()
     elif algo == "gurobi":
         from flopt.solvers.gurobi_search import GurobiSearch
 
@@ -119,8 +119,8 @@ class AmplifySearch(BaseSearch):
         ising = objective.toIsing(x)
         f = -np_s.T.dot(ising.J).dot(np_s) - ising.h.T.dot(np_s) + ising.C
 
-        # constraints
-        for const in constraints:
+        # constraints (including the rows of matrix constraints)
+        for const in self.prob.getConstraints():
             ising = const.expression.toIsing(x)
             g = np_s.T.dot(ising.J).dot(np_s) - ising.h.T.dot(np_s) + ising.C
             if const.type() == ConstraintType.Eq:
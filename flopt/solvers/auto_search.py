@@ -145,38 +145,40 @@ class AutoSearch(BaseSearch):
                 logger.info(f"This problem is identified as {class_str}.")
             return is_problem_class
 
+        if check(problem_type, mip, "MIP"):
+            selector_class = MipSelector
+        elif check(problem_type, ising, "Ising"):
+            selector_class = IsingSelector
+        elif check(problem_type, qp, "Quadratic programming"):
+            selector_class = QpSelector
+        elif check(problem_type, permutation, "Permutation programming"):
+            selector_class = PermutationSelector
+        elif check(problem_type, nonlinear, "Nonlinear optimization"):
+            selector_class = NonlinearSelector
+        elif check(
+            problem_type,
+            nonlinear_mip,
+            "Nonlinear optimization with integer variables",
+        ):
+            selector_class = NonlinearMipSelector
+        elif check(problem_type, blackbox, "Blackbox optimization"):
+            selector_class = BlackBoxSelector
+        elif check(
+            problem_type,
+            blackbox_mip,
+            "Blackbox optimization with integer variables",
+        ):
+            selector_class = BlackBoxMipSelector
+        else:
+            return BaseSelector()
+
         try:
-            if check(problem_type, mip, "MIP"):
-                return MipSelector()
-            elif check(problem_type, ising, "Ising"):
-                return IsingSelector()
-            elif check(problem_type, qp, "Quadratic programming"):
-                return QpSelector()
-            elif check(problem_type, permutation, "Permutation programming"):
-                return PermutationSelector()
-            elif check(problem_type, nonlinear, "Nonlinear optimization"):
-                return NonlinearSelector()
-            elif check(
-                problem_type,
-                nonlinear_mip,
-                "Nonlinear optimization with integer variables",
-            ):
-                return NonlinearMipSelector()
-            elif check(problem_type, blackbox, "Blackbox optimization"):
-                return BlackBoxSelector()
-            elif check(
-                problem_type,
-                blackbox_mip,
-                "Blackbox optimization with integer variables",
-            ):
-                return BlackBoxMipSelector()
+            return selector_class()
         except ModelNotFound as e:
             logger.warning(e)
-            return BaseSelector()
         except ValueError as e:
             logger.warning(e)
-            return BaseSelector()
-        return BaseSelector()
+        return getattr(selector_class, "base_selector", BaseSelector)()
 
     def solve(self, solution, objective, constraints, prob, *args, **kwargs):
         """
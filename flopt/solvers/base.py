@@ -56,6 +56,9 @@ class BaseSearch:
         Solver Log class
     build_time : float
         time to build the problem for solver
+    constraint_evaluator : ConstraintEvaluator or None
+        evaluator of the constraints for the variables of solution,
+        which is created by getConstraintEvaluator() when it is needed
     start_time : float
         start time at calling solve()
     trial_ix : int
@@ -75,6 +78,7 @@ class BaseSearch:
         # core variables
         self.best_solution = None
         self.best_obj_value = float("inf")
+        self.constraint_evaluator = None
         # parameters
         self.timelimit = 3600
         self.lowerbound = -float("inf")
@@ -147,6 +151,7 @@ class BaseSearch:
 
         self.log = Log()
         self.prob = prob
+        self.constraint_evaluator = None
         self.msg = msg
         self.best_solution = solution.clone()
 
@@ -323,6 +328,15 @@ class BaseSearch:
                 return False
         else:
             available_constraint = self.can_solve_problems["Objective"].expand()
+            if (
+                prob.matrix_constraints
+                and not ExpressionType.Linear in available_constraint
+            ):
+                if verbose:
+                    logger.error(
+                        f"matrix constraints must be in {available_constraint}, but they are {ExpressionType.Linear}"
+                    )
+                return False
             for const in prob.constraints:
                 if not const.expression.type() in available_constraint:
                     if verbose:
@@ -402,9 +416,28 @@ class BaseSearch:
         """
         return self.prob.obj.value(solution)
 
+    def getConstraintEvaluator(self):
+        """
+        Returns
+        -------
+        ConstraintEvaluator
+            evaluator of the constraints for the variables of solution,
+            which is created at the first call for solvers
+            that evaluate the constraints repeatedly
+        """
+        if self.constraint_evaluator is None:
+            self.constraint_evaluator = self.prob.createConstraintEvaluator(
+                self.best_solution
+            )
+        return self.constraint_evaluator
+
     def startProcess(self, *args):
         """process of beginning of search"""
-        if all(const.feasible(self.best_solution) for const in self.prob.constraints):
+        if all(
+            const.feasible(self.best_solution) for const in self.prob.constraints
+        ) and all(
+            const.feasible(self.best_solution) for const in self.prob.matrix_constraints
+        ):
             self.best_obj_value = self.prob.obj.value(self.best_solution)
         else:
             self.best_obj_value = float("inf")
@@ -0,0 +1,281 @@
+import math
+
+import numpy as np
+
+from flopt.solvers.base import BaseSearch
+from flopt.solvers.solver_utils import create_batch_evaluator, PopulationEncoder
+from flopt.env import setup_logger
+from flopt.constants import VariableType, ExpressionType, SolverTerminateState, np_float
+
+logger = setup_logger(__name__)
+
+
+class CmaEsSearch(BaseSearch):
+    """CMA-ES (Covariance Matrix Adaptation Evolution Strategy)
+
+    Each generation is sampled as a (n_population, n) matrix
+    and evaluated in a single batch.
+    Variables with finite bounds are normalized into [0, 1] and
+    samples are clipped into the bounds before they are used to update
+    the distribution. The values of integer variables are rounded
+    only for evaluation.
+
+    The search restarts when the distribution converges
+    (small step size, flat objective values or ill-conditioned covariance matrix).
+
+    - restart = "ipop": the population size is doubled at each restart.
+    - restart = "bipop": restarts with doubled population sizes (large regime) and
+      restarts with small population sizes and step sizes (small regime) alternate so that
+      both regimes use similar numbers of evaluations.
+    - restart = None: restarts with the default population size.
+
+    Parameters
+    ----------
+    n_trial : int
+        number of generations
+    n_population : int or None
+        population size, if it is None, 4 + 3 log(n) is used
+    sigma0 : float
+        initial step size in the normalized space
+    restart : str or None
+        "ipop", "bipop" or None
+    separable : bool
+        if it is true, only the diagonal of covariance matrix is adapted (sep-CMA-ES),
+        which is O(n) per sample and suitable for high dimensional problems
+    tol_x : float
+        a run stops when the step size in all coordinates is less than this value
+    tol_fun : float
+        a run stops when the range of best objective values of recent generations is less than this value
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import flopt
+
+        x = flopt.Variable("x", lowBound=-1, upBound=1, cat="Continuous")
+        y = flopt.Variable("y", lowBound=-1, upBound=1, cat="Continuous")
+
+        prob = flopt.Problem()
+        prob += 2*x*x + x*y + y*y + x + y
+
+        status, log = prob.solve(solver="CmaEs", msg=True, timelimit=1)
+
+        print("obj =", flopt.Value(prob.obj))
+        print("x =", flopt.Value(x))
+        print("y =", flopt.Value(y))
+    """
+
+    name = "CmaEs"
+    can_solve_problems = {
+        "Variable": VariableType.Number,
+        "Objective": ExpressionType.Any,
+        "Constraint": ExpressionType.Non,
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.n_trial = 1e100
+        self.n_population = None
+        self.sigma0 = 0.3
+        self.restart = "ipop"
+        self.separable = False
+        self.tol_x = 1e-11
+        self.tol_fun = 1e-12
+        self.max_increase = 9
+
+    def search(self, solution, objective, *args):
+        self.start_build()
+
+        assert self.restart in {"ipop", "bipop", None}
+        n = len(solution)
+        evaluate = create_batch_evaluator(objective, list(solution))
+        self.encoder = PopulationEncoder(solution)
+
+        # normalize variables with finite bounds into [0, 1]
+        lb, ub = self.encoder.lb, self.encoder.ub
+        bounded = (lb > -1e10) & (ub < 1e10)
+        offset = np.where(bounded, lb, 0.0)
+        scale = np.where(bounded & (ub > lb), ub - lb, 1.0)
+        lower = (lb - offset) / scale
+        upper = (ub - offset) / scale
+
+        def decode(x):
+            return self.encoder.repair(offset + scale * x)
+
+        x0 = np.array(solution.value(), dtype=np_float)
+        x0 = np.clip((x0 - offset) / scale, lower, upper)
+
+        lam_default = self.n_population or 4 + int(3 * math.log(n))
+        lam, sigma0 = lam_default, self.sigma0
+        lam_large = lam_default
+        budget = {"large": 0, "small": 0}
+        regime = "large"
+        mean = x0
+
+        self.end_build()
+
+        n_run = 0
+        while True:
+            logger.debug(f"start CMA-ES run {n_run} with population size {lam}")
+            n_eval = self.run(
+                evaluate, decode, mean, sigma0, lam, lower, upper, n_run == 0
+            )
+            budget[regime] += n_eval
+            n_run += 1
+            if self.trial_ix >= self.n_trial:
+                break
+
+            # next run
+            mean = np.where(bounded, np.random.uniform(lower, upper), x0)
+            if self.restart == "ipop":
+                if lam < lam_default * 2**self.max_increase:
+                    lam *= 2
+            elif self.restart == "bipop":
+                if n_run > 1 and budget["small"] < budget["large"]:
+                    regime = "small"
+                    lam = int(
+                        lam_default
+                        * (0.5 * lam_large / lam_default) ** (np.random.rand() ** 2)
+                    )
+                    sigma0 = self.sigma0 * 10 ** (-2 * np.random.rand())
+                else:
+                    regime = "large"
+                    if lam_large < lam_default * 2**self.max_increase:
+                        lam_large *= 2
+                    lam, sigma0 = lam_large, self.sigma0
+
+        return SolverTerminateState.Normal
+
+    def run(self, evaluate, decode, mean, sigma, lam, lower, upper, first):
+        """run CMA-ES until the distribution converges
+
+        Parameters
+        ----------
+        evaluate : function
+            batch evaluator of the objective function
+        decode : function
+            map normalized samples to the values of variables
+        mean : numpy.ndarray
+            initial mean in the normalized space
+        sigma : float
+            initial step size
+        lam : int
+            population size
+        lower, upper : numpy.ndarray
+            bounds in the normalized space
+        first : bool
+            if it is true, the first sample is the initial mean
+
+        Returns
+        -------
+        int
+            number of evaluations
+        """
+        n = len(mean)
+        mu = lam // 2
+        weights = math.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        weights /= weights.sum()
+        mueff = 1.0 / (weights**2).sum()
+
+        cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+        cs = (mueff + 2) / (n + mueff + 5)
+        c1 = 2 / ((n + 1.3) ** 2 + mueff)
+        cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2) ** 2 + mueff))
+        if self.separable:
+            c1, cmu = c1 * (n + 2) / 3, min(1 - c1 * (n + 2) / 3, cmu * (n + 2) / 3)
+        damps = 1 + 2 * max(0, math.sqrt((mueff - 1) / (n + 1)) - 1) + cs
+        chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n**2))
+
+        mean = mean.copy()
+        ps, pc = np.zeros(n), np.zeros(n)
+        C = np.ones(n) if self.separable else np.eye(n)
+        B, D = np.eye(n), np.ones(n)
+        eigen_gen = 0
+        best_history = []
+        history_size = 10 + int(30 * n / lam)
+        n_eval = 0
+
+        gen = 0
+        while True:
+            gen += 1
+            # sample a generation
+            z = np.random.randn(lam, n)
+            y = z * D if self.separable else (z * D).dot(B.T)
+            x = np.clip(mean + sigma * y, lower, upper)
+            if first and gen == 1:
+                x[0] = mean
+            y = (x - mean) / sigma
+
+            X = decode(x)
+            f = evaluate(X)
+            n_eval += lam
+
+            # update best solution if needed
+            order = np.argsort(f)
+            self.registerSolution(
+                self.encoder.toSolution(X[order[0]]), f[order[0]], msg_tol=1e-8
+            )
+
+            # callbacks
+            if self.callbacks:
+                self.callback(self.encoder.toSolutions(X))
+
+            # check time limit
+            self.raiseTimeoutIfNeeded()
+
+            # update mean and evolution paths
+            y_sel = y[order[:mu]]
+            y_w = weights.dot(y_sel)
+            mean += sigma * y_w
+            if self.separable:
+                invsqrt_y_w = y_w / D
+            else:
+                invsqrt_y_w = B.dot(B.T.dot(y_w) / D)
+            ps = (1 - cs) * ps + math.sqrt(cs * (2 - cs) * mueff) * invsqrt_y_w
+            ps_norm = np.linalg.norm(ps)
+            hsig = ps_norm / math.sqrt(1 - (1 - cs) ** (2 * gen)) / chi_n < 1.4 + 2 / (
+                n + 1
+            )
+            pc = (1 - cc) * pc + hsig * math.sqrt(cc * (2 - cc) * mueff) * y_w
+
+            # update covariance matrix
+            c1a = c1 * (1 - (1 - hsig) * cc * (2 - cc))
+            if self.separable:
+                C = (1 - c1a - cmu) * C + c1 * pc**2 + cmu * weights.dot(y_sel**2)
+                D = np.sqrt(np.maximum(C, 1e-20))
+            else:
+                C = (
+                    (1 - c1a - cmu) * C
+                    + c1 * np.outer(pc, pc)
+                    + cmu * (y_sel.T * weights).dot(y_sel)
+                )
+                if gen - eigen_gen > lam / (c1 + cmu) / n / 10:
+                    eigen_gen = gen
+                    C = np.triu(C) + np.triu(C, 1).T
+                    eigvals, B = np.linalg.eigh(C)
+                    D = np.sqrt(np.maximum(eigvals, 1e-20))
+
+            # update step size
+            sigma *= math.exp(min(1.0, (cs / damps) * (ps_norm / chi_n - 1)))
+
+            if self.trial_ix >= self.n_trial:
+                break
+
+            # stopping criteria of this run
+            best_history.append(f[order[0]])
+            diag = C if self.separable else np.diag(C)
+            if sigma * math.sqrt(diag.max()) < self.tol_x:
+                break
+            if f[order[-1]] - f[order[0]] < self.tol_fun and (
+                len(best_history) >= history_size
+                and max(best_history[-history_size:])
+                - min(best_history[-history_size:])
+                < self.tol_fun
+            ):
+                break
+            if D.max() > 1e7 * D.min():
+                break
+
+        return n_eval
@@ -1,12 +1,18 @@
 import cvxopt
+import numpy as np
+from scipy.sparse import issparse
 
 from flopt.solvers.base import BaseSearch
 from flopt.convert import QpStructure
 from flopt.error import SolverError
-from flopt.constants import VariableType, ExpressionType, SolverTerminateState
+from flopt.constants import (
+    VariableType,
+    ExpressionType,
+    SolverTerminateState,
+    np_float,
+)
 from flopt.env import setup_logger
 
-
 logger = setup_logger(__name__)
 
 
@@ -59,11 +65,14 @@ class CvxoptSearch(BaseSearch):
 
     def search(self, solution, *args):
         self.start_build()
-        qp = QpStructure.fromFlopt(self.prob, solution).boundsToIneq()
+        qp = QpStructure.fromFlopt(
+            self.prob, solution, sparse=True, cache=True
+        ).boundsToIneq()
+        x0 = np.array([var.value() for var in solution], dtype=np_float)
         if qp.isLp():
-            sol = self.search_lp(qp.toLp())
+            sol = self.search_lp(qp.toLp(), x0)
         else:
-            sol = self.search_qp(qp)
+            sol = self.search_qp(qp, x0)
 
         if sol["x"] is None:
             return SolverTerminateState.Abnormal
@@ -79,28 +88,31 @@ class CvxoptSearch(BaseSearch):
 
         return SolverTerminateState.Normal
 
-    def search_qp(self, qp):
-
-        qp = qp.boundsToIneq()
-        Q = cvxopt.matrix(qp.Q)
-        c = cvxopt.matrix(qp.c)
-        G = cvxopt.matrix(qp.G) if qp.G is not None else None
-        h = cvxopt.matrix(qp.h) if qp.h is not None else None
-        A = cvxopt.matrix(qp.A) if qp.A is not None else None
-        b = cvxopt.matrix(qp.b) if qp.b is not None else None
+    def search_qp(self, qp, x0=None):
+        """
+        Parameters
+        ----------
+        qp : QpStructure
+            bounds must be converted into inequality constraints
+        x0 : np.ndarray, optional
+            initial point
+        """
+        Q = to_cvxopt_matrix(qp.Q)
+        c = to_cvxopt_matrix(qp.c)
+        G = to_cvxopt_matrix(qp.G)
+        h = to_cvxopt_matrix(qp.h)
+        A = to_cvxopt_matrix(qp.A)
+        b = to_cvxopt_matrix(qp.b)
+        initvals = {"x": to_cvxopt_matrix(x0)} if x0 is not None else None
 
         # settings
-        cvxopt.solvers.options["show_progress"] = self.msg
-        if self.n_trial is not None:
-            cvxopt.solvers.options["maxiters"] = self.n_trial
-        elif "maxiters" in cvxopt.solvers.options:
-            del cvxopt.solvers.options["maxiters"]
+        self.setOptions()
 
         self.end_build()
 
         # solve
         try:
-            sol = cvxopt.solvers.qp(Q, c, G, h, A, b)
+            sol = cvxopt.solvers.qp(Q, c, G, h, A, b, initvals=initvals)
         except ValueError as e:
             logger.warning(e)
             if G is not None and h is not None:
@@ -111,7 +123,7 @@ class CvxoptSearch(BaseSearch):
                 raise SolverError(e)
             try:
                 # resolve
-                sol = cvxopt.solvers.qp(Q, c, G, h, A, b)
+                sol = cvxopt.solvers.qp(Q, c, G, h, A, b, initvals=initvals)
             except Exception as e:
                 logger.error(e)
                 logger.error("-" * 20 + " CvxoptSearch Error Log " + "-" * 20)
@@ -134,23 +146,61 @@ class CvxoptSearch(BaseSearch):
 
         return sol
 
-    def search_lp(self, lp):
-
-        c = cvxopt.matrix(lp.c)
-        G = cvxopt.matrix(lp.G) if lp.G is not None else None
-        h = cvxopt.matrix(lp.h) if lp.h is not None else None
-        A = cvxopt.matrix(lp.A) if lp.A is not None else None
-        b = cvxopt.matrix(lp.b) if lp.b is not None else None
+    def search_lp(self, lp, x0=None):
+        """
+        Parameters
+        ----------
+        lp : LpStructure
+            bounds must be converted into inequality constraints
+        x0 : np.ndarray, optional
+            initial point, it is used only if it strictly satisfies
+            the inequality constraints
+        """
+        c = to_cvxopt_matrix(lp.c)
+        G = to_cvxopt_matrix(lp.G)
+        h = to_cvxopt_matrix(lp.h)
+        A = to_cvxopt_matrix(lp.A)
+        b = to_cvxopt_matrix(lp.b)
+
+        # primal start needs the slack s = h - Gx > 0
+        primalstart = None
+        if x0 is not None and lp.G is not None:
+            s = lp.h - lp.G.dot(x0)
+            if np.all(s > 0):
+                primalstart = {"x": to_cvxopt_matrix(x0), "s": to_cvxopt_matrix(s)}
 
         # settings
+        self.setOptions()
+
+        self.end_build()
+
+        # solve
+        sol = cvxopt.solvers.lp(c, G, h, A, b, primalstart=primalstart)
+        return sol
+
+    def setOptions(self):
         cvxopt.solvers.options["show_progress"] = self.msg
         if self.n_trial is not None:
             cvxopt.solvers.options["maxiters"] = self.n_trial
         elif "maxiters" in cvxopt.solvers.options:
             del cvxopt.solvers.options["maxiters"]
 
-        self.end_build()
 
-        # solve
-        sol = cvxopt.solvers.lp(c, G, h, A, b)
-        return sol
+def to_cvxopt_matrix(array):
+    """
+    Parameters
+    ----------
+    array : None, np.ndarray or scipy.sparse matrix
+
+    Returns
+    -------
+    None, cvxopt.matrix or cvxopt.spmatrix
+    """
+    if array is None:
+        return None
+    if issparse(array):
+        coo = array.tocoo()
+        return cvxopt.spmatrix(
+            coo.data.tolist(), coo.row.tolist(), coo.col.tolist(), size=coo.shape
+        )
+    return cvxopt.matrix(np.asarray(array, dtype=np_float))
@@ -0,0 +1,125 @@
+import numpy as np
+
+from flopt.solvers.base import BaseSearch
+from flopt.solvers.solver_utils import create_batch_evaluator, PopulationEncoder
+from flopt.env import setup_logger
+from flopt.constants import VariableType, ExpressionType, SolverTerminateState, np_float
+
+logger = setup_logger(__name__)
+
+
+class DifferentialEvolutionSearch(BaseSearch):
+    """Differential Evolution
+
+    The population is stored as a (n_population, n) matrix,
+    and all trial vectors of a generation are evaluated in a single batch.
+
+    1. Generate the population at random.
+    2. For each individual x, create a mutant vector
+       v = a + F (b - c) (rand1bin) or v = best + F (b - c) (best1bin),
+       where a, b and c are other individuals chosen at random.
+    3. Create the trial vector by the binomial crossover of x and v,
+       and clip it into the bounds. The values of integer variables are rounded.
+    4. Replace x with the trial vector if it is not worse than x.
+    5. Repeat step2 to step4.
+
+    Parameters
+    ----------
+    n_trial : int
+        number of generations
+    n_population : int
+        number of individuals
+    F : float
+        differential weight
+    CR : float
+        crossover probability
+    strategy : str
+        "rand1bin" or "best1bin"
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import flopt
+
+        x = flopt.Variable("x", lowBound=-1, upBound=1, cat="Continuous")
+        y = flopt.Variable("y", lowBound=-1, upBound=1, cat="Integer")
+
+        prob = flopt.Problem()
+        prob += 2*x*x + x*y + y*y + x + y
+
+        status, log = prob.solve(solver="DifferentialEvolution", msg=True, timelimit=1)
+
+        print("obj =", flopt.Value(prob.obj))
+        print("x =", flopt.Value(x))
+        print("y =", flopt.Value(y))
+    """
+
+    name = "DifferentialEvolution"
+    can_solve_problems = {
+        "Variable": VariableType.Number,
+        "Objective": ExpressionType.Any,
+        "Constraint": ExpressionType.Non,
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.n_trial = 1e100
+        self.n_population = 30
+        self.F = 0.8
+        self.CR = 0.9
+        self.strategy = "rand1bin"
+
+    def search(self, solution, objective, *args):
+        self.start_build()
+
+        assert self.strategy in {"rand1bin", "best1bin"}
+        n = len(solution)
+        P = max(4, self.n_population)
+        evaluate = create_batch_evaluator(objective, list(solution))
+        encoder = PopulationEncoder(solution)
+
+        # initial population (it contains the current solution)
+        X = encoder.random(P)
+        X[0] = encoder.repair(np.array([solution.value()], dtype=np_float))[0]
+        f = evaluate(X)
+
+        self.end_build()
+
+        rows = np.arange(P)
+        for _ in range(int(self.n_trial)):
+            # select three other individuals for each individual
+            r = np.random.rand(P, P)
+            r[rows, rows] = np.inf
+            r1, r2, r3 = np.argpartition(r, 3, axis=1)[:, :3].T
+
+            # mutation
+            if self.strategy == "rand1bin":
+                V = X[r1] + self.F * (X[r2] - X[r3])
+            else:
+                V = X[np.argmin(f)] + self.F * (X[r2] - X[r3])
+
+            # binomial crossover
+            cross = np.random.rand(P, n) < self.CR
+            cross[rows, np.random.randint(n, size=P)] = True
+            U = encoder.repair(np.where(cross, V, X))
+
+            # selection
+            f_U = evaluate(U)
+            improve = f_U <= f
+            X[improve] = U[improve]
+            f[improve] = f_U[improve]
+
+            # update best solution if needed
+            i = np.argmin(f)
+            self.registerSolution(encoder.toSolution(X[i]), f[i], msg_tol=1e-8)
+
+            # callbacks
+            if self.callbacks:
+                self.callback(encoder.toSolutions(X))
+
+            # check time limit
+            self.raiseTimeoutIfNeeded()
+
+        return SolverTerminateState.Normal
@@ -1,6 +1,9 @@
 import gurobipy
+import numpy as np
 
 from flopt.solvers.base import BaseSearch
+from flopt.convert import QpStructure
+from flopt.convert.structure import constraint_names
 from flopt.expression import Const
 from flopt.solution import Solution
 from flopt.constants import (
@@ -88,7 +91,10 @@ class GurobiSearch(BaseSearch):
 
     def search(self, solution, *args):
         self.start_build()
-        gp_model, gp_solution = self.createGpProblem(solution, self.prob)
+        # the objective of self.prob has been already converted into minimization form
+        gp_model, gp_solution = self.createGpProblem(
+            solution, self.prob, sense="minimize"
+        )
         self.end_build()
 
         # set parameters
@@ -152,13 +158,21 @@ class GurobiSearch(BaseSearch):
 
         return status
 
-    def createGpProblem(self, solution, prob):
+    def createGpProblem(self, solution, prob, sense=None):
         """Convert Problem into gurobi.Model
 
+        If all constraints are linear, the model is loaded in bulk
+        from the sparse QpStructure of the problem by the matrix API
+        (addMVar, setMObjective and addMConstr).
+        Otherwise, the objective and constraints are created by evaluating
+        the expressions with gurobi variables.
+
         Parameters
         ----------
         solution : Solution
         prob : Problem
+        sense : str, optional
+            sense of gurobi.Model, default is prob.sense
 
         Returns
         -------
@@ -167,17 +181,74 @@ class GurobiSearch(BaseSearch):
         name = "" if self.name is None else self.name
         gp_model = gurobipy.Model(name=name)
 
+        if sense is None:
+            sense = prob.sense
+        gp_sense = (
+            gurobipy.GRB.MINIMIZE
+            if sense.lower() == "minimize"
+            else gurobipy.GRB.MAXIMIZE
+        )
+
+        if all(const.isLinear() for const in prob.constraints):
+            gp_solution = self.createGpProblemFromMatrix(
+                gp_model, solution, prob, gp_sense
+            )
+        else:
+            gp_solution = self.createGpProblemFromTree(
+                gp_model, solution, prob, gp_sense
+            )
+        gp_model.update()
+
+        return gp_model, gp_solution
+
+    def createGpProblemFromMatrix(self, gp_model, solution, prob, gp_sense):
+        qp = QpStructure.fromFlopt(prob, x=solution, sparse=True, cache=True)
+
+        # variables
+        gp_x = gp_model.addMVar(
+            len(solution),
+            lb=np.where(np.isnan(qp.lb), -np.inf, qp.lb),
+            ub=np.where(np.isnan(qp.ub), np.inf, qp.ub),
+            vtype=np.array([to_vtype(var) for var in solution]),
+            name=np.array([var.getName() for var in solution]),
+        )
+        gp_model.update()
+        gp_solution = Solution([GpVar(gp_var) for gp_var in gp_x.tolist()])
+
+        # objective (gurobi does not scale the quadratic term by 1/2)
+        Q = 0.5 * qp.Q if qp.Q.count_nonzero() > 0 else None
+        gp_model.setMObjective(Q, qp.c, qp.C, sense=gp_sense)
+
+        # constraints (rows without variables are skipped)
+        for const_type, M, rhs, gp_const_sense in [
+            (ConstraintType.Le, qp.G, qp.h, gurobipy.GRB.LESS_EQUAL),
+            (ConstraintType.Eq, qp.A, qp.b, gurobipy.GRB.EQUAL),
+        ]:
+            if M is None:
+                continue
+            names = np.array(
+                [
+                    name if name is not None else ""
+                    for name in constraint_names(prob, const_type)
+                ]
+            )
+            is_nonempty = np.diff(M.indptr) > 0
+            if not is_nonempty.any():
+                continue
+            gp_consts = gp_model.addMConstr(
+                M[is_nonempty], gp_x, gp_const_sense, rhs[is_nonempty]
+            )
+            gp_model.setAttr(
+                "ConstrName", gp_consts.tolist(), names[is_nonempty].tolist()
+            )
+
+        return gp_solution
+
+    def createGpProblemFromTree(self, gp_model, solution, prob, gp_sense):
         gp_variables = list()
         for var in solution:
             var_name = var.getName()
-            if var.type() == VariableType.Binary:
-                vtype = gurobipy.GRB.BINARY
-            elif var.type() == VariableType.Integer:
-                vtype = gurobipy.GRB.INTEGER
-            elif var.type() == VariableType.Continuous:
-                vtype = gurobipy.GRB.CONTINUOUS
-            else:
-                raise ValueError(var.type())
+            vtype = to_vtype(var)
             var_lb = var.getLb() if var.getLb() is not None else -float("inf")
             var_ub = var.getUb() if var.getUb() is not None else float("inf")
             gp_var = gp_model.addVar(name=var_name, vtype=vtype, lb=var_lb, ub=var_ub)
@@ -186,13 +257,8 @@ class GurobiSearch(BaseSearch):
         gp_model.update()
         gp_solution = Solution(gp_variables)
 
-        # conver Problem -> pulp.LpProblem
+        # conver Problem -> gurobi.Model
         gp_obj = prob.obj.value(gp_solution)
-        gp_sense = (
-            gurobipy.GRB.MINIMIZE
-            if prob.sense in {"minimize", "Minimize"}
-            else gurobipy.GRB.MAXIMIZE
-        )
         gp_model.setObjective(gp_obj, gp_sense)
 
         for const in prob.getConstraints():
@@ -204,6 +270,14 @@ class GurobiSearch(BaseSearch):
                 else:  # const.type() == ConstraintType.Le
                     gp_model.addConstr(const_exp <= 0, name=const_name)
 
-        gp_model.update()
+        return gp_solution
 
-        return gp_model, gp_solution
+
+def to_vtype(var):
+    if var.type() == VariableType.Binary:
+        return gurobipy.GRB.BINARY
+    elif var.type() == VariableType.Integer:
+        return gurobipy.GRB.INTEGER
+    elif var.type() == VariableType.Continuous:
+        return gurobipy.GRB.CONTINUOUS
+    raise ValueError(var.type())
@@ -1,9 +1,17 @@
-import weakref
+import os
+import pickle
 
+import numpy as np
 import hyperopt
 
 from flopt.solvers.base import BaseSearch
-from flopt.constants import VariableType, ExpressionType, SolverTerminateState
+from flopt.solvers.solver_utils import create_batch_evaluator, parallel_evaluator
+from flopt.constants import (
+    VariableType,
+    ExpressionType,
+    SolverTerminateState,
+    np_float,
+)
 from flopt.env import setup_logger
 
 
@@ -25,12 +33,24 @@ class HyperoptSearch(BaseSearch):
     """
     TPE Search using Hyperopt (https://hyperopt.github.io/hyperopt/)
 
+    When batch_size or n_jobs is greater than one, batch_size points are suggested
+    at once by TPE (points being evaluated are regarded as trials with infinite loss),
+    and they are evaluated by batch evaluators in n_jobs worker processes.
+
     Parameters
     ----------
     n_trial : int
         number of trials
     show_progressbar : bool
         whether display a progress bar of search
+    n_jobs : int
+        number of worker processes to evaluate suggested points
+    batch_size : int
+        number of points suggested at once (at least n_jobs)
+    trials_file : str or None
+        file of pickled hyperopt.Trials.
+        If the file exists, the search starts from its trials,
+        and the trials are saved to the file after the search.
 
     Examples
     --------
@@ -65,9 +85,12 @@ class HyperoptSearch(BaseSearch):
 
         self.n_trial = 1e100
         self.show_progressbar = False
+        self.n_jobs = 1
+        self.batch_size = 1
+        self.trials_file = None
         self.hyperopt_STATUS_OK = STATUS_OK
 
-    def search(self, solution, *args):
+    def search(self, solution, objective, *args):
 
         self.start_build()
 
@@ -77,20 +100,20 @@ class HyperoptSearch(BaseSearch):
             name = var.name
             lb = var.getLb(number=True)
             ub = var.getUb(number=True)
-            if var.type() in {
-                VariableType.Integer,
-                VariableType.Binary,
-                VariableType.Spin,
-            }:
+            if var.type() == VariableType.Spin:
+                var_space = hyperopt.hp.quniform(name, 0, 1, 1)
+            elif var.type() in {VariableType.Integer, VariableType.Binary}:
                 var_space = hyperopt.hp.quniform(name, lb, ub, 1)
             elif var.type() == VariableType.Continuous:
                 var_space = hyperopt.hp.uniform(name, lb, ub)
             space[var.name] = var_space
 
+        var_dict = solution.toDict()
+
         def objective_func(var_value_dict):
             # set value into solution
             for name, value in var_value_dict.items():
-                if var.type() == VariableType.Spin:
+                if var_dict[name].type() == VariableType.Spin:
                     value = 2 * value - 1  # binary -> spin
                 solution.setValue(name, value)
             obj_value = self.getObjValue(solution)
@@ -106,15 +129,149 @@ class HyperoptSearch(BaseSearch):
 
             return {"loss": obj_value, "status": self.hyperopt_STATUS_OK}
 
+        trials = self.loadTrials(solution)
+
         self.end_build()
 
         # search
-        hyperopt.fmin(
-            objective_func,
-            space=space,
-            algo=hyperopt.tpe.suggest,
-            max_evals=self.n_trial,
-            show_progressbar=self.show_progressbar,
-        )
+        try:
+            if self.n_jobs == 1 and self.batch_size == 1:
+                hyperopt.fmin(
+                    objective_func,
+                    space=space,
+                    algo=hyperopt.tpe.suggest,
+                    max_evals=len(trials) + self.n_trial,
+                    trials=trials,
+                    show_progressbar=self.show_progressbar,
+                )
+            else:
+                self.searchBatch(solution, objective, objective_func, space, trials)
+        finally:
+            self.saveTrials(trials)
 
         return SolverTerminateState.Normal
+
+    def searchBatch(self, solution, objective, objective_func, space, trials):
+        """search by evaluating batches of suggested points
+
+        Parameters
+        ----------
+        solution : Solution
+        objective : Expression
+        objective_func : function
+            objective function of hyperopt for a point
+        space : dict
+            search space of hyperopt
+        trials : hyperopt.Trials
+        """
+        domain = hyperopt.Domain(objective_func, space)
+        evaluators = [create_batch_evaluator(objective, list(solution))]
+        batch_size = max(self.batch_size, self.n_jobs)
+
+        n_trial = 0
+        with parallel_evaluator(evaluators, self.n_jobs) as evaluate:
+            while n_trial < self.n_trial:
+                # suggest points one by one so that TPE sees pending points
+                k = int(min(batch_size, self.n_trial - n_trial))
+                docs = []
+                for _ in range(k):
+                    new_ids = trials.new_trial_ids(1)
+                    seed = np.random.randint(2**31 - 1)
+                    new_docs = hyperopt.tpe.suggest(new_ids, domain, trials, seed)
+                    trials.insert_trial_docs(new_docs)
+                    trials.refresh()
+                    docs.extend(new_docs)
+                values = [self.toValues(doc, solution) for doc in docs]
+                (obj_values,) = evaluate(np.array(values, dtype=np_float))
+
+                # store results into trials
+                # (trials.trials has the inserted documents, not copies of docs)
+                obj_value_dict = dict(zip((doc["tid"] for doc in docs), obj_values))
+                for doc in trials.trials:
+                    if doc["tid"] in obj_value_dict:
+                        doc["state"] = hyperopt.JOB_STATE_DONE
+                        doc["result"] = {
+                            "loss": float(obj_value_dict[doc["tid"]]),
+                            "status": self.hyperopt_STATUS_OK,
+                        }
+                trials.refresh()
+
+                for value, obj_value in zip(values, obj_values):
+                    # update best solution if needed
+                    solution.setValuesFromArray(value)
+                    self.registerSolution(solution, obj_value)
+
+                    # callback
+                    self.callback([solution])
+
+                n_trial += k
+
+                # check time limit
+                self.raiseTimeoutIfNeeded()
+
+    def toValues(self, doc, solution):
+        """
+        Parameters
+        ----------
+        doc : dict
+            document of a trial
+        solution : Solution
+
+        Returns
+        -------
+        list
+            values of variables in solution suggested in the trial
+        """
+        vals = doc["misc"]["vals"]
+        values = []
+        for var in solution:
+            value = vals[var.name][0]
+            if var.type() == VariableType.Spin:
+                value = 2 * int(value) - 1  # binary -> spin
+            elif var.type() == VariableType.Continuous:
+                value = float(value)
+            else:
+                value = int(value)
+            values.append(value)
+        return values
+
+    def loadTrials(self, solution):
+        """load trials from self.trials_file if it exists, and
+        register the best trial in them as the incumbent
+
+        Parameters
+        ----------
+        solution : Solution
+
+        Returns
+        -------
+        hyperopt.Trials
+        """
+        if self.trials_file is None or not os.path.exists(self.trials_file):
+            return hyperopt.Trials()
+        with open(self.trials_file, "rb") as f:
+            trials = pickle.load(f)
+        losses = [float("inf") if loss is None else loss for loss in trials.losses()]
+        if losses and min(losses) < float("inf"):
+            doc = trials.trials[losses.index(min(losses))]
+            if all(var.name in doc["misc"]["vals"] for var in solution):
+                solution.setValuesFromArray(self.toValues(doc, solution))
+                self.registerSolution(solution, min(losses))
+        return trials
+
+    def saveTrials(self, trials):
+        """save trials into self.trials_file
+
+        Parameters
+        ----------
+        trials : hyperopt.Trials
+        """
+        if self.trials_file is None:
+            return
+        # remove points not evaluated by timeout
+        trials.refresh()
+        done_trials = hyperopt.trials_from_docs(
+            [doc for doc in trials.trials if doc["state"] == hyperopt.JOB_STATE_DONE]
+        )
+        with open(self.trials_file, "wb") as f:
+            pickle.dump(done_trials, f)
@@ -1,19 +1,21 @@
+import numpy as np
 from optuna.study import create_study
+from optuna.trial import TrialState
 from optuna.samplers import TPESampler, CmaEsSampler, NSGAIISampler  # , BoTorchSampler
 from optuna.logging import disable_default_handler
 import timeout_decorator
 
 import flopt
 from flopt.solvers.base import BaseSearch
+from flopt.solvers.solver_utils import create_batch_evaluator, parallel_evaluator
 from flopt.constants import (
     VariableType,
     ExpressionType,
-    ConstraintType,
     SolverTerminateState,
+    np_float,
 )
 from flopt.env import setup_logger
 
-
 logger = setup_logger(__name__)
 
 
@@ -25,62 +27,167 @@ class OptunaSearch(BaseSearch):
       2. Check a new solution can be incumbent solutions
       3. Update incumbent solution
 
+    When batch_size or n_jobs is greater than one, trials are generated by
+    the ask-and-tell interface of Optuna in batches.
+    The objective and constraint values of a batch are calculated by batch evaluators,
+    and the batch is split across n_jobs worker processes when n_jobs is greater than one.
+
     Parameters
     ----------
     n_trial : int
         number of trials
+    n_jobs : int
+        number of worker processes to evaluate a batch of trials
+    batch_size : int
+        number of trials generated at once (at least n_jobs)
+    storage : str or None
+        storage of the study.
+        A path ending with ".log" or ".journal" is used as a journal file,
+        other paths are used as SQLite database files,
+        and a database URL such as "sqlite:///flopt.db" is passed to Optuna as it is.
+        If it is None, the study is kept in memory.
+    study_name : str or None
+        name of the study in the storage.
+        If the storage already has the study, the search resumes from its trials
+        and several processes can share the study.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        # the second call resumes the study saved in the first call
+        prob.solve(solver="OptunaTPE", n_trial=100, storage="flopt.db", study_name="tuning")
+        prob.solve(solver="OptunaTPE", n_trial=100, storage="flopt.db", study_name="tuning")
     """
 
     def __init__(self):
         super().__init__()
         self.n_trial = 1e100
+        self.n_jobs = 1
+        self.batch_size = 1
+        self.storage = None
+        self.study_name = None
 
     def createStudy(self):
         raise NotImplementedError()
 
-    def search(self, solution, *args):
+    def createStudyWithSampler(self, sampler):
+        """create Study object with sampler in the storage
+
+        Parameters
+        ----------
+        sampler : optuna.samplers.BaseSampler
+        """
+        if self.storage is None:
+            self.study = create_study(sampler=sampler, study_name=self.study_name)
+            return
+        assert self.study_name is not None, "study_name is needed to use storage"
+        self.study = create_study(
+            sampler=sampler,
+            storage=self.getStorage(),
+            study_name=self.study_name,
+            load_if_exists=True,
+        )
+
+    def getStorage(self):
+        """
+        Returns
+        -------
+        str or optuna.storages.BaseStorage
+            storage of Optuna from self.storage
+        """
+        storage = self.storage
+        if not isinstance(storage, str) or "://" in storage:
+            return storage
+        if storage.endswith((".log", ".journal")):
+            from optuna.storages import JournalStorage
+
+            try:
+                from optuna.storages.journal import JournalFileBackend
+            except ImportError:  # optuna < 4.0
+                from optuna.storages import JournalFileStorage as JournalFileBackend
+            return JournalStorage(JournalFileBackend(storage))
+        return f"sqlite:///{storage}"
+
+    def loadIncumbent(self, solution):
+        """register the best feasible trial already in the study
+
+        Parameters
+        ----------
+        solution : Solution
+        """
+        best_trial, best_value = None, float("inf")
+        for trial in self.study.get_trials(
+            deepcopy=False, states=(TrialState.COMPLETE,)
+        ):
+            const_values = trial.user_attrs.get("constraint", [])
+            if trial.value < best_value and all(v <= 0 for v in const_values):
+                best_trial, best_value = trial, trial.value
+        if best_trial is None or any(
+            var.name not in best_trial.params for var in solution
+        ):
+            return
+        values = []
+        for var in solution:
+            value = best_trial.params[var.name]
+            if var.type() == VariableType.Spin:
+                value = 2 * value - 1
+            values.append(value)
+        solution.setValuesFromArray(values)
+        self.registerSolution(solution, best_value)
+
+    def suggest(self, trial, solution):
+        """suggest values of variables by trial
+
+        Parameters
+        ----------
+        trial : optuna.trial.Trial
+        solution : Solution
+
+        Returns
+        -------
+        list
+            values of variables in solution
+        """
+        values = []
+        for var in solution:
+            if var.type() == VariableType.Binary:
+                values.append(trial.suggest_int(var.name, 0, 1))
+            elif var.type() == VariableType.Spin:
+                values.append(2 * trial.suggest_int(var.name, 0, 1) - 1)
+            elif var.type() == VariableType.Integer:
+                lb = var.getLb(number=True)
+                ub = var.getUb(number=True)
+                values.append(trial.suggest_int(var.name, lb, ub))
+            elif var.type() == VariableType.Continuous:
+                lb = var.getLb(number=True)
+                ub = var.getUb(number=True)
+                values.append(trial.suggest_float(var.name, lb, ub))
+        return values
+
+    def search(self, solution, objective, *args):
         self.start_build()
         self.createStudy(solution)
+        self.loadIncumbent(solution)
+
+        evaluator = self.getConstraintEvaluator()
 
         def objective_func(trial):
             # set value into solution
-            for var in solution:
-                if var.type() == VariableType.Binary:
-                    var.setValue(trial.suggest_int(var.name, 0, 1))
-                elif var.type() == VariableType.Spin:
-                    var.toBinary()
-                    var.binary.setValue(trial.suggest_int(var.name, 0, 1))
-                elif var.type() == VariableType.Integer:
-                    lb = var.getLb(number=True)
-                    ub = var.getUb(number=True)
-                    var.setValue(trial.suggest_int(var.name, lb, ub))
-                elif var.type() == VariableType.Continuous:
-                    lb = var.getLb(number=True)
-                    ub = var.getUb(number=True)
-                    var.setValue(trial.suggest_float(var.name, lb, ub))
+            solution.setValuesFromArray(self.suggest(trial, solution))
             obj_value = self.getObjValue(solution)
 
             # Constraints which are considered feasible if less than or equal to zero.
-            optuna_const_values = list()
-            for const in self.prob.getConstraints():
-                if const.type() == ConstraintType.Le:
-                    optuna_const_values.append(const.value(solution))
-                elif const.type() == ConstraintType.Eq:
-                    optuna_const_values.append(const.value(solution))
-                    optuna_const_values.append(-const.value(solution))
-                else:
-                    raise Exception()
+            const_values = evaluator.values(solution)
+            optuna_const_values = to_optuna_constraints(const_values, evaluator.is_eq)
 
             # Store the constraints as user attributes so that they can be restored after optimization.
             trial.set_user_attr("constraint", optuna_const_values)
 
             # update best solution if needed
-            if self.prob.getConstraints():
-                if all(
-                    const.feasible(solution) for const in self.prob.getConstraints()
-                ):
-                    self.registerSolution(solution, obj_value)
-            else:
+            is_eq = evaluator.is_eq
+            if np.all(np.where(is_eq, const_values == 0, const_values <= 0)):
                 self.registerSolution(solution, obj_value)
 
             # callback
@@ -93,7 +200,12 @@ class OptunaSearch(BaseSearch):
 
         @timeout_decorator.timeout(search_timelimit, timeout_exception=TimeoutError)
         def optimize():
-            self.study.optimize(objective_func, self.n_trial, timeout=search_timelimit)
+            if self.n_jobs == 1 and self.batch_size == 1:
+                self.study.optimize(
+                    objective_func, self.n_trial, timeout=search_timelimit
+                )
+            else:
+                self.optimizeBatch(solution, objective)
 
         def set_best_value():
             if self.best_obj_value < float("inf"):
@@ -114,6 +226,74 @@ class OptunaSearch(BaseSearch):
 
         return SolverTerminateState.Normal
 
+    def optimizeBatch(self, solution, objective):
+        """optimize by the ask-and-tell interface with batches of trials
+
+        Parameters
+        ----------
+        solution : Solution
+        objective : Expression
+        """
+        variables = list(solution)
+        evaluator = self.getConstraintEvaluator()
+        is_eq = evaluator.is_eq
+
+        # columns of values in the order of variables of the constraint evaluator
+        index = {var.name: i for i, var in enumerate(variables)}
+        perm = np.array([index[var.name] for var in evaluator.variables], dtype=int)
+        evaluators = [
+            create_batch_evaluator(objective, variables),
+            lambda X: evaluator.values(X[:, perm]),
+        ]
+        batch_size = max(self.batch_size, self.n_jobs)
+
+        n_trial = 0
+        with parallel_evaluator(evaluators, self.n_jobs) as evaluate:
+            while n_trial < self.n_trial:
+                k = int(min(batch_size, self.n_trial - n_trial))
+                trials = [self.study.ask() for _ in range(k)]
+                values = [self.suggest(trial, solution) for trial in trials]
+                obj_values, G = evaluate(np.array(values, dtype=np_float))
+                feasible = np.all(np.where(is_eq, G == 0, G <= 0), axis=1)
+
+                for trial, value, obj_value, g, is_feasible in zip(
+                    trials, values, obj_values, G, feasible
+                ):
+                    # Constraints which are considered feasible if less than or equal to zero.
+                    trial.set_user_attr("constraint", to_optuna_constraints(g, is_eq))
+                    self.study.tell(trial, float(obj_value))
+
+                    # update best solution if needed
+                    solution.setValuesFromArray(value)
+                    if is_feasible:
+                        self.registerSolution(solution, obj_value)
+
+                    # callback
+                    self.callback([solution])
+
+                n_trial += k
+
+                # check time limit
+                self.raiseTimeoutIfNeeded()
+
+
+def to_optuna_constraints(const_values, is_eq):
+    """
+    Parameters
+    ----------
+    const_values : np.ndarray
+        values of constraints, g(x) <= 0 or g(x) == 0
+    is_eq : np.ndarray of bool
+        true for equality constraints
+
+    Returns
+    -------
+    list of float
+        values of constraints for optuna, which are feasible if less than or equal to zero.
+        g(x) and -g(x) are included for an equality constraint
+    """
+    return np.hstack([const_values, -const_values[is_eq]]).tolist()
+
 
 class OptunaTPESearch(OptunaSearch):
     """
@@ -188,7 +368,7 @@ class OptunaTPESearch(OptunaSearch):
             seed=self.seed,
             constraints_func=constraints,
         )
-        self.study = create_study(sampler=sampler)
+        self.createStudyWithSampler(sampler)
 
 
 class OptunaCmaEsSearch(OptunaSearch):
@@ -258,7 +438,7 @@ class OptunaCmaEsSearch(OptunaSearch):
             warn_independent_sampling=self.warn_independent_sampling,
             seed=self.seed,
         )
-        self.study = create_study(sampler=sampler)
+        self.createStudyWithSampler(sampler)
 
 
 class OptunaNSGAIISearch(OptunaSearch):
@@ -331,4 +511,4 @@ class OptunaNSGAIISearch(OptunaSearch):
             seed=self.seed,
             constraints_func=constraints,
         )
-        self.study = create_study(sampler=sampler)
+        self.createStudyWithSampler(sampler)
@@ -0,0 +1,127 @@
+import numpy as np
+
+from flopt.solvers.base import BaseSearch
+from flopt.solvers.solver_utils import create_batch_evaluator, PopulationEncoder
+from flopt.env import setup_logger
+from flopt.constants import VariableType, ExpressionType, SolverTerminateState, np_float
+
+logger = setup_logger(__name__)
+
+
+class ParticleSwarmSearch(BaseSearch):
+    """Particle Swarm Optimization
+
+    The positions and velocities of particles are stored as (n_population, n) matrices,
+    and all particles of an iteration are evaluated in a single batch.
+
+    1. Generate the positions of particles at random.
+    2. Update the velocity of each particle x by
+       v = w v + c1 r1 (p - x) + c2 r2 (g - x),
+       where p is the best position of the particle, g is the best position of all particles
+       and r1, r2 are uniform random numbers in [0, 1].
+    3. Move each particle by x = x + v, and clip it into the bounds.
+       The values of integer variables are rounded.
+    4. Update p and g.
+    5. Repeat step2 to step4.
+
+    Parameters
+    ----------
+    n_trial : int
+        number of iterations
+    n_population : int
+        number of particles
+    w : float
+        inertia weight
+    c1 : float
+        cognitive coefficient
+    c2 : float
+        social coefficient
+    max_velocity : float
+        maximum velocity of each variable as the ratio to the width of its bounds
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import flopt
+
+        x = flopt.Variable("x", lowBound=-1, upBound=1, cat="Continuous")
+        y = flopt.Variable("y", lowBound=-1, upBound=1, cat="Integer")
+
+        prob = flopt.Problem()
+        prob += 2*x*x + x*y + y*y + x + y
+
+        status, log = prob.solve(solver="ParticleSwarm", msg=True, timelimit=1)
+
+        print("obj =", flopt.Value(prob.obj))
+        print("x =", flopt.Value(x))
+        print("y =", flopt.Value(y))
+    """
+
+    name = "ParticleSwarm"
+    can_solve_problems = {
+        "Variable": VariableType.Number,
+        "Objective": ExpressionType.Any,
+        "Constraint": ExpressionType.Non,
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.n_trial = 1e100
+        self.n_population = 30
+        self.w = 0.7298
+        self.c1 = 1.49618
+        self.c2 = 1.49618
+        self.max_velocity = 0.2
+
+    def search(self, solution, objective, *args):
+        self.start_build()
+
+        n = len(solution)
+        P = max(2, self.n_population)
+        evaluate = create_batch_evaluator(objective, list(solution))
+        encoder = PopulationEncoder(solution)
+        v_max = self.max_velocity * (encoder.ub - encoder.lb)
+
+        # initial particles (they contain the current solution)
+        X = encoder.random(P)
+        X[0] = encoder.repair(np.array([solution.value()], dtype=np_float))[0]
+        V = np.random.uniform(-v_max, v_max, size=(P, n))
+        f = evaluate(X)
+        best_X, best_f = X.copy(), f.copy()
+        g = np.argmin(best_f)
+
+        self.end_build()
+
+        for _ in range(int(self.n_trial)):
+            # move particles
+            r1, r2 = np.random.rand(2, P, n)
+            V = (
+                self.w * V
+                + self.c1 * r1 * (best_X - X)
+                + self.c2 * r2 * (best_X[g] - X)
+            )
+            V = np.clip(V, -v_max, v_max)
+            X = encoder.repair(X + V)
+
+            # update the best positions
+            f = evaluate(X)
+            improve = f < best_f
+            best_X[improve] = X[improve]
+            best_f[improve] = f[improve]
+            g = np.argmin(best_f)
+
+            # update best solution if needed
+            self.registerSolution(
+                encoder.toSolution(best_X[g]), best_f[g], msg_tol=1e-8
+            )
+
+            # callbacks
+            if self.callbacks:
+                self.callback(encoder.toSolutions(X))
+
+            # check time limit
+            self.raiseTimeoutIfNeeded()
+
+        return SolverTerminateState.Normal
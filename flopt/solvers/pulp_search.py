@@ -1,7 +1,12 @@
+import os
+import subprocess
+import tempfile
+
+import numpy as np
 import pulp
 
 from flopt.solvers.base import BaseSearch
-from flopt.expression import Const
+from flopt.convert.structure import LpStructure, constraint_names
 from flopt.solution import Solution
 from flopt.constants import (
     VariableType,
@@ -34,6 +39,13 @@ class PulpSearch(BaseSearch):
     solver : pulp.Solver
         solver pulp use, see https://coin-or.github.io/pulp/technical/solvers.html.
         default is pulp.PULP_CBC_CMD
+    use_mps : bool
+        if it is true, the mps file is written directly from the LpStructure
+        without creating pulp.LpProblem, and it is solved by CBC
+        (solver must be None or pulp.COIN_CMD family)
+    mps_file : str or None
+        path of the mps file written when use_mps is true.
+        if it is None, a temporary file is used
 
     Examples
     --------
@@ -66,6 +78,12 @@ class PulpSearch(BaseSearch):
         solver.setParams(solver=glpk_solver)
         prob.solve(solver, msg=True)
 
+    For large problems, the mps file can be written directly from the arrays and passed to CBC.
+
+    .. code-block:: python
+
+        prob.solve(solver="Pulp", use_mps=True, mps_file="model.mps")
+
     """
 
     name = "Pulp"
@@ -78,10 +96,18 @@ class PulpSearch(BaseSearch):
     def __init__(self):
         super().__init__()
         self.solver = None
+        self.use_mps = False
+        self.mps_file = None
 
     def search(self, solution, *args):
+        if self.use_mps:
+            return self.searchMps(solution)
+
         self.start_build()
-        lp_prob, lp_solution = self.createLpProblem(solution, self.prob)
+        # the objective of self.prob has been already converted into minimization form
+        lp_prob, lp_solution = self.createLpProblem(
+            solution, self.prob, sense="minimize"
+        )
         self.end_build()
 
         if self.solver is not None:
@@ -104,6 +130,91 @@ class PulpSearch(BaseSearch):
         # update best solution if needed
         self.registerSolution(solution)
 
+        return self.toTerminateState(lp_status)
+
+    def searchMps(self, solution):
+        """write the mps file from LpStructure and solve it by CBC"""
+        self.start_build()
+        check_variable_types(solution)
+        lp = LpStructure.fromFlopt(self.prob, x=solution, sparse=True, cache=True)
+        if self.mps_file is None:
+            tmp_dir = tempfile.TemporaryDirectory()
+            mps_file = os.path.join(tmp_dir.name, "model.mps")
+        else:
+            tmp_dir = None
+            mps_file = self.mps_file
+        lp.writeMps(mps_file)
+        self.end_build()
+
+        if isinstance(self.solver, pulp.COIN_CMD):
+            solver = self.solver
+        else:
+            assert self.solver is None, "use_mps supports only CBC (pulp.COIN_CMD)"
+            solver = pulp.PULP_CBC_CMD(
+                timeLimit=max(0, self.timelimit - self.build_time), msg=self.msg
+            )
+
+        try:
+            sol_file = os.path.splitext(mps_file)[0] + ".sol"
+            lp_status, values = self.solveMpsByCbc(solver, mps_file, sol_file, lp)
+        finally:
+            if tmp_dir is not None:
+                tmp_dir.cleanup()
+
+        # get result
+        if values is not None:
+            values = np.where(
+                np.array(lp.types) != "Continuous", np.round(values), values
+            )
+            solution.setValuesFromArray(values)
+            self.registerSolution(solution)
+
+        return self.toTerminateState(lp_status)
+
+    def solveMpsByCbc(self, solver, mps_file, sol_file, lp):
+        """
+        Parameters
+        ----------
+        solver : pulp.COIN_CMD
+        mps_file : str
+        sol_file : str
+        lp : LpStructure
+
+        Returns
+        -------
+        lp_status : int
+        values : np.ndarray or None
+        """
+        cmds = [solver.path, mps_file]
+        if solver.timeLimit is not None:
+            cmds += ["sec", str(solver.timeLimit)]
+        for option in solver.options + solver.getOptions():
+            cmds += option.split()
+        if all(var_type == "Continuous" for var_type in lp.types):
+            cmds.append("initialSolve")
+        else:
+            cmds.append("branch")
+        cmds += ["printingOptions", "all", "solution", sol_file]
+
+        stdout = None if solver.msg else subprocess.DEVNULL
+        subprocess.run(cmds, stdout=stdout, stderr=stdout, check=True)
+        if not os.path.exists(sol_file):
+            return pulp.LpStatusUndefined, None
+
+        lp_status, _ = solver.get_status(sol_file)
+        var_index = {f"X{i:07d}": i for i in range(lp.numVariables())}
+        values = np.zeros((lp.numVariables(),))
+        with open(sol_file) as f:
+            f.readline()  # status line
+            for line in f:
+                items = line.split()
+                if items and items[0] == "**":  # infeasible rows are marked
+                    items = items[1:]
+                if len(items) >= 3 and items[1] in var_index:
+                    values[var_index[items[1]]] = float(items[2])
+        return lp_status, values
+
+    def toTerminateState(self, lp_status):
         # lp_status =   -1: infeasible
         #               -2: unbounded
         #               -3: undefined
@@ -116,52 +227,86 @@ class PulpSearch(BaseSearch):
             return SolverTerminateState.Abnormal
         return SolverTerminateState.Normal
 
-    def createLpProblem(self, solution, prob):
+    def createLpProblem(self, solution, prob, sense=None):
         """Convert Problem into pulp.LpProblem
 
+        The objective and each constraint are created as pulp.LpAffineExpression
+        directly from the rows of the sparse LpStructure of the problem.
+
         Parameters
         ----------
         solution : Solution
         prob : Problem
+        sense : str, optional
+            sense of pulp.LpProblem, default is prob.sense
 
         Returns
         -------
         pulp.LpProblem, Solution
         """
         # conver VarElement -> LpVariable
-        lp_variables = []
-        for var in solution:
-            if var.type() == VariableType.Continuous:
-                cat = "Continuous"
-            elif var.type() == VariableType.Integer:
-                cat = "Integer"
-            elif var.type() == VariableType.Binary:
-                cat = "Binary"
-            else:
-                raise ValueError(var.type())
-            lp_var = LpVariable(
-                var.name, lowBound=var.getLb(), upBound=var.getUb(), cat=cat
+        check_variable_types(solution)
+        var_type_to_cat = {
+            VariableType.Continuous: "Continuous",
+            VariableType.Integer: "Integer",
+            VariableType.Binary: "Binary",
+        }
+        lp_variables = [
+            LpVariable(
+                var.name,
+                lowBound=var.getLb(),
+                upBound=var.getUb(),
+                cat=var_type_to_cat[var.type()],
             )
-            lp_variables.append(lp_var)
+            for var in solution
+        ]
         lp_solution = Solution(lp_variables)
 
         # conver Problem -> pulp.LpProblem
         name = "" if self.name is None else self.name
-        sense = (
-            pulp.LpMinimize
-            if prob.sense in {"minimize", "Minimize"}
-            else pulp.LpMaximize
-        )
+        if sense is None:
+            sense = prob.sense
+        sense = pulp.LpMinimize if sense.lower() == "minimize" else pulp.LpMaximize
         lp_prob = pulp.LpProblem(name=name, sense=sense)
-        if not isinstance(prob.obj, Const):
-            lp_prob.setObjective(prob.obj.value(lp_solution))
 
-        for const in prob.getConstraints():
-            const_exp = const.expression.value(lp_solution)
-            if not isinstance(const_exp, (int, float)):
-                if const.type() == ConstraintType.Eq:
-                    lp_prob.addConstraint(const_exp == 0, const.name)
-                else:  # const.type() == ConstraintType.Le
-                    lp_prob.addConstraint(const_exp <= 0, const.name)
+        lp = LpStructure.fromFlopt(prob, x=solution, sparse=True, cache=True)
+        if lp.c is not None and np.any(lp.c != 0):
+            nonzero = np.flatnonzero(lp.c)
+            lp_prob.setObjective(
+                pulp.LpAffineExpression(
+                    [(lp_variables[j], lp.c[j]) for j in nonzero], constant=lp.C
+                )
+            )
+
+        # rows of G and A in the same order of constraint_names()
+        for const_type, M, rhs, lp_sense in [
+            (ConstraintType.Le, lp.G, lp.h, pulp.LpConstraintLE),
+            (ConstraintType.Eq, lp.A, lp.b, pulp.LpConstraintEQ),
+        ]:
+            if M is None:
+                continue
+            names = constraint_names(prob, const_type)
+            for i, const_name in enumerate(names):
+                begin, end = M.indptr[i], M.indptr[i + 1]
+                if begin == end:
+                    continue
+                lp_exp = pulp.LpAffineExpression(
+                    [
+                        (lp_variables[j], coeff)
+                        for j, coeff in zip(M.indices[begin:end], M.data[begin:end])
+                    ]
+                )
+                lp_const = pulp.LpConstraint(lp_exp, lp_sense, rhs=rhs[i])
+                lp_prob.addConstraint(lp_const, const_name)
 
         return lp_prob, lp_solution
+
+
+def check_variable_types(solution):
+    for var in solution:
+        if var.type() not in {
+            VariableType.Continuous,
+            VariableType.Integer,
+            VariableType.Binary,
+        }:
+            raise ValueError(var.type())
@@ -1,13 +1,12 @@
 from scipy import optimize as scipy_optimize
+from scipy.sparse import csr_matrix, vstack
 import numpy as np
 
 from flopt.solvers.base import BaseSearch
 from flopt.convert import LpStructure
-from flopt.container import FloptNdarray
 from flopt.constants import VariableType, ExpressionType, SolverTerminateState
 from flopt.env import setup_logger
 
-
 logger = setup_logger(__name__)
 
 
@@ -57,28 +56,36 @@ class ScipyMilpSearch(BaseSearch):
     def search(self, solution, *args):
         self.start_build()
 
-        # lp structure
+        # lp structure (G and A are sparse), cached in the problem
         lp = LpStructure.fromFlopt(
             self.prob,
             x=solution,
-            option="ineq",
+            sparse=True,
+            cache=True,
         )
+        num_x = lp.numVariables()
 
         # bounds
-        lbs = [_lb if not np.isnan(_lb) else -np.inf for _lb in lp.lb]
-        ubs = [_ub if not np.isnan(_ub) else np.inf for _ub in lp.ub]
+        lbs = np.where(np.isnan(lp.lb), -np.inf, lp.lb)
+        ubs = np.where(np.isnan(lp.ub), np.inf, lp.ub)
         bounds = scipy_optimize.Bounds(lbs, ubs)
 
         # integrality
-        integrality = [var.type() != VariableType.Continuous for var in lp.x]
+        integrality = np.array(lp.types) != "Continuous"
 
-        # constraints (lp.G x <= lp.h)
-        has_constraints = lp.G is not None
-        lb = np.full_like(lp.h, -np.inf)
-        if has_constraints:
-            constraints = scipy_optimize.LinearConstraint(lp.G, lb, lp.h)
-        else:
+        # constraints (lb <= [G; A] x <= ub, where equalities are rows with lb == ub)
+        if lp.G is None and lp.A is None:
             constraints = None
+        else:
+            G = lp.G if lp.G is not None else csr_matrix((0, num_x))
+            A = lp.A if lp.A is not None else csr_matrix((0, num_x))
+            h = lp.h if lp.h is not None else np.empty((0,))
+            b = lp.b if lp.b is not None else np.empty((0,))
+            constraints = scipy_optimize.LinearConstraint(
+                vstack([G, A], format="csr"),
+                np.hstack([np.full_like(h, -np.inf), b]),
+                np.hstack([h, b]),
+            )
 
         self.end_build()
 
@@ -1,20 +1,43 @@
 from scipy import optimize as scipy_optimize
+from scipy.sparse import diags, vstack
 import numpy as np
 
 from flopt.solvers.base import BaseSearch
 from flopt.expression import Const
 from flopt.solution import Solution
+from flopt.convert.structure import (
+    linear_constraints_to_sparse,
+    matrix_constraint_to_sparse,
+)
+from flopt.solvers.solver_utils import (
+    create_batch_evaluator,
+    create_gradient_evaluator,
+    create_hessp_evaluator,
+)
 from flopt.constants import (
     VariableType,
     ExpressionType,
     ConstraintType,
     SolverTerminateState,
+    np_float,
 )
 from flopt.env import setup_logger
 
-
 logger = setup_logger(__name__)
 
+# methods of scipy.optimize.minimize which do not use gradient
+gradient_free_methods = {"nelder-mead", "powell", "cobyla", "cobyqa"}
+# methods of scipy.optimize.minimize which use Hessian or Hessian-vector products
+hess_methods = {
+    "newton-cg",
+    "dogleg",
+    "trust-ncg",
+    "trust-krylov",
+    "trust-exact",
+    "trust-constr",
+}
+hessp_methods = {"newton-cg", "trust-ncg", "trust-krylov", "trust-constr"}
+
 
 class ScipySearch(BaseSearch):
     """scipy optimize minimize API Solver
@@ -28,7 +51,14 @@ class ScipySearch(BaseSearch):
     should_continue_searching : bool
         if it is true, the searches continue to timelimit
     calculate_jac_hess : bool
-        if it is true, jac and hess is calculated and pass them into the solver, if it is possible
+        if it is true, jac and hess is calculated symbolically and pass them into the solver, if it is possible.
+        Otherwise, if all variables are continuous, the gradient and Hessian-vector products
+        of differentiable objective are calculated by compiled evaluators
+    hessp_threshold : int
+        if the number of variables is larger than this value, Hessian-vector products
+        are passed instead of the Hessian to the methods which accept both
+    feasibility_tol : float
+        allowed violation of constraints for the solutions found in the iterations
 
     Examples
     --------
@@ -72,22 +102,27 @@ class ScipySearch(BaseSearch):
         self.n_trial = 1e8
         self.should_continue_searching = False
         self.calculate_jac_hess = False
+        self.hessp_threshold = 1000
+        self.feasibility_tol = 1e-6
         self.method = None
 
     def search(self, solution, objective, constraints):
         self.start_build()
 
+        def set_values(values):
+            for var, value in zip(solution, values):
+                if not var.type() == VariableType.Continuous:
+                    value = round(value)
+                if var.type() == VariableType.Spin:
+                    value = 2 * value - 1  # binary -> spin
+                var.setValue(value)
+
         def gen_func(expression):
             def func(values):
                 # check timelimit
                 self.raiseTimeoutIfNeeded()
 
-                for var, value in zip(solution, values):
-                    if var.type() == VariableType.Spin:
-                        value = 2 * value - 1
-                    if not var.type() == VariableType.Continuous:
-                        value = round(value)
-                    var.setValue(value)
+                set_values(values)
                 try:
                     return expression.value(solution)
                 except OverflowError:
@@ -95,8 +130,36 @@ class ScipySearch(BaseSearch):
 
             return func
 
+        def gen_jac(flopt_jac):
+            # d/db = 2 d/ds for spin variables
+            func = gen_func(flopt_jac)
+            return lambda values: (func(values) * spin_scale).reshape(1, -1)
+
+        def to_values(values):
+            values = np.where(is_int, np.round(values), values)
+            return spin_scale * values + (1 - spin_scale)  # binary -> spin
+
+        def init_point():
+            return [
+                (
+                    (var.value() + 1) / 2
+                    if var.type() == VariableType.Spin
+                    else var.value()
+                )
+                for var in solution
+            ]
+
+        variables = list(solution)
+        is_int = np.array(
+            [var.type() != VariableType.Continuous for var in solution], dtype=bool
+        )
+        spin_scale = np.array(
+            [2.0 if var.type() == VariableType.Spin else 1.0 for var in solution],
+            dtype=np_float,
+        )
+
         # initial point
-        x0 = [var.value() for var in solution]
+        x0 = init_point()
 
         # bounds
         lb, ub = [], []
@@ -111,48 +174,115 @@ class ScipySearch(BaseSearch):
 
         # constraints
         scipy_constraints = []
+        linear_constraints = [const for const in constraints if const.isLinear()]
+        if linear_constraints or self.prob.matrix_constraints:
+            # lb <= A s <= ub, where s = 2 b - 1 for spin variables
+            A, lb, ub = linear_constraints_to_sparse(linear_constraints, variables)
+            for const in self.prob.matrix_constraints:
+                M, rhs = matrix_constraint_to_sparse(const, variables)
+                A = vstack([A, M], format="csr")
+                is_eq = const.type() == ConstraintType.Eq
+                lb = np.hstack([lb, rhs if is_eq else np.full_like(rhs, -np.inf)])
+                ub = np.hstack([ub, rhs])
+            offset = A.dot(1.0 - spin_scale)
+            A = A.dot(diags(spin_scale)).tocsr()
+            lb, ub = lb - offset, ub - offset
+            if self.method is not None and self.method.lower() not in {
+                "slsqp",
+                "trust-constr",
+            }:
+                A = A.toarray()
+            # equality and inequality constraints are passed separately
+            is_eq = lb == ub
+            for rows in [is_eq, ~is_eq]:
+                if rows.any():
+                    linear_const = scipy_optimize.LinearConstraint(
+                        A[rows], lb[rows], ub[rows]
+                    )
+                    scipy_constraints.append(linear_const)
         for const in constraints:
+            if const.isLinear():
+                continue
             const_func = gen_func(const)
+            const_jac = "2-point"
+            if const.expression.differentiable():
+                const_jac = gen_jac(const.expression.jac(variables))
             lb, ub = 0, 0
             if const.type() == ConstraintType.Le:
                 lb = -np.inf
-            nonlinear_const = scipy_optimize.NonlinearConstraint(const_func, lb, ub)
+            nonlinear_const = scipy_optimize.NonlinearConstraint(
+                const_func, lb, ub, jac=const_jac
+            )
             scipy_constraints.append(nonlinear_const)
 
         # options
-        options = {"maxiter": self.n_trial}
+        options = {"maxiter": int(self.n_trial)}
+        if self.method is not None and self.method.lower() == "trust-constr":
+            options["sparse_jacobian"] = True
 
         # callback for scipy
-        def callback(values):
-            for var, value in zip(solution, values):
-                if var.type() == VariableType.Spin:
-                    value = 2 * value - 1  # binary -> spin
-                if not var.type() == VariableType.Continuous:
-                    value = round(value)
-                var.setValue(value)
+        constraint_evaluator = self.getConstraintEvaluator()
 
-            # update best solution if needed
-            self.registerSolution(solution, msg_tol=1e-8)
+        def callback(values, *args):
+            set_values(values)
+
+            # update best solution if needed (iterates can be infeasible)
+            if constraint_evaluator.feasible(solution, tol=self.feasibility_tol):
+                self.registerSolution(solution, msg_tol=1e-8)
 
             # callbacks
             self.callback([solution])
 
-        jac = None
-        hess = None
-        if self.calculate_jac_hess:
-            if objective.differentiable():
-                flopt_jac = objective.jac(solution)
-                flopt_hess = objective.hess(solution)
-                jac = gen_func(flopt_jac)
-                hess = gen_func(flopt_hess)
+        # objective
+        evaluate = create_batch_evaluator(objective, variables)
+
+        def func(values):
+            # check timelimit
+            self.raiseTimeoutIfNeeded()
+
+            with np.errstate(over="ignore"):
+                return evaluate(to_values(values).reshape(1, -1))[0]
+
+        # jacobian and hessian (d/db = 2 d/ds for spin variables)
+        method = "" if self.method is None else self.method.lower()
+        jac, hess, hessp = None, None, None
+        # (the objective is not differentiable for integer variables because of rounding)
+        if (
+            objective.differentiable()
+            and method not in gradient_free_methods
+            and (self.calculate_jac_hess or not is_int.any())
+        ):
+            gradient = create_gradient_evaluator(objective, variables)
+            hessp_s = create_hessp_evaluator(objective, variables)
+            if self.calculate_jac_hess:
+                jac_s = gen_func(objective.jac(variables))
+                jac = lambda values: jac_s(values) * spin_scale
             else:
-                logger.warning(f"ScipySearch dose not calcuate the jac and hess")
+                jac = lambda values: gradient(to_values(values)) * spin_scale
+
+            def hessp_b(values, p):
+                return spin_scale * hessp_s(to_values(values), spin_scale * p)
+
+            if method in hessp_methods and (
+                len(variables) > self.hessp_threshold or not self.calculate_jac_hess
+            ):
+                hessp = hessp_b
+            elif method in hess_methods and self.calculate_jac_hess:
+                hess_s = gen_func(objective.hess(variables))
+                hess = lambda values: hess_s(values) * np.outer(spin_scale, spin_scale)
+            elif method in hess_methods:
+                identity = np.identity(len(variables), dtype=np_float)
+                hess = lambda values: np.column_stack(
+                    [hessp_b(values, e) for e in identity]
+                )
+        elif self.calculate_jac_hess:
+            logger.warning(f"ScipySearch dose not calcuate the jac and hess")
 
         self.end_build()
 
         for i in range(self.n_max_retry):
             res = scipy_optimize.minimize(
-                gen_func(objective),
+                func,
                 x0,
                 bounds=bounds,
                 constraints=scipy_constraints,
@@ -162,7 +292,7 @@ class ScipySearch(BaseSearch):
                 method=self.method,
                 jac=jac,
                 hess=hess,
-                hessp=None,
+                hessp=hessp,
                 tol=None,
             )
             if self.msg:
@@ -174,19 +304,19 @@ class ScipySearch(BaseSearch):
 
             if res.success:
                 # get result of solver
-                solution.setValuesFromArray(res.x)
+                set_values(res.x)
                 self.registerSolution(solution)
                 if self.should_continue_searching:
                     for var in solution:
                         var.setRandom()
-                    x0 = [var.value() for var in solution]
+                    x0 = init_point()
                 else:
                     return SolverTerminateState.Normal
             else:
                 logger.warning(f"ScipySearch could not success to find solution.")
                 for var in solution:
                     var.setRandom(scale=1.0 / (1 << (i // 4 + 1)))
-                x0 = [var.value() for var in solution]
+                x0 = init_point()
                 logger.warning(
                     f"{i+1}-th Restart ScipySearch scaled {1.0/(1 << (i+1))}"
                 )
@@ -130,7 +130,38 @@ class Selector:
         raise NotImplementedError
 
 
+class BaseSelector(Selector):
+    algos = [
+        "2-Opt",
+        "Tabu",
+        "ScipyMilp",
+        "Pulp",
+        "Cvxopt",
+        "Scipy",
+        "SFLA",
+        "Random",
+        "Hyperopt",
+        "OptunaTPE",
+        "OptunaCmaEs",
+    ]
+
+    def __call__(self, prob, solver):
+        for algo in self.algos:
+            if Solver(algo=algo).available(prob):
+                return algo
+
+
+class BlackBoxBaseSelector(BaseSelector):
+    algos = [
+        "DifferentialEvolution",
+        "ParticleSwarm",
+        "CmaEs",
+    ] + BaseSelector.algos
+
+
 class SklearnSelector(Selector):
+    base_selector = BaseSelector
+
     def __init__(self):
         if not os.path.exists(self.model_path):
             raise ModelNotFound(f"{self.model_path}: trained model file is not found")
@@ -148,7 +179,7 @@ class SklearnSelector(Selector):
             return self.model.output([feature])[0]
         except Exception as e:
             logger.warning(f"SklearnSelector error: {e}, using base selector instead.")
-            selector = BaseSelector()
+            selector = self.base_selector()
             return selector(prob, solver)
 
 
@@ -157,18 +188,22 @@ class IsingSelector(SklearnSelector):
 
 
 class BlackBoxSelector(SklearnSelector):
+    base_selector = BlackBoxBaseSelector
     model_path = nonlinear_model_path
 
 
 class BlackBoxMipSelector(SklearnSelector):
+    base_selector = BlackBoxBaseSelector
     model_path = nonlinear_mip_model_path
 
 
 class NonlinearSelector(SklearnSelector):
+    base_selector = BlackBoxBaseSelector
     model_path = nonlinear_model_path
 
 
 class NonlinearMipSelector(SklearnSelector):
+    base_selector = BlackBoxBaseSelector
     model_path = nonlinear_mip_model_path
 
 
@@ -185,23 +220,3 @@ class QpSelector(Selector):
 class PermutationSelector(Selector):
     def __call__(self, prob, solver):
         return "2-Opt"
-
-
-class BaseSelector(Selector):
-    algos = [
-        "2-Opt",
-        "ScipyMilp",
-        "Pulp",
-        "Cvxopt",
-        "Scipy",
-        "SFLA",
-        "Random",
-        "Hyperopt",
-        "OptunaTPE",
-        "OptunaCmaEs",
-    ]
-
-    def __call__(self, prob, solver):
-        for algo in self.algos:
-            if Solver(algo=algo).available(prob):
-                return algo
@@ -1,53 +1,13 @@
-import random
+import numpy as np
 
-from flopt.solution import Solution
 from flopt.solvers.base import BaseSearch
+from flopt.solvers.solver_utils import create_batch_evaluator, PopulationEncoder
 from flopt.env import setup_logger
-from flopt.constants import VariableType, ExpressionType, SolverTerminateState
+from flopt.constants import VariableType, ExpressionType, SolverTerminateState, np_float
 
 logger = setup_logger(__name__)
 
 
-def bisect_left(a, x, key):
-    x = key(x)
-    lo = 0
-    hi = len(a)
-    while lo < hi:
-        mid = (lo + hi) // 2
-        if key(a[mid]) < x:
-            lo = mid + 1
-        else:
-            hi = mid
-    return lo
-
-
-class Frog(Solution):
-    def __new__(cls, solution, prob):
-        obj = super().__new__(cls, solution._variables, sort=False)
-        obj.prob = prob
-        obj.obj_value = None
-        return obj
-
-    def setObjValue(self):
-        self.obj_value = self.prob.getObjValue(self)
-
-    def getObjValue(self):
-        if self.obj_value is None:
-            self.setObjValue()
-        return self.obj_value
-
-    def random(self):
-        super().random()
-        self.obj_value = None
-
-    def clip(self):
-        super().clip()
-        self.obj_value = None
-
-    def clone(self):
-        return Frog(super().clone(), self.prob)
-
-
 class ShuffledFrogLeapingSearch(BaseSearch):
     """
     SFLA (Shuffled Frog Leaping Search)
@@ -60,6 +20,11 @@ class ShuffledFrogLeapingSearch(BaseSearch):
     5. Redistribute memeplexes.
     6. Repeat step3 to step5
 
+    The frogs are stored as a (M*N, n) matrix with the vector of their objective values,
+    where M is the number of memeplexes, N is the number of frogs per memeplex and
+    n is the number of variables.
+    The memeplexes are improved at the same time, and new frogs are evaluated in batches.
+
     Parameters
     ----------
     n_trial : int (default 1e10)
@@ -106,7 +71,7 @@ class ShuffledFrogLeapingSearch(BaseSearch):
         super().__init__()
         self.has_initialized = False
         self.frogs = None
-        self.memeplexes = None
+        self.frog_obj_values = None
         # params
         self.n_trial = int(1e10)
         self.max_step = 1e10
@@ -124,91 +89,124 @@ class ShuffledFrogLeapingSearch(BaseSearch):
 
     def search(self, solution, *args):
         for i in range(self.n_trial):
-            self._memetic_evolution(solution)
+            self._memetic_evolution()
 
             # update best solution if needed
-            self.registerSolution(
-                self.frogs[0], self.frogs[0].getObjValue(), msg_tol=1e-8
-            )
+            self._registerFrog(self.frogs[0], self.frog_obj_values[0])
 
             if self.msg and i % 100 == 0:
                 self.during_solver_message(" ")
 
             # callbacks
-            self.callback(self.frogs)
+            if self.callbacks:
+                self.callback(self.encoder.toSolutions(self.frogs))
 
             # check time limit
             self.raiseTimeoutIfNeeded()
 
         return SolverTerminateState.Normal
 
-    def _memetic_evolution(self, solution):
+    def _memetic_evolution(self):
         """
         memetic evolution
         This function is the key to this method.
         """
         M = self.n_memeplex
         N = self.n_frog_per_memeplex
-        frog = Frog(solution, self)
-        if self.frogs[-2].getObjValue() - self.frogs[0].getObjValue() < 1e-9:
+        if self.frog_obj_values[-2] - self.frog_obj_values[0] < 1e-9:
             logger.debug(f"reset frogs: #frogs {N} --> {N*2}")
-            new_frogs = [frog.clone() for _ in range(M * N)]
-            self.frogs += new_frogs
-            for frog in self.frogs[1:]:
-                frog.setRandom()
-            self.frogs.sort(key=lambda frog: frog.getObjValue())
+            new_frogs = self.encoder.random(2 * M * N - 1)
+            self.frogs = np.vstack([self.frogs[:1], new_frogs])
+            self.frog_obj_values = np.concatenate(
+                [self.frog_obj_values[:1], self.evaluate(new_frogs)]
+            )
+            self._sort()
             self.n_frog_per_memeplex *= 2
             N = self.n_frog_per_memeplex
 
-        self.memeplexes = [[self.frogs[i * M + j] for i in range(N)] for j in range(M)]
-
-        for j in range(M):
-            for k in range(self.n_memetic_iter):
-                # make sub-sub memeplex
-                sub_mmplx_ids = random.sample(range(N), N // 2)
-                first, last = min(sub_mmplx_ids), max(sub_mmplx_ids)
-
-                best_frog = self.memeplexes[j][first]
-                worst_frog = self.memeplexes[j][last]
-
-                # move frog which has the worst objective
-                step = best_frog - worst_frog
-                step *= random.random()
-                if (norm := step.norm()) > self.max_step:
-                    step *= self.max_step / norm
-                new_frog = worst_frog + step
-                new_frog.clip()
-
-                # if it does not improve (1)
-                if new_frog.getObjValue() > worst_frog.getObjValue():
-                    step = self.best_solution - worst_frog
-                    step *= random.random()
-                    if (norm := step.norm()) > self.max_step:
-                        step *= self.max_step / norm
-                    new_frog = worst_frog + step
-                    new_frog.clip()
-
-                    # if it does not improve (2)
-                    if new_frog.getObjValue() > worst_frog.getObjValue():
-                        new_frog.setRandom()
-
-                # replace the worst_frog to new frog and sort memeplex
-                self.memeplexes[j].pop(last)
-                lo = bisect_left(
-                    self.memeplexes[j], new_frog, key=lambda frog: frog.getObjValue()
-                )
-                self.memeplexes[j].insert(lo, new_frog)
-                if lo == 0:
-                    self.registerSolution(
-                        new_frog, obj_value=new_frog.getObjValue(), msg_tol=1e-8
-                    )
-
-                # check time limit
-                self.raiseTimeoutIfNeeded()
+        # memeplexes[j] = [frogs[j], frogs[M+j], frogs[2M+j], ...]
+        n = self.frogs.shape[1]
+        memeplexes = self.frogs.reshape(N, M, n).transpose(1, 0, 2).copy()
+        obj_values = self.frog_obj_values.reshape(N, M).T.copy()
+        rows = np.arange(M)
+
+        for k in range(self.n_memetic_iter):
+            # make sub-sub memeplex
+            sub_mmplx_ids = np.argsort(np.random.rand(M, N), axis=1)[:, : N // 2]
+            first, last = sub_mmplx_ids.min(axis=1), sub_mmplx_ids.max(axis=1)
+
+            best_frogs = memeplexes[rows, first]
+            worst_frogs = memeplexes[rows, last]
+            worst_obj_values = obj_values[rows, last]
+
+            # move frog which has the worst objective
+            new_frogs = self._leap(worst_frogs, best_frogs)
+            new_obj_values = self.evaluate(new_frogs)
+
+            # if it does not improve (1)
+            fail = new_obj_values > worst_obj_values
+            if fail.any():
+                new_frogs[fail] = self._leap(worst_frogs[fail], self.best_frog)
+                new_obj_values[fail] = self.evaluate(new_frogs[fail])
+
+                # if it does not improve (2)
+                fail &= new_obj_values > worst_obj_values
+                if fail.any():
+                    new_frogs[fail] = self.encoder.random(fail.sum())
+                    new_obj_values[fail] = self.evaluate(new_frogs[fail])
+
+            # replace the worst_frog to new frog and sort memeplex
+            memeplexes[rows, last] = new_frogs
+            obj_values[rows, last] = new_obj_values
+            order = np.argsort(obj_values, axis=1, kind="stable")
+            memeplexes = np.take_along_axis(memeplexes, order[:, :, None], axis=1)
+            obj_values = np.take_along_axis(obj_values, order, axis=1)
+
+            j = np.argmin(new_obj_values)
+            self._registerFrog(new_frogs[j], new_obj_values[j])
+
+            # check time limit
+            self.raiseTimeoutIfNeeded()
 
         # sort entire memeplexes
-        self.frogs = [frog for memeplex in self.memeplexes for frog in memeplex]
-        self.frogs.sort(key=self.getObjValue)
+        self.frogs = memeplexes.reshape(M * N, n)
+        self.frog_obj_values = obj_values.reshape(M * N)
+        self._sort()
+
+    def _leap(self, frogs, targets):
+        """move frogs toward targets with random step sizes
+
+        Parameters
+        ----------
+        frogs : numpy.ndarray
+            (k, n) matrix
+        targets : numpy.ndarray
+            (k, n) matrix or (n, ) vector
+
+        Returns
+        -------
+        numpy.ndarray
+            (k, n) matrix of new frogs
+        """
+        steps = (targets - frogs) * np.random.rand(len(frogs), 1)
+        norms = np.linalg.norm(steps, axis=1)
+        large = norms > self.max_step
+        steps[large] *= (self.max_step / norms[large])[:, None]
+        return self.encoder.repair(frogs + steps)
+
+    def _sort(self):
+        order = np.argsort(self.frog_obj_values, kind="stable")
+        self.frogs = self.frogs[order]
+        self.frog_obj_values = self.frog_obj_values[order]
+
+    def _registerFrog(self, frog, obj_value):
+        if obj_value < self.best_obj_value:
+            self.best_frog = frog.copy()
+            self.registerSolution(
+                self.encoder.toSolution(frog), obj_value, msg_tol=1e-8
+            )
+        else:
+            self.trial_ix += 1
 
     def startProcess(self, solution):
         super().startProcess()
@@ -216,14 +214,16 @@ class ShuffledFrogLeapingSearch(BaseSearch):
             return
         self.start_build()
 
+        self.encoder = PopulationEncoder(solution)
+        self.evaluate = create_batch_evaluator(self.prob.obj, list(solution))
+        self.best_frog = np.array(solution.value(), dtype=np_float)
+
         M = self.n_memeplex
         N = self.n_frog_per_memeplex
-        frog = Frog(solution.clone(), self)
-        self.frogs = [frog.clone() for _ in range(M * N)]
-        for frog in self.frogs:
-            frog.setRandom()
-        self.frogs.sort(key=lambda frog: frog.getObjValue())
-        self.registerSolution(self.frogs[0])
+        self.frogs = self.encoder.random(M * N)
+        self.frog_obj_values = self.evaluate(self.frogs)
+        self._sort()
+        self._registerFrog(self.frogs[0], self.frog_obj_values[0])
 
         self.end_build()
         self.has_initialized = True
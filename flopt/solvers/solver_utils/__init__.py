@@ -5,3 +5,11 @@ from .common import (
     during_solver_message,
     end_solver_message,
 )
+from .evaluator import (
+    ConstraintEvaluator,
+    create_batch_evaluator,
+    PopulationEncoder,
+    create_gradient_evaluator,
+    create_hessp_evaluator,
+    parallel_evaluator,
+)
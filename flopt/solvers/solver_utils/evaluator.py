@@ -0,0 +1,697 @@
+import contextlib
+import multiprocessing
+
+import numpy as np
+
+from flopt.variable import VarElement
+from flopt.expression import (
+    SelfReturn,
+    ExpressionElement,
+    Expression,
+    CustomExpression,
+    Reduction,
+    Sum,
+    MathOperation,
+)
+from flopt.solution import Solution
+from flopt.constants import VariableType, ConstraintType, np_float
+
+
+def create_batch_evaluator(expression, variables):
+    """create the function to calculate values of expression for many solutions
+
+    If expression does not contain CustomExpression, values are calculated
+    by numpy operations over all solutions at once.
+    Otherwise, expression is evaluated for each solution.
+    Variables not in variables are treated as constants.
+
+    Parameters
+    ----------
+    expression : Expression family
+    variables : list of VarElement family
+
+    Returns
+    -------
+    function
+        function that takes (k, n) array of values of variables and
+        returns (k, ) array of values of expression
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        x = flopt.Variable.array("x", 2)
+        evaluate = create_batch_evaluator(x[0] * x[1] + x[0], x)
+        evaluate(np.array([[1, 2], [3, 4]]))
+        >>> array([3., 15.])
+    """
+    variables = list(variables)
+    if expression.isPolynomial():
+        return _create_polynomial_evaluator(expression.toPolynomial(), variables)
+    if not _has_custom_expression(expression):
+        return _create_array_evaluator(expression, variables)
+
+    solution = Solution([var.clone() for var in variables], sort=False)
+
+    def evaluate(X):
+        values = np.empty(len(X), dtype=np_float)
+        for k, x in enumerate(X):
+            solution.setValuesFromArray(x)
+            values[k] = expression.value(solution)
+        return values
+
+    return evaluate
+
+
+class PopulationEncoder:
+    """map the rows of a (k, n) matrix to the values of variables
+
+    Population-based solvers keep their individuals as the rows of a matrix.
+    This holds the bounds of variables and the masks of integer and spin
+    variables, repairs rows into valid values and converts rows into Solutions.
+
+    Parameters
+    ----------
+    solution : Solution
+        variables of columns
+
+    Attributes
+    ----------
+    lb, ub : numpy.ndarray
+        lower and upper bounds of variables
+    is_int : numpy.ndarray
+        mask of integer and binary variables
+    is_spin : numpy.ndarray
+        mask of spin variables
+    work_solution : Solution
+        solution which the values of a row are set by toSolution()
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        x = flopt.Variable("x", lowBound=-1, upBound=1, cat="Integer")
+        s = flopt.Variable("s", cat="Spin")
+        encoder = PopulationEncoder(Solution([x, s]))
+        encoder.repair(np.array([[0.7, 0.2], [-3.0, -0.5]]))
+        >>> array([[ 1.,  1.],
+                   [-1., -1.]])
+    """
+
+    def __init__(self, solution):
+        self.work_solution = Solution([var.clone() for var in solution], sort=False)
+        self.lb = np.array([var.getLb(number=True) for var in solution], dtype=np_float)
+        self.ub = np.array([var.getUb(number=True) for var in solution], dtype=np_float)
+        types = [var.type() for var in solution]
+        self.is_int = np.array(
+            [t in {VariableType.Integer, VariableType.Binary} for t in types],
+            dtype=bool,
+        )
+        self.is_spin = np.array([t == VariableType.Spin for t in types], dtype=bool)
+
+    def repair(self, X):
+        """clip rows into the bounds and round integer and spin values
+
+        Parameters
+        ----------
+        X : numpy.ndarray
+            (k, n) matrix
+
+        Returns
+        -------
+        numpy.ndarray
+            (k, n) matrix of valid values
+        """
+        X = np.clip(X, self.lb, self.ub)
+        X[:, self.is_int] = np.round(X[:, self.is_int])
+        X[:, self.is_spin] = np.where(X[:, self.is_spin] < 0, -1, 1)
+        return X
+
+    def random(self, k):
+        """generate rows uniformly at random
+
+        Parameters
+        ----------
+        k : int
+            number of rows
+
+        Returns
+        -------
+        numpy.ndarray
+            (k, n) matrix
+        """
+        X = np.random.uniform(self.lb, self.ub, size=(k, len(self.lb)))
+        X[:, self.is_int] = np.random.randint(
+            self.lb[self.is_int], self.ub[self.is_int] + 1, size=(k, self.is_int.sum())
+        )
+        X[:, self.is_spin] = (
+            2 * np.random.randint(0, 2, size=(k, self.is_spin.sum())) - 1
+        )
+        return X
+
+    def toSolution(self, x):
+        """
+        Parameters
+        ----------
+        x : numpy.ndarray
+            values of variables
+
+        Returns
+        -------
+        Solution
+            work_solution which has the values of x
+        """
+        self.work_solution.setValuesFromArray(x)
+        return self.work_solution
+
+    def toSolutions(self, X):
+        """
+        Parameters
+        ----------
+        X : numpy.ndarray
+            (k, n) matrix
+
+        Returns
+        -------
+        list of Solution
+            new solution for each row (e.g. for callbacks)
+        """
+        solutions = []
+        for x in X:
+            solution = self.work_solution.clone()
+            solution.setValuesFromArray(x)
+            solutions.append(solution)
+        return solutions
+
+
+class ConstraintEvaluator:
+    """evaluate all constraints of a problem for a solution or solutions at once
+
+    Values of the linear constraints, including the rows of matrix constraints,
+    are calculated by one sparse matrix-vector product, and values of the others
+    are calculated by the batch evaluators of their expressions.
+    The order of values follows prob.getConstraints().
+    Parameters and variables not in variables are treated as constants
+    with their values when the evaluator is created.
+    If variables include permutation variables, the constraints are evaluated
+    one by one for a Solution.
+
+    Parameters
+    ----------
+    prob : Problem
+    variables : list of VarElement family
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        x = flopt.Variable.array("x", 2)
+        prob = flopt.Problem()
+        prob += x[0] + x[1] <= 1
+        prob += x[0] * x[1] == 0
+
+        evaluator = ConstraintEvaluator(prob, x)
+        evaluator.violations(np.array([[1, 1], [1, 0]]))
+        >>> array([[1., 1.],
+                   [0., 0.]])
+    """
+
+    def __init__(self, prob, variables):
+        from scipy.sparse import vstack
+
+        from flopt.convert.structure import (
+            linear_constraints_to_sparse,
+            matrix_constraint_to_sparse,
+        )
+
+        self.variables = list(variables)
+        constraints = prob.constraints
+
+        # constraints are evaluated one by one for non-numerical variables
+        self.tree_constraints = None
+        if any(var.type() == VariableType.Permutation for var in self.variables):
+            self.tree_constraints = prob.getConstraints()
+            self.is_eq = np.array(
+                [const.type() == ConstraintType.Eq for const in self.tree_constraints],
+                dtype=bool,
+            )
+            return
+        linear_ixs = [i for i, const in enumerate(constraints) if const.isLinear()]
+        self.nonlinear = [
+            (i, create_batch_evaluator(const.expression, self.variables))
+            for i, const in enumerate(constraints)
+            if not const.isLinear()
+        ]
+
+        # Ax - b, where rows of matrix constraints follow the constraints
+        A, _, b = linear_constraints_to_sparse(
+            [constraints[i] for i in linear_ixs], self.variables
+        )
+        As, bs = [A], [b]
+        is_eq = [const.type() == ConstraintType.Eq for const in constraints]
+        for const in prob.matrix_constraints:
+            M, rhs = matrix_constraint_to_sparse(const, self.variables)
+            As.append(M)
+            bs.append(rhs)
+            is_eq += [const.type() == ConstraintType.Eq] * len(const)
+        self.A = vstack(As, format="csr")
+        self.b = np.hstack(bs)
+        self.linear_ixs = np.array(
+            linear_ixs + list(range(len(constraints), len(is_eq))), dtype=np.int64
+        )
+        self.is_eq = np.array(is_eq, dtype=bool)
+
+    def numConstraints(self):
+        return len(self.is_eq)
+
+    def toArray(self, solution):
+        """
+        Parameters
+        ----------
+        solution : Solution
+
+        Returns
+        -------
+        np.ndarray
+            values of variables of this evaluator in solution
+        """
+        var_dict = solution.toDict()
+        return np.array(
+            [var_dict.get(var.name, var).value() for var in self.variables],
+            dtype=np_float,
+        )
+
+    def values(self, X):
+        """
+        Parameters
+        ----------
+        X : Solution, (n, ) array or (k, n) array
+            values of variables
+
+        Returns
+        -------
+        np.ndarray
+            (m, ) array or (k, m) array of values of constraint expressions
+        """
+        if self.tree_constraints is not None:
+            assert isinstance(X, Solution)
+            return np.array(
+                [const.value(X) for const in self.tree_constraints], dtype=np_float
+            )
+        if isinstance(X, Solution):
+            X = self.toArray(X)
+        X = np.asarray(X, dtype=np_float)
+        single = X.ndim == 1
+        X = np.atleast_2d(X)
+        G = np.empty((len(X), self.numConstraints()), dtype=np_float)
+        G[:, self.linear_ixs] = self.A.dot(X.T).T - self.b
+        for i, evaluate in self.nonlinear:
+            G[:, i] = evaluate(X)
+        return G[0] if single else G
+
+    def violations(self, X):
+        """
+        Returns
+        -------
+        np.ndarray
+            (m, ) array or (k, m) array of violations of constraints,
+            |g(x)| for g(x) == 0 and max(g(x), 0) for g(x) <= 0
+        """
+        G = self.values(X)
+        return np.where(self.is_eq, np.abs(G), np.maximum(G, 0))
+
+    def feasible(self, X, tol=0):
+        """
+        Parameters
+        ----------
+        X : Solution, (n, ) array or (k, n) array
+        tol : float
+            allowed violation
+
+        Returns
+        -------
+        bool or (k, ) array of bool
+        """
+        is_feasible = np.all(self.violations(X) <= tol, axis=-1)
+        return bool(is_feasible) if is_feasible.ndim == 0 else is_feasible
+
+
+# batch evaluators shared with forked worker processes
+_evaluators = None
+
+
+def _evaluate_chunk(X):
+    return [evaluate(X) for evaluate in _evaluators]
+
+
+@contextlib.contextmanager
+def parallel_evaluator(evaluators, n_jobs=1):
+    """create the function to calculate values of several batch evaluators
+    in n_jobs worker processes
+
+    The rows of X are split into n_jobs chunks.
+    Worker processes are forked, so that they inherit evaluators
+    without pickling them.
+
+    Parameters
+    ----------
+    evaluators : list of function
+        batch evaluators created by create_batch_evaluator
+    n_jobs : int
+        number of worker processes, if it is 1, evaluators run in this process
+
+    Yields
+    ------
+    function
+        function that takes (k, n) array of values of variables and
+        returns list of (k, ) arrays of values of evaluators
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        evaluators = [create_batch_evaluator(expression, x) for expression in expressions]
+        with parallel_evaluator(evaluators, n_jobs=4) as evaluate:
+            values = evaluate(X)
+    """
+    global _evaluators
+
+    if n_jobs <= 1:
+        yield lambda X: [evaluate(X) for evaluate in evaluators]
+        return
+
+    _evaluators = evaluators
+    pool = multiprocessing.get_context("fork").Pool(n_jobs)
+
+    def evaluate(X):
+        chunks = pool.map(_evaluate_chunk, np.array_split(X, n_jobs))
+        return [np.concatenate(values) for values in zip(*chunks)]
+
+    try:
+        yield evaluate
+    finally:
+        pool.terminate()
+        _evaluators = None
+
+
+def _has_custom_expression(expression):
+    if isinstance(expression, CustomExpression):
+        return True
+    elif isinstance(expression, Expression):
+        return _has_custom_expression(expression.elmA) or _has_custom_expression(
+            expression.elmB
+        )
+    elif isinstance(expression, Reduction):
+        return any(_has_custom_expression(elm) for elm in expression.elms)
+    elif isinstance(expression, MathOperation):
+        return _has_custom_expression(expression.elm)
+    return False
+
+
+def _create_array_evaluator(expression, variables):
+    # evaluate the expression tree once with columns of X as values of variables
+    def evaluate(X):
+        X = np.asarray(X, dtype=np_float)
+        var_dict = {var.name: SelfReturn(X[:, i]) for i, var in enumerate(variables)}
+        values = expression.value(var_dict=var_dict)
+        return np.broadcast_to(np.asarray(values, dtype=np_float), (len(X),)).copy()
+
+    return evaluate
+
+
+def _polynomial_to_arrays(polynomial, variables):
+    # constant + c.dot(x) + sum_m coeffs[m] prod_j x[ixs[m, j]] ** exps[m, j]
+    var_to_index = {var.name: i for i, var in enumerate(variables)}
+    n = len(variables)
+    constant = polynomial.constant()
+    c = np.zeros(n, dtype=np_float)
+    coeffs, ixs, exps = [], [], []  # nonlinear monomials
+    for mono, coeff in polynomial:
+        coeff = coeff * mono.coeff
+        mono_ixs, mono_exps = [], []
+        for var, exp in mono:
+            if var.name in var_to_index:
+                mono_ixs.append(var_to_index[var.name])
+                mono_exps.append(exp)
+            else:
+                coeff *= var.value() ** exp
+        if not mono_ixs:
+            constant += coeff
+        elif len(mono_ixs) == 1 and mono_exps[0] == 1:
+            c[mono_ixs[0]] += coeff
+        else:
+            coeffs.append(coeff)
+            ixs.append(mono_ixs)
+            exps.append(mono_exps)
+
+    # pad the factors of monomials by the column n of ones
+    degree = max(map(len, ixs), default=0)
+    coeffs = np.array(coeffs, dtype=np_float)
+    ixs = np.array([ix + [n] * (degree - len(ix)) for ix in ixs], dtype=np.int64)
+    exps = np.array([exp + [1] * (degree - len(exp)) for exp in exps])
+    return constant, c, coeffs, ixs, exps
+
+
+def _create_polynomial_evaluator(polynomial, variables):
+    constant, c, coeffs, ixs, exps = _polynomial_to_arrays(polynomial, variables)
+
+    def evaluate(X):
+        X = np.asarray(X, dtype=np_float)
+        values = X.dot(c) + constant
+        if len(coeffs) > 0:
+            X = np.hstack([X, np.ones((len(X), 1), dtype=np_float)])
+            values += np.prod(X[:, ixs] ** exps, axis=2).dot(coeffs)
+        return values
+
+    return evaluate
+
+
+def create_gradient_evaluator(expression, variables, eps=1e-6):
+    """create the function to calculate the gradient of expression
+
+    If expression is polynomial, the gradient is calculated exactly
+    from the arrays of its monomials.
+    If it is differentiable, the gradient is calculated from the derivatives
+    of its terms, which are differentiated symbolically only by their variables.
+    Otherwise, it is calculated by central differences, where
+    the 2n points are evaluated by a batch evaluator at once.
+    Variables not in variables are treated as constants.
+
+    Parameters
+    ----------
+    expression : Expression family
+    variables : list of VarElement family
+    eps : float
+        step size of central differences
+
+    Returns
+    -------
+    function
+        function that takes (n, ) array of values of variables and
+        returns (n, ) array of the gradient
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        x = flopt.Variable.array("x", 2)
+        gradient = create_gradient_evaluator(x[0] * x[1] + x[0], x)
+        gradient(np.array([1, 2]))
+        >>> array([3., 1.])
+    """
+    variables = list(variables)
+    n = len(variables)
+    if not expression.isPolynomial() and expression.differentiable():
+        terms = _additive_terms(expression, variables)
+        derivatives = _derivatives(terms, variables, order=1)
+        rows = np.array([i for i, _, _ in derivatives], dtype=np.int64)
+
+        def gradient(x):
+            grad = np.zeros(n, dtype=np_float)
+            np.add.at(grad, rows, _evaluate_derivatives(derivatives, variables, x))
+            return grad
+
+        return gradient
+
+    if not expression.isPolynomial():
+        evaluate = create_batch_evaluator(expression, variables)
+        steps = np.vstack([np.identity(n), -np.identity(n)]) * eps
+
+        def gradient(x):
+            values = evaluate(np.asarray(x, dtype=np_float) + steps)
+            return (values[:n] - values[n:]) / (2 * eps)
+
+        return gradient
+
+    constant, c, coeffs, ixs, exps = _polynomial_to_arrays(
+        expression.toPolynomial(), variables
+    )
+    degree = ixs.shape[1] if len(coeffs) > 0 else 0
+
+    def gradient(x):
+        grad = np.zeros(n + 1, dtype=np_float)
+        grad[:n] = c
+        if len(coeffs) > 0:
+            x = np.append(np.asarray(x, dtype=np_float), 1)
+            factors = x[ixs] ** exps
+            diffs = exps * x[ixs] ** (exps - 1)
+            # products of the other factors of each monomial
+            ones = np.ones((len(coeffs), 1), dtype=np_float)
+            left = np.cumprod(np.hstack([ones, factors[:, :-1]]), axis=1)
+            right = np.cumprod(np.hstack([ones, factors[:, :0:-1]]), axis=1)[:, ::-1]
+            others = left * right if degree > 1 else ones
+            np.add.at(grad, ixs, coeffs[:, None] * diffs * others)
+        return grad[:n]
+
+    return gradient
+
+
+def create_hessp_evaluator(expression, variables, eps=1e-4, max_entries=10**6):
+    """create the function to calculate Hessian-vector products
+
+    If expression is polynomial, the products are calculated exactly
+    from the arrays of its monomials.
+    If it is differentiable, they are calculated from the second derivatives
+    of its terms, which are differentiated symbolically only by their variables.
+    Otherwise, or if the Hessian has more than max_entries symbolic entries,
+    they are calculated by central differences of the gradient.
+    Variables not in variables are treated as constants.
+
+    Parameters
+    ----------
+    expression : Expression family
+    variables : list of VarElement family
+    eps : float
+        step size of central differences
+    max_entries : int
+        maximum number of symbolic entries of the Hessian
+
+    Returns
+    -------
+    function
+        function that takes (n, ) arrays x and p and returns
+        (n, ) array of the product of the Hessian at x and p
+    """
+    variables = list(variables)
+    n = len(variables)
+    if expression.isPolynomial():
+        constant, c, coeffs, ixs, exps = _polynomial_to_arrays(
+            expression.toPolynomial(), variables
+        )
+        return lambda x, p: _polynomial_hessp(coeffs, ixs, exps, x, p)[:n]
+
+    if expression.differentiable():
+        terms = _additive_terms(expression, variables)
+        if sum(len(term_vars) ** 2 for _, _, term_vars in terms) <= max_entries:
+            derivatives = _derivatives(terms, variables, order=2)
+            rows = np.array([i for (i, _), _, _ in derivatives], dtype=np.int64)
+            cols = np.array([j for (_, j), _, _ in derivatives], dtype=np.int64)
+
+            def hessp(x, p):
+                values = _evaluate_derivatives(derivatives, variables, x)
+                products = np.zeros(n, dtype=np_float)
+                np.add.at(products, rows, values * np.asarray(p)[cols])
+                return products
+
+            return hessp
+
+    gradient = create_gradient_evaluator(expression, variables)
+
+    def hessp(x, p):
+        x = np.asarray(x, dtype=np_float)
+        p = np.asarray(p, dtype=np_float)
+        norm = np.linalg.norm(p)
+        if norm == 0:
+            return np.zeros_like(p)
+        h = eps / norm
+        return (gradient(x + h * p) - gradient(x - h * p)) / (2 * h)
+
+    return hessp
+
+
+def _polynomial_hessp(coeffs, ixs, exps, x, p):
+    # sum of the second derivatives of monomials by the pairs of their factors
+    x = np.append(np.asarray(x, dtype=np_float), 1)
+    p = np.append(np.asarray(p, dtype=np_float), 0)
+    products = np.zeros(len(x), dtype=np_float)
+    if len(coeffs) == 0:
+        return products
+    factors = x[ixs] ** exps
+    diffs = exps * x[ixs] ** (exps - 1)
+    diffs2 = np.where(exps >= 2, exps * (exps - 1) * x[ixs] ** (exps - 2), 0)
+    degree = ixs.shape[1]
+    for a in range(degree):
+        for b in range(degree):
+            others = np.prod(np.delete(factors, list({a, b}), axis=1), axis=1)
+            if a == b:
+                values = diffs2[:, a] * others
+            else:
+                values = diffs[:, a] * diffs[:, b] * others
+            np.add.at(products, ixs[:, a], coeffs * values * p[ixs[:, b]])
+    return products
+
+
+def _additive_terms(expression, variables):
+    # split expression into the terms of its sums and subtractions,
+    # returns list of (sign, term, variables of term in variables)
+    var_names = {var.name for var in variables}
+    terms, stack = [], [(1, expression)]
+    while stack:
+        sign, elm = stack.pop()
+        if isinstance(elm, Sum):
+            stack += [(sign, child) for child in elm.elms]
+        elif isinstance(elm, Expression) and elm.operator in {"+", "-"}:
+            stack.append((sign, elm.elmA))
+            stack.append((sign if elm.operator == "+" else -sign, elm.elmB))
+        elif isinstance(elm, (ExpressionElement, VarElement)):
+            term_vars = [
+                var
+                for var in sorted(elm.getVariables(), key=lambda var: var.name)
+                if var.name in var_names
+            ]
+            if term_vars:
+                terms.append((sign, elm, term_vars))
+    return terms
+
+
+def _derivatives(terms, variables, order):
+    # list of (index, sign, derivative) of the terms created by _additive_terms,
+    # where index is i for order 1 and (i, j) for order 2
+    var_to_index = {var.name: i for i, var in enumerate(variables)}
+    derivatives = []
+    for sign, term, term_vars in terms:
+        for var in term_vars:
+            diff = term.diff(var)
+            i = var_to_index[var.name]
+            if order == 1:
+                derivatives.append((i, sign, diff))
+                continue
+            if not isinstance(diff, (ExpressionElement, VarElement)):
+                continue
+            for other in term_vars:
+                j = var_to_index[other.name]
+                derivatives.append(((i, j), sign, diff.diff(other)))
+    return derivatives
+
+
+def _evaluate_derivatives(derivatives, variables, x):
+    var_dict = {
+        var.name: SelfReturn(value)
+        for var, value in zip(variables, np.asarray(x, dtype=np_float).tolist())
+    }
+
+    def value(diff):
+        if isinstance(diff, VarElement):
+            return var_dict.get(diff.name, diff).value()
+        elif isinstance(diff, ExpressionElement):
+            return diff.value(var_dict=var_dict)
+        return diff
+
+    return np.array(
+        [sign * value(diff) for _, sign, diff in derivatives], dtype=np_float
+    )
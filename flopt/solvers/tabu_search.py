@@ -0,0 +1,210 @@
+import random
+
+import numpy as np
+from scipy import sparse
+
+from flopt.solvers.base import BaseSearch
+from flopt.convert import QuboStructure
+from flopt.convert.structure import quadratic_to_sparse
+from flopt.constants import VariableType, ExpressionType, SolverTerminateState, np_float
+from flopt.env import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class TabuSearch(BaseSearch):
+    """Tabu Search for binary quadratic models (QUBO / Ising)
+
+    The objective is converted once into QUBO form, x.T.dot(Q).dot(x) + C,
+    and Q is stored as a symmetric CSR matrix.
+    The gain of flipping each variable is kept in a vector and
+    it is updated in O(degree) time after each move.
+
+    1. Flip the variable with the best gain among the non tabu variables
+       (a tabu variable is allowed if it leads to a new best solution; aspiration).
+    2. Forbid flipping the variable again for tenure iterations.
+    3. If the incumbent solution is not updated for max_stagnation iterations,
+       restart from the incumbent solution with some random flips.
+       The number of flipped variables is doubled while restarts do not improve
+       the incumbent solution (up to the half of variables).
+
+    Parameters
+    ----------
+    n_trial : int
+        number of moves
+    tenure : int or None
+        tabu tenure, if it is None, min(20, n/4) is used,
+        where n is the number of variables
+    tenure_random : int or None
+        random integer in [0, tenure_random] is added to tenure,
+        if it is None, the value of tenure is used
+    max_stagnation : int or None
+        number of moves without improvement to restart,
+        if it is None, max(100, 10n) is used
+    perturbation_ratio : float
+        initial ratio of flipped variables in restart
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import flopt
+
+        x = flopt.Variable.array("x", 3, cat="Binary")
+        s = flopt.Variable("s", cat="Spin")
+
+        prob = flopt.Problem()
+        prob += x[0] * x[1] - x[1] * x[2] + 2 * x[2] * s - x[0]
+
+        status, log = prob.solve(solver="Tabu", msg=True, timelimit=1)
+
+        print("obj =", flopt.Value(prob.obj))
+        print("x =", flopt.Value(x))
+        print("s =", flopt.Value(s))
+    """
+
+    name = "Tabu"
+    can_solve_problems = {
+        "Variable": VariableType.Binary,
+        "Objective": ExpressionType.Quadratic,
+        "Constraint": ExpressionType.Non,
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.n_trial = 1e100
+        self.tenure = None
+        self.tenure_random = None
+        self.max_stagnation = None
+        self.perturbation_ratio = 0.1
+
+    def search(self, solution, objective, *args):
+        self.start_build()
+
+        qubo = self.createQubo(solution, objective)
+        n = qubo.numVariables()
+        if n == 0:
+            self.end_build()
+            return SolverTerminateState.Normal
+
+        # symmetric matrix W (zero diagonal) and linear term q
+        # x.T.dot(Q).dot(x) + C = 1/2 x.T.dot(W).dot(x) + q.T.dot(x) + C
+        Q = sparse.csr_matrix(qubo.Q)
+        q = Q.diagonal()
+        W = sparse.triu(Q, k=1)
+        W = (W + W.T).tocsr()
+        indptr, indices, data = W.indptr, W.indices, W.data
+
+        is_spin = np.array(
+            [var.type() == VariableType.Spin for var in solution], dtype=bool
+        )
+        x = np.array([var.value() for var in solution], dtype=np_float)
+        x[is_spin] = (x[is_spin] + 1) / 2
+
+        tenure = self.tenure if self.tenure is not None else max(1, min(20, n // 4))
+        tenure_random = self.tenure_random if self.tenure_random is not None else tenure
+        max_stagnation = (
+            self.max_stagnation if self.max_stagnation is not None else max(100, 10 * n)
+        )
+
+        def set_solution(x):
+            values = np.where(is_spin, 2 * x - 1, x).astype(int)
+            solution.setValuesFromArray(values.tolist())
+
+        def initialize(x):
+            # gain[i] = f(x with flipped x_i) - f(x)
+            field = q + W.dot(x)
+            gain = (1 - 2 * x) * field
+            obj_value = 0.5 * x.dot(W.dot(x)) + q.dot(x) + qubo.C
+            return gain, obj_value
+
+        gain, obj_value = initialize(x)
+        best_x = x.copy()
+        best_value = obj_value
+        tabu = np.zeros(n, dtype=np.int64)
+        n_perturbation = max(1, int(self.perturbation_ratio * n))
+        last_improve = 0
+
+        self.end_build()
+
+        try:
+            for it in range(1, int(self.n_trial) + 1):
+                # select the best move (tabu moves are allowed by aspiration criterion)
+                allowed = (tabu < it) | (obj_value + gain < best_value - self.tol)
+                if allowed.any():
+                    i = int(np.argmin(np.where(allowed, gain, np.inf)))
+                else:
+                    i = int(np.argmin(tabu))
+
+                # flip x_i and update gains of x_i and its neighbors in O(degree)
+                d = 1 - 2 * x[i]
+                obj_value += gain[i]
+                x[i] += d
+                gain[i] = -gain[i]
+                js = indices[indptr[i] : indptr[i + 1]]
+                gain[js] += (1 - 2 * x[js]) * d * data[indptr[i] : indptr[i + 1]]
+                tabu[i] = it + tenure + random.randint(0, tenure_random)
+
+                if obj_value < best_value - self.tol:
+                    best_x[:] = x
+                    best_value = obj_value
+                    last_improve = it
+                    n_perturbation = max(1, int(self.perturbation_ratio * n))
+                    set_solution(x)
+                    self.registerSolution(solution, obj_value, msg_tol=1e-8)
+                else:
+                    self.trial_ix += 1
+
+                # restart from the incumbent solution with random flips
+                if it - last_improve > max_stagnation:
+                    logger.debug(f"restart tabu search with {n_perturbation} flips")
+                    x[:] = best_x
+                    flips = random.sample(range(n), n_perturbation)
+                    x[flips] = 1 - x[flips]
+                    gain, obj_value = initialize(x)
+                    tabu[:] = 0
+                    last_improve = it
+                    n_perturbation = min(max(1, n // 2), 2 * n_perturbation)
+
+                # callbacks
+                if self.callbacks:
+                    set_solution(x)
+                    self.callback([solution])
+
+                # check time limit
+                self.raiseTimeoutIfNeeded()
+        except TimeoutError as e:
+            set_solution(best_x)
+            raise e
+
+        set_solution(best_x)
+        return SolverTerminateState.Normal
+
+    def createQubo(self, solution, objective):
+        """create QUBO structure of objective for the variables in solution
+
+        Spin variables are converted into binary by s = 2 x - 1,
+        and variables not in solution are treated as constants.
+
+        Parameters
+        ----------
+        solution : Solution
+        objective : Expression
+
+        Returns
+        -------
+        QuboStructure
+        """
+        # 1/2 s.T.dot(Q).dot(s) + c.T.dot(s) + C, where s = D x + e
+        Q, c, C = quadratic_to_sparse(objective, list(solution))
+        is_spin = np.array(
+            [var.type() == VariableType.Spin for var in solution], dtype=bool
+        )
+        D = np.where(is_spin, 2.0, 1.0)
+        e = np.where(is_spin, -1.0, 0.0)
+        DQD = sparse.diags(D).dot(Q).dot(sparse.diags(D))
+        qubo_c = D * (Q.dot(e) + c) + 0.5 * DQD.diagonal()
+        qubo_C = 0.5 * e.dot(Q.dot(e)) + c.dot(e) + C
+        qubo_Q = (sparse.triu(DQD, k=1) + sparse.diags(qubo_c)).tocsr()
+        return QuboStructure(qubo_Q, qubo_C, np.array(list(solution), dtype=object))
@@ -1,6 +1,10 @@
 import random
+import collections
+
+import numpy as np
 
 from flopt.solvers.base import BaseSearch
+from flopt.expression import TourDistance
 from flopt.constants import VariableType, ExpressionType, SolverTerminateState
 
 from flopt.env import setup_logger
@@ -16,6 +20,42 @@ class TwoOpt(BaseSearch):
     [0, 1, .., i-1, j, j-1, ..., i+1, i, j+1, ..., n],
     where i and j are in {0..n}, and i is less than j.
 
+    When the objective function is TourDistance with a symmetric distance matrix,
+    the tour is kept in an int array and the search runs as follows.
+
+    - The gain of 2-Opt and Or-opt moves is calculated in O(1) from the changed edges.
+    - Only the n_neighbors nearest cities of each city are tried as new edges.
+    - Don't-look bits: only cities around the changed edges are rescanned.
+    - A segment is reversed in place, choosing the shorter side of the tour.
+    - When a local optimum is reached, the tour is perturbed by a double-bridge move.
+
+    Otherwise, random 2-Opt moves are evaluated by the objective function.
+
+    Parameters
+    ----------
+    n_trial : int
+        number of moves
+    n_neighbors : int
+        number of candidate neighbors of each city (TourDistance only)
+    or_opt_length : int
+        maximum length of segments moved by Or-opt, 0 disables Or-opt (TourDistance only)
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        import numpy as np
+        import flopt
+
+        xy = np.random.rand(100, 2)
+        D = np.linalg.norm(xy[:, None] - xy[None, :], axis=2)
+
+        perm = flopt.Variable("perm", lowBound=0, upBound=99, cat="Permutation")
+        prob = flopt.Problem("TSP")
+        prob += flopt.TourDistance(D, perm)
+
+        prob.solve(solver="2-Opt", timelimit=1, msg=True)
     """
 
     name = "2-Opt"
@@ -28,21 +68,24 @@ class TwoOpt(BaseSearch):
     def __init__(self):
         super().__init__()
         self.n_trial = 1e100
+        self.n_neighbors = 10
+        self.or_opt_length = 3
+
+    def search(self, solution, objective, *args):
+        if self.isTour(solution, objective):
+            return self.searchTour(solution, objective)
 
-    def search(self, solution, *args):
         best_obj_value = self.best_obj_value
 
         for _ in range(int(self.n_trial)):
             # generate new solution
             for var in solution:
-                perm = var.value()
-                n_perm = len(perm)
+                n_perm = len(var)
                 i, j = sorted(random.sample(range(n_perm), 2))
-                new_perm = perm[:i] + perm[i:j][::-1] + perm[j:]  # 2-opt
-                var.setValue(new_perm)
+                var.reverse(i, j)  # 2-opt
                 obj_value = self.getObjValue(solution)
                 if obj_value >= self.best_obj_value:
-                    var.setValue(perm)
+                    var.reverse(i, j)
                 else:
                     best_obj_value = obj_value
 
@@ -56,3 +99,198 @@ class TwoOpt(BaseSearch):
             self.raiseTimeoutIfNeeded()
 
         return SolverTerminateState.Normal
+
+    def isTour(self, solution, objective):
+        """check if objective is the tour distance of the only permutation variable
+
+        Parameters
+        ----------
+        solution : Solution
+        objective : Expression
+
+        Returns
+        -------
+        bool
+        """
+        if not isinstance(objective, TourDistance) or len(solution) != 1:
+            return False
+        var = list(solution)[0]
+        D = objective.D
+        return (
+            var.name == objective.perm.name
+            and len(var) >= 8
+            and D.ndim == 2
+            and D.shape[0] == D.shape[1]
+            and np.allclose(D, D.T)
+        )
+
+    def searchTour(self, solution, objective):
+        self.start_build()
+
+        var = list(solution)[0]
+        D = objective.D
+        tour = var.view().astype(np.int64)
+        n = len(tour)
+        pos = np.zeros(D.shape[0], dtype=np.int64)
+        pos[tour] = np.arange(n)
+
+        # k-nearest neighbor lists of cities in the tour
+        k = max(1, min(self.n_neighbors, n - 1))
+        sub = D[np.ix_(tour, tour)].copy()
+        np.fill_diagonal(sub, np.inf)
+        nearest = np.argpartition(sub, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(sub, nearest, axis=1), axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        neighbors = np.zeros((D.shape[0], k), dtype=np.int64)
+        neighbors[tour] = tour[nearest]
+        neighbors = neighbors.tolist()
+        tol = self.tol
+        or_opt_length = min(self.or_opt_length, n - 4)
+
+        def succ(c):
+            return tour[(pos[c] + 1) % n]
+
+        def pred(c):
+            return tour[pos[c] - 1]
+
+        def rotate(i, length, shift):
+            # rotate the cyclic block tour[i : i+length] to the left by shift
+            ix = (i + np.arange(length)) % n
+            block = np.roll(tour[ix], -shift)
+            tour[ix] = block
+            pos[block] = ix
+
+        def reverse(a, b):
+            # reverse the path a -> b, or the opposite path (same cycle) if shorter
+            i, j = pos[a], pos[b]
+            length = (j - i) % n + 1
+            if 2 * length > n:
+                i, length = (j + 1) % n, n - length
+            ix = (i + np.arange(length)) % n
+            block = tour[ix][::-1]
+            tour[ix] = block
+            pos[block] = ix
+
+        def two_opt(a):
+            # try to replace edges (a, succ(a)) and (c, succ(c)) by (a, c) and (succ(a), succ(c)),
+            # and edges (pred(a), a) and (pred(c), c) by (a, c) and (pred(a), pred(c))
+            for forward in (True, False):
+                a_next = succ(a) if forward else pred(a)
+                d_a = D[a, a_next]
+                for c in neighbors[a]:
+                    d_ac = D[a, c]
+                    if d_ac >= d_a:
+                        break
+                    c_next = succ(c) if forward else pred(c)
+                    if c_next == a:
+                        continue
+                    delta = d_ac + D[a_next, c_next] - d_a - D[c, c_next]
+                    if delta < -tol:
+                        if forward:
+                            reverse(a_next, c)
+                        else:
+                            reverse(c, a_next)
+                        return delta, (a, a_next, c, c_next)
+            return 0, None
+
+        def or_opt(a):
+            # try to move the segment a -> ... -> s (length 1..or_opt_length)
+            # between c and its adjacent city
+            s = a
+            for length in range(1, or_opt_length + 1):
+                if length > 1:
+                    s = succ(s)
+                p, nx = pred(a), succ(s)
+                d_remove = D[p, a] + D[s, nx] - D[p, nx]
+                if d_remove <= tol:
+                    continue
+                i = pos[a]
+                for c in neighbors[a] + neighbors[s]:
+                    if (pos[c] - i) % n < length:
+                        continue
+                    for u, v in ((c, succ(c)), (pred(c), c)):
+                        if u == p or (pos[u] - i) % n < length:
+                            continue
+                        d_uv = D[u, v]
+                        delta_fwd = D[u, a] + D[s, v] - d_uv - d_remove
+                        delta_rev = D[u, s] + D[a, v] - d_uv - d_remove
+                        delta = min(delta_fwd, delta_rev)
+                        if delta < -tol:
+                            if delta_rev < delta_fwd:
+                                reverse(a, s)
+                                a, s = s, a
+                                i = pos[a]
+                            # move the segment after u
+                            gap = (pos[u] - i) % n + 1 - length
+                            if gap <= n - length - gap:
+                                rotate(i, length + gap, length)
+                            else:
+                                rotate(pos[v], n - gap, n - length - gap)
+                            return delta, (a, s, p, nx, u, v)
+            return 0, None
+
+        def double_bridge():
+            i, j, k = sorted(random.sample(range(1, n), 3))
+            tour[:] = np.concatenate([tour[:i], tour[j:k], tour[i:j], tour[k:]])
+            pos[tour] = np.arange(n)
+            return tour[[0, i - 1, i, j - 1, j, k - 1, k, n - 1]].tolist()
+
+        def tour_length():
+            return D[tour, np.roll(tour, -1)].sum()
+
+        obj_value = tour_length()
+        best_obj_value = obj_value
+        best_tour = tour.copy()
+        queue = collections.deque(tour.tolist())
+        in_queue = np.ones(D.shape[0], dtype=bool)
+
+        def update_best():
+            nonlocal best_obj_value
+            if obj_value < best_obj_value - tol:
+                best_obj_value = obj_value
+                best_tour[:] = tour
+                var.setValue(tour)
+                self.registerSolution(solution, obj_value, msg_tol=1e-8)
+
+        self.end_build()
+
+        try:
+            while self.trial_ix < self.n_trial:
+                if queue:
+                    a = queue.popleft()
+                    in_queue[a] = False
+                    delta, changed = two_opt(a)
+                    if changed is None and or_opt_length > 0:
+                        delta, changed = or_opt(a)
+                    if changed is not None:
+                        obj_value += delta
+                        self.trial_ix += 1
+                else:
+                    # local optimum, restart from the perturbed best tour
+                    update_best()
+                    if self.callbacks:
+                        var.setValue(tour)
+                        self.callback([solution])
+                    if obj_value > best_obj_value + tol:
+                        tour[:] = best_tour
+                        pos[tour] = np.arange(n)
+                    changed = double_bridge()
+                    obj_value = tour_length()
+                    self.trial_ix += 1
+
+                if changed is not None:
+                    for c in changed:
+                        if not in_queue[c]:
+                            in_queue[c] = True
+                            queue.append(c)
+
+                # check time limit
+                self.raiseTimeoutIfNeeded()
+        except TimeoutError as e:
+            update_best()
+            var.setValue(best_tour)
+            raise e
+
+        update_best()
+        var.setValue(best_tour)
+        return SolverTerminateState.Normal
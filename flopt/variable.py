@@ -26,7 +26,6 @@ from flopt.env import (
     get_variable_upper_bound,
 )
 
-
 logger = setup_logger(__name__)
 
 
@@ -468,6 +467,9 @@ class VarElement:
     def toMonomial(self):
         return self.monomial
 
+    def constant(self):
+        return 0
+
     def isPolynomial(self):
         return True
 
@@ -510,6 +512,18 @@ class VarElement:
     def clone(self, *args, **kwargs):
         raise NotImplementedError()
 
+    def bounds(self):
+        """
+        Returns
+        -------
+        tuple of float
+            lower and upper bounds, which are infinite if they are not specified
+        """
+        return (
+            self.lowBound if self.lowBound is not None else -math.inf,
+            self.upBound if self.upBound is not None else math.inf,
+        )
+
     def max(self):
         if self.upBound is not None:
             return self.upBound
@@ -1025,6 +1039,8 @@ class VarPermutation(VarElement):
     """Permutation Variable
 
     This has [lowBound, ... upBound] range permutation.
+    The permutation is stored in a numpy int32 array,
+    and it can be modified in place by reverse(), swap() and insert().
 
     Examples
     --------
@@ -1044,6 +1060,19 @@ class VarPermutation(VarElement):
     >>> 4
     >>> b[1:3]
     >>> [1, 2]
+
+    view() returns the read-only array without copying,
+    and the permutation can be modified in place.
+
+    >>> b.reverse(1, 3)
+    >>> b.view()
+    >>> array([0, 2, 1, 3], dtype=int32)
+    >>> b.swap(0, 3)
+    >>> b.view()
+    >>> array([3, 2, 1, 0], dtype=int32)
+    >>> b.insert(0, 2)  # move the element at 0 to 2
+    >>> b.view()
+    >>> array([2, 1, 3, 0], dtype=int32)
     """
 
     _type = VariableType.Permutation
@@ -1053,6 +1082,7 @@ class VarPermutation(VarElement):
             ini_value = list(range(lowBound, upBound + 1))
             random.shuffle(ini_value)
         super().__init__(name, lowBound, upBound, ini_value)
+        self.setValue(ini_value)
 
     def value(self, *args, **kwargs):
         """
@@ -1060,14 +1090,65 @@ class VarPermutation(VarElement):
         -------
         list
         """
-        _value = self._value[:]  # copy
-        return _value
+        return self._value.tolist()
+
+    def view(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+          read-only view of the permutation (not copied)
+        """
+        view = self._value.view()
+        view.flags.writeable = False
+        return view
+
+    def setValue(self, value):
+        self._value = np.array(value, dtype=np.int32)
 
     def setRandom(self, scale=None):
         """shuffle the list"""
         # scale is ignored
         return random.shuffle(self._value)
 
+    def reverse(self, i, j):
+        """reverse the segment [i, j) in place
+
+        Parameters
+        ----------
+        i : int
+        j : int
+        """
+        self._value[i:j] = self._value[i:j][::-1]
+
+    def swap(self, i, j):
+        """swap the elements at i and j in place
+
+        Parameters
+        ----------
+        i : int
+        j : int
+        """
+        self._value[[i, j]] = self._value[[j, i]]
+
+    def insert(self, i, j):
+        """move the element at i to j in place, elements between them are shifted
+
+        Parameters
+        ----------
+        i : int
+        j : int
+        """
+        elm = self._value[i]
+        if i < j:
+            self._value[i:j] = self._value[i + 1 : j + 1]
+        else:
+            self._value[j + 1 : i + 1] = self._value[j:i]
+        self._value[j] = elm
+
+    def bounds(self):
+        return -math.inf, math.inf
+
     def isPolynomial(self):
         return False
 
@@ -1084,14 +1165,106 @@ class VarPermutation(VarElement):
         return VarPermutation(self.name, self.lowBound, self.upBound, self._value)
 
     def __iter__(self):
-        return iter(self._value)
+        return iter(self._value.tolist())
 
     def __getitem__(self, k):
-        return self._value[k]
+        return self._value[k].tolist()
 
     def __len__(self):
         return len(self._value)
 
 
+class Parameter(VarElement):
+    """Parameter
+
+    Parameter is a constant of the problem whose value can be changed between solves.
+    It is not a decision variable, so it is not included in the variables of
+    expressions, constraints and problems. The polynomial forms of expressions keep
+    parameters as symbols, and the structures (LpStructure, QpStructure)
+    created from the problem can be updated in place by updateParameters()
+    after the values of parameters are changed.
+
+    Parameters
+    ----------
+    name : str
+    value : int or float
+
+    Examples
+    --------
+
+    >>> from flopt import Variable, Parameter, Problem
+    >>> from flopt.convert import LpStructure
+    >>> x = Variable("x", lowBound=0)
+    >>> p = Parameter("p", value=2)
+    >>> prob = Problem()
+    >>> prob += x
+    >>> prob += p * x >= p + 1
+    >>> lp = LpStructure.fromFlopt(prob, sparse=True)
+    >>> lp.G.toarray(), lp.h
+    >>> (array([[-2.]]), array([-3.]))
+    >>> p.setValue(3)
+    >>> lp.updateParameters()
+    >>> lp.G.toarray(), lp.h
+    >>> (array([[-3.]]), array([-4.]))
+    """
+
+    _type = VariableType.Parameter
+
+    def __init__(self, name, value=0):
+        Variable.checkName(name)
+        super().__init__(name.replace(" ", "_"), ini_value=value)
+
+    @classmethod
+    def array(cls, name, shape, value=0):
+        """
+        Parameters
+        ----------
+        name : str
+        shape : int or tuple of int
+        value : int, float or array-like
+            initial values
+
+        Returns
+        -------
+        FloptNdarray
+        """
+        if isinstance(shape, int):
+            shape = (shape,)
+        values = np.broadcast_to(np.asarray(value), shape)
+        params = np.ndarray(shape, dtype=object)
+        digits = [len(str(s)) for s in shape]
+        for i in itertools.product(*map(range, shape)):
+            param_name = f"{name}_" + "_".join(
+                str(s).zfill(digit) for s, digit in zip(i, digits)
+            )
+            params[i] = cls(param_name, value=values[i].item())
+        return FloptNdarray(params)
+
+    def getVariables(self):
+        return set()
+
+    def feasible(self):
+        return True
+
+    def setRandom(self, scale=None):
+        """value of parameter is not changed"""
+        pass
+
+    def bounds(self):
+        return self._value, self._value
+
+    def max(self):
+        return self._value
+
+    def min(self):
+        return self._value
+
+    def clone(self):
+        return self
+
+    def __repr__(self):
+        return f"Parameter({self.name}, {self._value})"
+
+
 # Variable
 Variable = VariableFactory()
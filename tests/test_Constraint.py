@@ -2,7 +2,7 @@ import pytest
 
 import numpy as np
 
-from flopt import Variable, CustomExpression
+from flopt import Variable, CustomExpression, MatrixConstraint
 from flopt.expression import Expression, Const
 from flopt.constants import ConstraintType
 
@@ -64,6 +64,17 @@ def test_Constraint_rshift(a, b):
     assert len((a + b == 2) >> (b == 0)) == 5
 
 
+def test_Constraint_rshift_without_solve(a, b, monkeypatch):
+    import flopt
+
+    def solve(*args, **kwargs):
+        assert False, "big-M values must be calculated without solving"
+
+    monkeypatch.setattr(flopt.Problem, "solve", solve)
+    assert len((a + b == 2) >> (b == 0)) == 5
+    assert len((a * a * b <= 2) >> (b >= 0)) == 2
+
+
 def test_Constraint_hash(a, b):
     assert hash(a == 1) == hash(a - 1 == 0)
     assert hash(a >= 0) == hash(-a <= 0)
@@ -74,3 +85,48 @@ def test_Constraint_hash(a, b):
 
 def test_Constraint_repr(a, b):
     repr(a + b <= 0)
+
+
+def test_MatrixConstraint(a, b):
+    from scipy.sparse import csr_matrix
+
+    a.setValue(1)
+    b.setValue(2)
+    const = MatrixConstraint(csr_matrix([[1, 1], [1, -1]]), [a, b], ">=", [3, 0])
+    assert const.type() == ConstraintType.Le
+    assert len(const) == 2
+    assert np.all(const.value() == [0, 1])
+    assert const.feasible() == False
+    assert const.getVariables() == {a, b}
+
+    rows = const.toConstraints()
+    assert len(rows) == 2
+    assert [row.feasible() for row in rows] == [True, False]
+
+    const = MatrixConstraint(np.array([[1, 1]]), [a, b], "==", 3, name="c")
+    assert const.feasible() == True
+    assert const.toConstraints()[0].name == "c_0"
+
+
+def test_MatrixConstraint_matmul():
+    x = Variable.array("x", 3, lowBound=0, upBound=5, ini_value=1)
+    A = np.array([[1, 2, 0], [0, 1, 1]])
+
+    const = A @ x <= [4, 3]
+    assert isinstance(const, MatrixConstraint)
+    assert const.type() == ConstraintType.Le
+    assert np.all(const.value() == [-1, -1])
+
+    const = np.array([3, 2]) == A @ x
+    assert isinstance(const, MatrixConstraint)
+    assert const.type() == ConstraintType.Eq
+    assert const.feasible() == True
+
+    const = 2 * (A @ x) - 1 >= 0
+    assert isinstance(const, MatrixConstraint)
+    assert np.all(const.value() == [-5, -3])
+
+    # expression of each row
+    assert np.all((A @ x).value() == [3, 2])
+    assert (A @ x)[1].value() == 2
+    assert len(A @ x) == 2
@@ -170,6 +170,72 @@ def test_flopt_to_lp_ineq():
     lp = LpStructure.fromFlopt(prob, option="ineq")
 
 
+def test_flopt_to_lp_sparse():
+    # Variables
+    a = Variable("a", cat="Binary")
+    b = Variable("b", cat="Binary")
+    c = Variable("c", lowBound=-1, upBound=2, cat="Integer")
+    d = Variable("d", lowBound=-2, upBound=1, cat="Continuous")
+
+    # Problem
+    prob = Problem()
+    prob += c + b  # set the objective function
+    prob += a + c == 0  # set the constraint
+    prob += a + b <= 1  # set the constraint
+    prob += a + d >= -1  # set the constraint
+
+    from flopt.convert import LpStructure
+
+    lp = LpStructure.fromFlopt(prob)
+    sparse_lp = LpStructure.fromFlopt(prob, sparse=True)
+    assert np.all(sparse_lp.G.toarray() == lp.G)
+    assert np.all(sparse_lp.h == lp.h)
+    assert np.all(sparse_lp.A.toarray() == lp.A)
+    assert np.all(sparse_lp.b == lp.b)
+
+
+def test_flopt_to_qp_sparse():
+    a = Variable("a", lowBound=0, upBound=1, cat="Integer")
+    b = Variable("b", lowBound=1, upBound=2, cat="Continuous")
+    c = Variable("c", lowBound=-1, upBound=3, cat="Continuous", ini_value=2)
+
+    prob = Problem()
+    prob += 2 * a * a + 3 * a * b - b * c + a + c * c + 1
+    prob += a + b - 2 * c <= 2
+    prob += b - c == 1
+
+    from flopt.convert import QpStructure
+
+    for x in [None, [a, b]]:
+        qp = QpStructure.fromFlopt(prob, x=x)
+        sparse_qp = QpStructure.fromFlopt(prob, x=x, sparse=True)
+        assert np.all(sparse_qp.Q.toarray() == qp.Q)
+        assert np.all(sparse_qp.c == qp.c)
+        assert sparse_qp.C == qp.C
+        assert np.all(sparse_qp.G.toarray() == qp.G)
+        assert np.all(sparse_qp.A.toarray() == qp.A)
+
+
+def test_qp_bounds_to_ineq_sparse():
+    a = Variable("a", lowBound=0, upBound=1, cat="Continuous")
+    b = Variable("b", lowBound=1, cat="Continuous")
+    c = Variable("c", upBound=3, cat="Continuous")
+
+    prob = Problem()
+    prob += a * a + b * c + a
+    prob += a + b - 2 * c <= 2
+    prob += b - c == 1
+
+    from flopt.convert import QpStructure
+
+    qp = QpStructure.fromFlopt(prob).boundsToIneq()
+    sparse_qp = QpStructure.fromFlopt(prob, sparse=True).boundsToIneq()
+    assert sparse_qp.G.shape == (5, 3)
+    assert np.all(sparse_qp.G.toarray() == qp.G)
+    assert np.all(sparse_qp.h == qp.h)
+    assert sparse_qp.lb is None and sparse_qp.ub is None
+
+
 def test_flopt_to_lp_eq():
     # Variables
     a = Variable("a", cat="Binary")
@@ -237,6 +303,19 @@ def test_flopt_to_lp1():
     lp.toQubo()
 
 
+def test_linear_constraints_to_sparse():
+    from flopt.convert.structure import linear_constraints_to_sparse
+
+    a = Variable("a")
+    b = Variable("b", ini_value=5)
+    c = Variable("c")
+    constraints = [3 * a + 2 * b + 1 <= 0, a - 4 * c + 2 * b == 7]
+    A, lb, ub = linear_constraints_to_sparse(constraints, [a, c])
+    assert np.all(A.toarray() == np.array([[3, 0], [1, -4]]))
+    assert np.all(lb == np.array([-np.inf, -3]))
+    assert np.all(ub == np.array([-11, -3]))
+
+
 def test_flopt_to_ising1():
     a = Variable(name="a", ini_value=1, cat="Spin")
     b = Variable(name="b", ini_value=1, cat="Spin")
@@ -360,6 +439,35 @@ def test_flopt_to_pulp():
     print(lp_solution)
 
 
+def test_lp_write_mps(tmpdir):
+    import pulp
+    from flopt.convert import LpStructure
+
+    c = [0, 1, -2]
+    A = [[0, 1, 2], [1, 2, 3]]
+    b = [0, 1]
+    G = [[1, 0, -1]]
+    h = [2.5]
+    lb = [0, -1, np.nan]
+    ub = [1, np.nan, np.nan]
+    var_types = ["Binary", "Integer", "Continuous"]
+
+    path = str(tmpdir.join("model.mps"))
+    lp = LpStructure(c, 0, G, h, A, b, lb, ub, types=var_types)
+    var_names = lp.writeMps(path)
+
+    _, lp_prob = pulp.LpProblem.fromMPS(path)
+    lp_vars = {var.name: var for var in lp_prob.variables()}
+    assert len(lp_prob.constraints) == 3
+    assert [lp_vars[name].cat for name in var_names] == [
+        pulp.LpInteger,
+        pulp.LpInteger,
+        pulp.LpContinuous,
+    ]
+    assert [lp_vars[name].lowBound for name in var_names] == [0, -1, None]
+    assert [lp_vars[name].upBound for name in var_names] == [1, None, None]
+
+
 def test_lp_to_flopt():
     # make Lp model
     c = [0, 1, 2]
@@ -438,3 +546,99 @@ def test_pulp_to_flopt2():
     from flopt.convert import pulp_to_flopt
 
     flopt_prob = pulp_to_flopt(prob)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_qp_update_parameters(sparse):
+    from flopt import Parameter
+    from flopt.convert import QpStructure
+
+    x = Variable("x", lowBound=0)
+    y = Variable("y", lowBound=0, upBound=5)
+    p = Parameter("p", value=2)
+    q = Parameter.array("q", 2, value=[1, 0])
+
+    prob = Problem()
+    prob += x + p * y + q[1] * x * y + p
+    prob += p * x >= p + 1
+    prob += q[0] * x + q[1] * y == 3 * p
+    assert prob.getVariables() == {x, y}
+    assert prob.constraints[0].isLinear()
+
+    qp = QpStructure.fromFlopt(prob, sparse=sparse)
+    p.setValue(3)
+    q.setValue(np.array([2, 1]))
+    qp.updateParameters()
+
+    def dense(M):
+        return M.toarray() if hasattr(M, "toarray") else M
+
+    expected = QpStructure.fromFlopt(prob)
+    assert np.all(dense(qp.Q) == expected.Q)
+    assert np.all(qp.c == expected.c)
+    assert qp.C == expected.C == 3
+    assert np.all(dense(qp.G) == expected.G)
+    assert np.all(qp.h == expected.h)
+    assert np.all(dense(qp.A) == expected.A)
+    assert np.all(qp.b == expected.b)
+
+
+def test_qp_structure_cache():
+    from flopt import Parameter
+    from flopt.convert import QpStructure
+
+    x = Variable.array("x", 3, lowBound=0, upBound=2)
+    p = Parameter("p", value=1)
+
+    prob = Problem()
+    prob += x[0] * x[1] + p * x[2] + 1
+    prob += x[0] + x[1] <= p
+
+    def dense(M):
+        return M.toarray() if hasattr(M, "toarray") else M
+
+    def check(qp, expected):
+        for name in ["Q", "c", "G", "h", "A", "b", "lb", "ub"]:
+            M, N = getattr(qp, name), getattr(expected, name)
+            assert (M is None and N is None) or np.allclose(dense(M), dense(N))
+        assert qp.C == expected.C
+
+    qp = QpStructure.fromFlopt(prob, sparse=True, cache=True)
+    check(qp, QpStructure.fromFlopt(prob))
+    cache = prob.structure_cache
+
+    # constraints are appended and parameters are updated in the same cache
+    prob += x[1] - p * x[2] == 1
+    p.setValue(3)
+    qp = QpStructure.fromFlopt(prob, sparse=True, cache=True)
+    check(qp, QpStructure.fromFlopt(prob))
+    assert prob.structure_cache is cache
+    assert cache.G.shape == (1, 3) and cache.A.shape == (1, 3)
+
+    # objective is replaced
+    prob += x[0] + 2 * x[2]
+    qp = QpStructure.fromFlopt(prob, sparse=True, cache=True)
+    check(qp, QpStructure.fromFlopt(prob))
+    assert prob.structure_cache is cache
+
+    # other changes create a new cache
+    prob.constraints = prob.constraints[1:]
+    prob.clearCache()
+    qp = QpStructure.fromFlopt(prob, sparse=True, cache=True)
+    check(qp, QpStructure.fromFlopt(prob))
+    assert prob.structure_cache is not cache
+
+
+def test_structure_cache_part_of_variables():
+    from flopt.convert import LpStructure
+
+    x = Variable.array("x", 3, lowBound=0, upBound=2)
+    prob = Problem()
+    prob += x[0] + x[1] + x[2]
+    prob += x[0] + x[2] >= 1
+
+    # cache of a part of variables is not used for all variables
+    LpStructure.fromFlopt(prob, x=x[:2], sparse=True, cache=True)
+    lp = LpStructure.fromFlopt(prob, sparse=True, cache=True)
+    assert [var.name for var in lp.x] == ["x_0", "x_1", "x_2"]
+    assert np.allclose(lp.c, [1, 1, 1])
@@ -160,3 +160,30 @@ def test_CustomExpression_matrix_arg():
     x = flopt.Variable.matrix("x", 2, 2)
     custom_obj = flopt.CustomExpression(obj, [x])
     custom_obj.value()
+
+
+def test_TourDistance():
+    D = [[0, 1, 2], [1, 0, 3], [2, 3, 0]]
+    perm = flopt.Variable(
+        "perm", lowBound=0, upBound=2, ini_value=[0, 2, 1], cat="Permutation"
+    )
+    tour_obj = flopt.TourDistance(D, perm)
+    assert tour_obj.value() == 6
+    assert tour_obj.clone().value() == 6
+    assert (tour_obj + 1).value() == 7
+
+
+def test_TourDistance_var_dict():
+    from flopt.expression import SelfReturn
+
+    D = [[0, 1, 5, 2], [1, 0, 3, 6], [5, 3, 0, 4], [2, 6, 4, 0]]
+    perm = flopt.Variable(
+        "perm", lowBound=0, upBound=3, ini_value=[0, 1, 2, 3], cat="Permutation"
+    )
+    tour_obj = flopt.TourDistance(D, perm)
+    assert tour_obj.value(var_dict={"perm": SelfReturn(perm)}) == 10
+    assert tour_obj.value(var_dict={"perm": SelfReturn([0, 2, 1, 3])}) == 16
+
+    prob = flopt.Problem()
+    prob += tour_obj
+    assert prob.replace({perm: perm}).obj.value() == 10
@@ -134,6 +134,11 @@ def test_Expression_constant2(a, b):
     assert (a / b + 1).constant() == 1
 
 
+def test_Expression_constant3(a, b):
+    assert (2 * flopt.exp(a) + (a + 1) * (b + 3)).constant() == 3
+    assert ((flopt.exp(a) + 2) / 4 - 1).constant() == -0.5
+
+
 def test_Expression_isMonomial1(a, b):
     assert (2 * a).isMonomial() == True
     assert (2 * a * b).isMonomial() == True
@@ -184,6 +189,42 @@ def test_Expression_expand(a, b):
     (a * a + a * b + a).expand()
 
 
+def test_Expression_expand_native(a, b):
+    e = (a + 1) * (b - 2) - a
+    expanded = e.expand()
+    assert isinstance(expanded, Expression)
+    assert expanded.toPolynomial() == e.toPolynomial()
+    assert expanded.value() == e.value()
+    assert (a + 1 - a).expand() == Const(1)
+
+    # non-polynomial expression is expanded partially
+    e = flopt.exp(a) * (a + 1) * (b - 2)
+    assert e.expand().value() == pytest.approx(e.value())
+    assert e.expand(use_sympy=True).value() == pytest.approx(e.value())
+
+
+def test_Expression_simplify_binary_spin():
+    x = Variable("x", cat="Binary")
+    s = Variable("s", cat="Spin")
+    assert (x * x * 3 + x).simplify().toPolynomial() == (4 * x).toPolynomial()
+    assert (s * 2 * s - s).simplify().toPolynomial() == (2 - s).toPolynomial()
+
+
+def test_Expression_toSpin_toBinary_qubo():
+    x = Variable.array("x", 4, cat="Binary")
+    Q = np.arange(16).reshape(4, 4) - 8
+    qubo = flopt.Sum(Q[i, j] * x[i] * x[j] for i in range(4) for j in range(4))
+    ising = qubo.toSpin()
+    assert all(var.type() == flopt.VarSpin for var in ising.getVariables())
+    assert ising.isQuadratic()
+    binary = ising.toBinary()
+    for values in np.ndindex(*[2] * 4):
+        for var, value in zip(x, values):
+            var.setValue(value)
+        assert ising.value() == pytest.approx(qubo.value())
+        assert binary.value() == pytest.approx(qubo.value())
+
+
 def test_Expression_toBinary():
     b = Variable("bb", cat="Binary")
     s = Variable("ss", cat="Spin")
@@ -236,6 +277,24 @@ def test_Expression_min():
     assert np.isclose((z + 1.0).min(), get_variable_lower_bound())
 
 
+def test_Expression_bounds():
+    a = Variable(name="a", lowBound=-1, upBound=2)
+    b = Variable(name="b", lowBound=1, upBound=3)
+    s = Variable(name="s", cat="Spin")
+    z = Variable("z", lowBound=0)
+    assert (a - a).bounds() == (0, 0)
+    assert (a * a).bounds() == (0, 4)
+    assert (a * b - 2 * a).bounds() == (-7, 8)  # valid but not tight
+    assert (s * s + s).bounds() == (0, 2)
+    assert (a / b).bounds() == (-1, 2)
+    assert (a / (b - 2)).bounds() == (-np.inf, np.inf)
+    assert (flopt.exp(b) + a).bounds() == pytest.approx((np.exp(1) - 1, np.exp(3) + 2))
+    assert flopt.abs(a).bounds() == (0, 2)
+    assert (flopt.sin(a) * b).bounds() == (-3, 3)
+    assert (z + flopt.log(b)).bounds() == (0, np.inf)
+    assert (z**0.5 - a).bounds() == (-2, np.inf)
+
+
 def test_Expression_neg(c):
     assert (-c).value() == -5
 
@@ -1,7 +1,10 @@
 import pytest
 import numpy as np
+import scipy.sparse
 
-from flopt import Variable, Problem, CustomExpression, Solver, Sum
+from flopt import Variable, Problem, CustomExpression, Solver, Sum, Solution
+from flopt import MatrixConstraint
+import flopt
 import flopt.constants
 
 
@@ -163,3 +166,201 @@ def test_Problem_duplicate_constraint():
     prob.removeDuplicatedConstraints()
 
     assert len(prob.constraints) == 1
+
+
+def test_Problem_duplicate_constraint_scaled():
+    a = Variable("a", lowBound=0, upBound=1, cat="Integer")
+    b = Variable("b", lowBound=1, upBound=2, cat="Continuous")
+
+    prob = Problem(name="Test")
+    prob += a + b >= 1
+    prob += 2 * a + 2 * b >= 2  # same
+    prob += a + b <= 1  # not same
+    prob += a * b - a == 1
+    prob += 2 * a - 2 * b * a + 2 == 0  # same
+    prob += a * b - a == 2  # not same
+
+    prob.removeDuplicatedConstraints()
+
+    assert prob.constraints[1].expression.getName() == "a+b-1"
+    assert len(prob.constraints) == 4
+
+
+def test_Problem_createConstraintEvaluator():
+    x = Variable.array("x", 3, lowBound=0, upBound=2, cat="Continuous")
+    prob = Problem()
+    prob += x[0] + x[1] <= 1
+    prob += x[0] * x[2] == 1
+    prob += MatrixConstraint(scipy.sparse.csr_matrix([[1, 0, -1]]), x, ">=", 0)
+
+    evaluator = prob.createConstraintEvaluator(list(x))
+    assert evaluator.numConstraints() == 3
+
+    X = np.array([[1, 0, 1], [1, 1, 2]])
+    values = evaluator.values(X)
+    assert values.shape == (2, 3)
+    for row, x_values in zip(values, X):
+        for var, value in zip(x, x_values):
+            var.setValue(value)
+        expected = [const.value() for const in prob.getConstraints()]
+        # the order of values follows getConstraints()
+        np.testing.assert_allclose(row, expected)
+    assert evaluator.feasible(X).tolist() == [True, False]
+
+    for var, value in zip(x, [1, 0, 1]):
+        var.setValue(value)
+    assert evaluator.feasible(Solution(list(x)))
+
+
+def test_Problem_presolve():
+    x = Variable.array("x", 4, lowBound=0, upBound=10, cat="Integer")
+    y = Variable("y", lowBound=0, cat="Continuous")
+    x[3].setValue(2)
+    x[3].fixValue()
+
+    prob = Problem()
+    prob += x[0] + 2 * x[1] + x[2] + x[3] + 2 * y
+    prob += x[0] + x[3] >= 5  # singleton row after fixing x[3]
+    prob += x[0] + x[1] <= 30  # redundant
+    prob += x[1] + x[2] >= 1
+    prob += x[1] + x[2] >= 0  # dominated
+    prob += y + x[2] == 4
+
+    presolved, postsolve = prob.presolve()
+    assert len(postsolve.fixed) == 1
+    assert len(presolved.constraints) == 2
+    assert set(var.name for var in presolved.getVariables()) == {
+        "x_0",
+        "x_1",
+        "x_2",
+        "y",
+    }
+    var_dict = {var.name: var for var in presolved.getVariables()}
+    assert var_dict["x_0"].getLb() == 3
+    assert var_dict["x_2"].getUb() == 4
+    assert var_dict["y"].getUb() == 4
+    # bounds of original variables are kept
+    assert x[0].getLb() == 0 and y.getUb() is None
+
+    prob.solve(solver="ScipyMilp", presolve=True)
+    assert flopt.Value(x).tolist() == [3, 0, 4, 2]
+    assert prob.getSolution().value() == pytest.approx([3, 0, 4, 2, 0])
+    assert all(const.feasible() for const in prob.getConstraints())
+
+
+def test_Problem_presolve_MatrixConstraint():
+    x = Variable.array("x", 4, cat="Binary")
+    x[0].setValue(1)
+    x[0].fixValue()
+
+    prob = Problem()
+    prob += -Sum(x)
+    A = scipy.sparse.csr_matrix([[1, 1, 0, 0], [0, 1, 1, 1], [1, 0, 0, 0]])
+    prob += MatrixConstraint(A, x, "<=", 1, name="M")
+
+    presolved, postsolve = prob.presolve()
+    assert len(presolved.constraints) == 0
+    assert [len(const) for const in presolved.matrix_constraints] == [1]
+    assert presolved.matrix_constraints[0].name == "M"
+    # x_0 is fixed by fixValue and x_1 is fixed to 0 by the first row
+    assert sorted(postsolve.fixed) == ["x_0", "x_1"]
+    assert len(presolved.getVariables()) == 2
+
+    prob.solve(solver="Pulp", presolve=True)
+    assert flopt.Value(x)[:2].tolist() == [1, 0]
+    assert prob.obj.value() == -2
+    assert all(const.feasible() for const in prob.getConstraints())
+
+
+def test_Problem_presolve_infeasible():
+    x = Variable("x", lowBound=0, upBound=1, cat="Continuous")
+    prob = Problem()
+    prob += x
+    prob += x >= 2
+
+    presolved, postsolve = prob.presolve()
+    assert len(presolved.constraints) == 1
+    assert len(postsolve) == 0
+
+
+def test_Problem_presolve_negative_fixed():
+    x = Variable("x", lowBound=0, upBound=5, cat="Integer")
+    y = Variable("y", lowBound=0, upBound=3, ini_value=1, cat="Integer")
+    y.fixValue()
+    z = Variable("z", lowBound=-3, upBound=-3, cat="Integer")
+
+    prob = Problem()
+    prob += Sum([x, -2 * y]) + x * z
+    prob += x + z >= -1
+
+    presolved, postsolve = prob.presolve()
+    assert sorted(postsolve.fixed) == ["y", "z"]
+    assert presolved.obj.isLinear()
+
+    prob.solve(solver="ScipyMilp", presolve=True)
+    assert flopt.Value([x, y, z]) == [5, 1, -3]
+    assert prob.obj.value() == -12
+
+
+def test_Problem_presolve_all_fixed():
+    a = Variable("a", lowBound=0, upBound=10, cat="Integer")
+    b = Variable("b", lowBound=0, upBound=10, cat="Integer")
+    prob = Problem()
+    prob += a + b
+    prob += a == 3
+    prob += b == 2
+
+    status, _ = prob.solve(solver="ScipyMilp", presolve=True)
+    assert status == flopt.SolverTerminateState.Normal
+    assert flopt.Value([a, b]) == [3, 2]
+    assert prob.getSolution().value().tolist() == [3, 2]
+
+
+@pytest.mark.parametrize("mmap_mode", [None, "r"])
+def test_Problem_save_load(tmp_path, mmap_mode):
+    x = Variable.array("x", 3, lowBound=0, upBound=4, ini_value=1, cat="Integer")
+    y = Variable("y", lowBound=-1, upBound=2.5, ini_value=0.5)
+    s = Variable("s", cat="Spin", ini_value=-1)
+    p = flopt.Parameter("p", value=3)
+
+    prob = Problem(name="save", sense="maximize")
+    prob += x[0] * x[1] + 2 * x[2] - y**2 + x[0] * x[1] * x[2] + s * y + 3, "obj"
+    prob += p * x[0] + y <= 5, "c"
+    prob += flopt.exp(y) + Sum([x[0], x[1]]) >= 1
+    prob += flopt.cos(y) * flopt.Prod([x[0], 2]) == 1
+    prob += MatrixConstraint([[1, 2, 0], [0, 1, 1]], x, ">=", [1, 2], name="M")
+
+    path = tmp_path / "prob.npz"
+    prob.save(path)
+    loaded = Problem.load(path, mmap_mode=mmap_mode)
+
+    assert (loaded.name, loaded.sense, loaded.obj_name) == ("save", "maximize", "obj")
+    variables = {var.name: var for var in loaded.getVariables()}
+    assert sorted(variables) == ["s", "x_0", "x_1", "x_2", "y"]
+    for var in prob.getVariables():
+        assert variables[var.name].type() == var.type()
+        assert variables[var.name].getLb() == var.getLb()
+        assert variables[var.name].getUb() == var.getUb()
+        assert variables[var.name].value() == var.value()
+    assert loaded.obj.value() == pytest.approx(prob.obj.value())
+    assert loaded.obj.isPolynomial()
+
+    assert [const.name for const in loaded.constraints] == ["c", None, None]
+    for const, loaded_const in zip(prob.constraints, loaded.constraints):
+        assert loaded_const.type() == const.type()
+        assert loaded_const.value() == pytest.approx(const.value())
+    assert loaded.matrix_constraints[0].name == "M"
+    assert loaded.matrix_constraints[0].value().tolist() == [-2, 0]
+
+    # parameters are kept as parameters
+    assert loaded.constraints[0].expression.toPolynomial().hasParameters()
+    variables["x_0"].setValue(2)
+    assert loaded.constraints[0].value() == pytest.approx(3 * 2 + 0.5 - 5)
+
+
+def test_Problem_save_CustomExpression(tmp_path):
+    x = Variable("x")
+    prob = Problem()
+    prob += CustomExpression(lambda x: x * x, [x])
+    with pytest.raises(ValueError):
+        prob.save(tmp_path / "prob.npz")
@@ -1,5 +1,7 @@
 import pytest
 
+import numpy as np
+
 import flopt
 import flopt.error
 from flopt import (
@@ -8,6 +10,7 @@ from flopt import (
     Solver,
     Solver_list,
     CustomExpression,
+    Sum,
     estimate_problem_type,
 )
 
@@ -172,6 +175,22 @@ def test_2Opt(prob_perm, callback):
     prob_perm.solve(solver="2-Opt", n_trial=10, timelimit=0.5, callbacks=[callback])
 
 
+def test_2Opt_TourDistance(callback):
+    n = 30
+    xy = np.random.rand(n, 2)
+    D = np.linalg.norm(xy[:, None] - xy[None, :], axis=2)
+    perm = Variable("perm", lowBound=0, upBound=n - 1, cat="Permutation")
+    tour_obj = flopt.TourDistance(D, perm)
+    _prob = Problem()
+    _prob += tour_obj
+    init_value = tour_obj.value()
+    solver = Solver(algo="2-Opt")
+    _prob.solve(solver, timelimit=0.5, callbacks=[callback])
+    assert sorted(perm.value()) == list(range(n))
+    assert tour_obj.value() < init_value
+    assert tour_obj.value() == pytest.approx(solver.best_obj_value)
+
+
 def test_2Opt_available(prob, prob_with_const, prob_qp, prob_nonlinear, prob_perm):
     solver = Solver(algo="2-Opt")
     assert solver.available(prob) == False
@@ -181,6 +200,58 @@ def test_2Opt_available(prob, prob_with_const, prob_qp, prob_nonlinear, prob_per
     assert solver.available(prob_perm) == True
 
 
+def test_TabuSearch1(prob_ising, callback):
+    prob_ising.solve(solver="Tabu", n_trial=100, timelimit=0.5, callbacks=[callback])
+    assert prob_ising.obj.value() == pytest.approx(-1)
+
+
+def test_TabuSearch2(callback):
+    x = Variable.array("x", 4, cat="Binary")
+    s = Variable("s", cat="Spin")
+    _prob = Problem()
+    _prob += x[0] * x[1] - x[1] * x[2] + 2 * x[2] * s - x[0] - x[3] * s + 1
+    _prob.solve(solver="Tabu", n_trial=100, timelimit=0.5, callbacks=[callback])
+    assert _prob.obj.value() == pytest.approx(-2)
+
+
+def test_TabuSearch_createQubo():
+    import itertools
+    from scipy import sparse
+    from flopt.solution import Solution
+    from flopt.solvers.tabu_search import TabuSearch
+
+    x = Variable.array("x", 3, cat="Binary")
+    s = Variable.array("s", 2, cat="Spin")
+    z = Variable("z", cat="Binary", ini_value=1)
+    obj = 3 * x[0] * x[1] + 2 * x[0] * x[0] - x[2] * s[0] + 4 * s[0] * s[1]
+    obj += 2 * z * x[1] - s[1] + z + 1
+    solution = Solution(list(x) + list(s))
+    qubo = TabuSearch().createQubo(solution, obj)
+    assert sparse.issparse(qubo.Q)
+
+    Q = qubo.Q.toarray()
+    for bits in itertools.product([0, 1], repeat=len(solution)):
+        for var, bit in zip(solution, bits):
+            var.setValue(
+                2 * bit - 1 if var.type() == flopt.constants.VariableType.Spin else bit
+            )
+        b = np.array(bits)
+        qubo_value = b.dot(np.triu(Q, k=1)).dot(b) + np.diag(Q).dot(b) + qubo.C
+        assert qubo_value == pytest.approx(obj.value())
+
+
+def test_TabuSearch_available(
+    prob, prob_ising, prob_ising_const, prob_qp, prob_nonlinear, prob_perm
+):
+    solver = Solver(algo="Tabu")
+    assert solver.available(prob) == False
+    assert solver.available(prob_ising) == True
+    assert solver.available(prob_ising_const) == False
+    assert solver.available(prob_qp) == False
+    assert solver.available(prob_nonlinear) == False
+    assert solver.available(prob_perm) == False
+
+
 def test_OptunaTPESearch1(prob, callback):
     """test to solve problem has only objective"""
     prob.solve(solver="OptunaTPE", n_trial=10, timelimit=0.5, callbacks=[callback])
@@ -212,6 +283,51 @@ def test_OptunaTPESearch4(prob_nonlinear, callback):
     )
 
 
+def test_OptunaTPESearch5(prob_with_const, callback):
+    """test to solve problem by batches of trials"""
+    prob_with_const.solve(
+        solver="OptunaTPE",
+        n_trial=20,
+        batch_size=4,
+        timelimit=1,
+        callbacks=[callback],
+    )
+    solution = prob_with_const.getSolution()
+    assert all(const.feasible(solution) for const in prob_with_const.getConstraints())
+
+
+def test_OptunaTPESearch6(prob, callback):
+    """test to solve problem by batches of trials evaluated in worker processes"""
+    prob.solve(
+        solver="OptunaTPE",
+        n_trial=20,
+        n_jobs=2,
+        batch_size=4,
+        timelimit=2,
+        callbacks=[callback],
+    )
+
+
+@pytest.mark.parametrize("filename", ["study.db", "study.log"])
+def test_OptunaTPESearch7(prob, filename, tmp_path):
+    """test to resume the study saved in the storage"""
+    import optuna
+
+    storage = str(tmp_path / filename)
+    for _ in range(2):
+        prob.solve(
+            solver="OptunaTPE",
+            n_trial=5,
+            timelimit=2,
+            storage=storage,
+            study_name="test",
+        )
+    solver = Solver(algo="OptunaTPE")
+    solver.setParams(storage=storage, study_name="test")
+    study = optuna.load_study(study_name="test", storage=solver.getStorage())
+    assert len(study.trials) == 10
+
+
 def test_OptunaTPESearch_available(
     prob, prob_only_continuous, prob_with_const, prob_qp, prob_nonlinear, prob_perm
 ):
@@ -245,6 +361,17 @@ def test_OptunaCmaEsSearch2(prob_only_continuous, callback):
     )
 
 
+def test_OptunaCmaEsSearch3(prob_only_continuous, callback):
+    """test to solve problem by batches of trials"""
+    prob_only_continuous.solve(
+        solver="OptunaCmaEs",
+        n_trial=20,
+        batch_size=4,
+        timelimit=1,
+        callbacks=[callback],
+    )
+
+
 def test_OptunaCmaEsSearch_available(
     prob, prob_only_continuous, prob_with_const, prob_qp, prob_nonlinear, prob_perm
 ):
@@ -328,6 +455,37 @@ def test_HyperoptSearch3(prob_only_continuous, callback):
     )
 
 
+def test_HyperoptSearch4(prob, callback):
+    """test to solve problem by batches of points evaluated in worker processes"""
+    prob.solve(
+        solver="Hyperopt",
+        n_trial=20,
+        n_jobs=2,
+        batch_size=4,
+        timelimit=2,
+        callbacks=[callback],
+    )
+
+
+def test_HyperoptSearch5(prob_ising, tmp_path):
+    """test to warm-start from the saved trials"""
+    import pickle
+
+    trials_file = str(tmp_path / "trials.pkl")
+    prob_ising.solve(solver="Hyperopt", n_trial=5, timelimit=2, trials_file=trials_file)
+    prob_ising.solve(
+        solver="Hyperopt",
+        n_trial=5,
+        batch_size=5,
+        timelimit=2,
+        trials_file=trials_file,
+    )
+    with open(trials_file, "rb") as f:
+        trials = pickle.load(f)
+    assert len(trials) == 10
+    assert all(loss is not None for loss in trials.losses())
+
+
 def test_HyperoptSearch_available(
     prob,
     prob_with_const,
@@ -381,6 +539,23 @@ def test_SFLA2(prob_only_continuous, callback):
     )
 
 
+def test_SFLA3(prob_ising, callback):
+    prob_ising.solve(
+        solver="SFLA", n_memetic_iter=10, timelimit=0.5, callbacks=[callback]
+    )
+    assert prob_ising.solver.best_solution.feasible()
+
+
+def test_SFLA_integer():
+    x = Variable.array("x", 3, lowBound=-2, upBound=2, cat="Integer")
+    prob = Problem()
+    prob += (x[0] - 0.4) ** 2 + (x[1] + 0.3) ** 2 + (x[2] - 1.45) ** 2
+    prob.solve(solver="SFLA", n_memetic_iter=10, timelimit=0.5)
+    solution = prob.getSolution()
+    assert all(isinstance(value, int) for value in flopt.Value(x))
+    assert prob.solver.best_obj_value == pytest.approx(prob.obj.value(solution))
+
+
 def test_SFLA_available(prob, prob_with_const, prob_qp, prob_nonlinear, prob_perm):
     solver = Solver(algo="SFLA")
     assert solver.available(prob) == True
@@ -390,6 +565,148 @@ def test_SFLA_available(prob, prob_with_const, prob_qp, prob_nonlinear, prob_per
     assert solver.available(prob_perm) == False
 
 
+def test_DifferentialEvolution1(prob, callback):
+    prob.solve(
+        solver="DifferentialEvolution",
+        n_trial=100,
+        timelimit=1,
+        callbacks=[callback],
+    )
+    assert prob.getSolution().value()[0] == 0
+
+
+def test_DifferentialEvolution2(prob_only_continuous, callback):
+    """test to solve problem with optimized_variables"""
+    variables = list(prob_only_continuous.getVariables())
+    non_optimized_values = [var.value() for var in variables[1:]]
+    prob_only_continuous.solve(
+        solver="DifferentialEvolution",
+        strategy="best1bin",
+        timelimit=0.5,
+        callbacks=[callback],
+        optimized_variables=variables[:1],
+    )
+    assert all(
+        var.value() == value for var, value in zip(variables[1:], non_optimized_values)
+    )
+
+
+def test_DifferentialEvolution3(prob_nonlinear, callback):
+    prob_nonlinear.constraints = []
+    prob_nonlinear.solve(
+        solver="DifferentialEvolution", timelimit=0.5, callbacks=[callback]
+    )
+
+
+def test_DifferentialEvolution_available(
+    prob, prob_with_const, prob_qp, prob_nonlinear, prob_perm
+):
+    solver = Solver(algo="DifferentialEvolution")
+    assert solver.available(prob) == True
+    assert solver.available(prob_with_const) == False
+    assert solver.available(prob_qp) == False
+    assert solver.available(prob_nonlinear) == False
+    assert solver.available(prob_perm) == False
+
+
+def test_ParticleSwarm1(prob, callback):
+    prob.solve(
+        solver="ParticleSwarm",
+        n_trial=100,
+        timelimit=1,
+        callbacks=[callback],
+    )
+    assert prob.getSolution().value()[0] == 0
+
+
+def test_ParticleSwarm2(prob_only_continuous, callback):
+    """test to solve problem with optimized_variables"""
+    variables = list(prob_only_continuous.getVariables())
+    non_optimized_values = [var.value() for var in variables[1:]]
+    prob_only_continuous.solve(
+        solver="ParticleSwarm",
+        timelimit=0.5,
+        callbacks=[callback],
+        optimized_variables=variables[:1],
+    )
+    assert all(
+        var.value() == value for var, value in zip(variables[1:], non_optimized_values)
+    )
+
+
+def test_ParticleSwarm_available(
+    prob, prob_with_const, prob_qp, prob_nonlinear, prob_perm
+):
+    solver = Solver(algo="ParticleSwarm")
+    assert solver.available(prob) == True
+    assert solver.available(prob_with_const) == False
+    assert solver.available(prob_qp) == False
+    assert solver.available(prob_nonlinear) == False
+    assert solver.available(prob_perm) == False
+
+
+def test_CmaEs1(prob, callback):
+    prob.solve(
+        solver="CmaEs",
+        n_trial=100,
+        timelimit=1,
+        callbacks=[callback],
+    )
+    assert prob.getSolution().value()[0] == 0
+
+
+def test_CmaEs2(prob_only_continuous, callback):
+    """test to solve problem with optimized_variables"""
+    variables = list(prob_only_continuous.getVariables())
+    non_optimized_values = [var.value() for var in variables[1:]]
+    prob_only_continuous.solve(
+        solver="CmaEs",
+        restart="bipop",
+        timelimit=0.5,
+        callbacks=[callback],
+        optimized_variables=variables[:1],
+    )
+    assert all(
+        var.value() == value for var, value in zip(variables[1:], non_optimized_values)
+    )
+
+
+def test_CmaEs3(prob_nonlinear, callback):
+    prob_nonlinear.constraints = []
+    prob_nonlinear.solve(
+        solver="CmaEs", separable=True, timelimit=0.5, callbacks=[callback]
+    )
+
+
+def test_CmaEs_available(prob, prob_with_const, prob_qp, prob_nonlinear, prob_perm):
+    solver = Solver(algo="CmaEs")
+    assert solver.available(prob) == True
+    assert solver.available(prob_with_const) == False
+    assert solver.available(prob_qp) == False
+    assert solver.available(prob_nonlinear) == False
+    assert solver.available(prob_perm) == False
+
+
+@pytest.mark.parametrize(
+    "algo", ["DifferentialEvolution", "ParticleSwarm", "CmaEs", "SFLA"]
+)
+def test_population_callback_solutions(algo):
+    """solutions passed to callbacks are not changed by the next iterations"""
+    x = Variable.array("x", 3, lowBound=-2, upBound=2, cat="Continuous")
+    prob = Problem()
+    prob += Sum(x * x)
+
+    history = []
+
+    def callback(solutions, *args):
+        history.extend((solution, list(solution.value())) for solution in solutions)
+
+    prob.solve(solver=algo, n_trial=5, timelimit=1, callbacks=[callback])
+    assert history
+    for solution, values in history:
+        assert list(solution.value()) == values
+
+
 def test_PulpSearch1(prob, callback):
     prob.solve(solver="Pulp", timelimit=0.5)
 
@@ -412,6 +729,32 @@ def test_PulpSearch4(prob_lp, callback):
     )
 
 
+@pytest.mark.parametrize("use_mps", [False, True])
+def test_PulpSearch5(prob_lp, use_mps, tmpdir):
+    """test to solve maximization problem with (or without) mps file"""
+    mps_file = str(tmpdir.join("model.mps")) if use_mps else None
+    prob_lp.solve(solver="Pulp", use_mps=use_mps, mps_file=mps_file)
+    assert prob_lp.obj.value(prob_lp.getSolution()) == pytest.approx(26)
+
+
+@pytest.mark.parametrize("algo", ["Pulp", "ScipyMilp", "Scipy", "Gurobi"])
+def test_MatrixConstraint_solve(algo):
+    from scipy.sparse import kron, eye
+    from flopt import MatrixConstraint
+
+    # assignment problem
+    n = 3
+    cost = np.array([[4, 1, 3], [2, 0, 5], [3, 2, 2]])
+    X = Variable.array("X", (n, n), lowBound=0, upBound=1)
+    prob = Problem()
+    prob += Sum(cost.ravel() * X.ravel())
+    prob += MatrixConstraint(kron(eye(n), np.ones((1, n))), X.ravel(), "==", 1)
+    prob += MatrixConstraint(kron(np.ones((1, n)), eye(n)), X.ravel(), ">=", 1)
+    prob.solve(solver=algo, timelimit=5)
+    assert prob.getObjectiveValue() == pytest.approx(5, abs=1e-4)
+    assert prob.getNumConstraints() == 6
+
+
 def test_PulpSearch_available(
     prob, prob_with_const, prob_qp, prob_nonlinear, prob_perm
 ):
@@ -482,6 +825,39 @@ def test_ScipySearch5(prob_with_const, callback):
     )
 
 
+@pytest.mark.parametrize("method", [None, "SLSQP", "trust-constr", "COBYLA"])
+def test_ScipySearch6(method, callback):
+    """test to solve problem with linear and nonlinear constraints"""
+    # fixed initial values (trust-constr can stall from some random ones
+    # because the objective is rounded for integer and spin variables)
+    a = Variable("a", lowBound=-2, upBound=1, cat="Integer", ini_value=0)
+    b = Variable("b", lowBound=1, upBound=4, cat="Continuous", ini_value=3.5)
+    c = Variable("c", lowBound=0, upBound=3, cat="Continuous", ini_value=0.5)
+    s = Variable("s", cat="Spin", ini_value=1)
+    prob = Problem()
+    prob += a * a + a * b + b + c + 2 + 3 * s
+    prob += a + b >= 2
+    prob += b - c == 3
+    prob += s + c >= 0.5
+    prob += b * b + c * c <= 12
+    status, _ = prob.solve(
+        solver="Scipy", method=method, timelimit=2, callbacks=[callback]
+    )
+    assert status == flopt.SolverTerminateState.Normal
+
+
+@pytest.mark.parametrize("method", ["L-BFGS-B", "trust-krylov", "trust-exact"])
+def test_ScipySearch7(prob_only_continuous, method, callback):
+    """test to solve problem with the compiled gradient and Hessian"""
+    prob_only_continuous.solve(
+        solver="Scipy",
+        method=method,
+        hessp_threshold=0,
+        timelimit=2,
+        callbacks=[callback],
+    )
+
+
 def test_ScipySearch_available(
     prob,
     prob_only_continuous,
@@ -575,12 +951,40 @@ def test_GurobiSearch2(prob_qp, callback):
     prob_qp.solve(solver="Gurobi", timelimit=0.5, callbacks=[callback])
 
 
+def test_GurobiSearch3():
+    """test to solve maximization problem with matrix and expression model building"""
+    a = Variable("a", 0, 1, "Integer")
+    b = Variable("b", 1, 2, "Continuous")
+    c = Variable("c", 0, 3, "Continuous")
+    prob = Problem(sense="Maximize")
+    prob += -2 * b * b + b * c + b + c
+    prob += b + c <= 3
+    prob += a + c == 1
+    prob.solve(solver="Gurobi", timelimit=1)
+    assert prob.obj.value(prob.getSolution()) == pytest.approx(1)
+
+    # quadratic constraint
+    prob += b * b + c <= 3
+    prob.solve(solver="Gurobi", timelimit=1)
+    assert prob.obj.value(prob.getSolution()) == pytest.approx(1)
+
+
 def test_CvxoptSearch1(prob_only_continuous, callback):
     prob_only_continuous.solve(
         solver="Cvxopt", n_trial=10, timelimit=0.5, callbacks=[callback]
     )
 
 
+def test_CvxoptSearch_lp():
+    x = Variable("x", lowBound=-1, upBound=1, cat="Continuous", ini_value=0)
+    y = Variable("y", lowBound=-1, upBound=1, cat="Continuous", ini_value=0)
+    prob = Problem(sense="Maximize")
+    prob += x + 2 * y
+    prob += x + y <= 1.5
+    prob.solve(solver="Cvxopt", timelimit=1)
+    assert prob.obj.value(prob.getSolution()) == pytest.approx(2.5, abs=1e-6)
+
+
 def test_CvxoptSearch2(prob_qp, callback):
     prob_qp.solve(solver="Cvxopt", n_trial=10, timelimit=0.5, callbacks=[callback])
 
@@ -31,3 +31,55 @@ def test_VarPermutation_colne(a):
     assert _a.getLb() == a.getLb()
     assert _a.getUb() == a.getUb()
     assert _a.type() == a.type()
+
+
+def test_VarPermutation_value():
+    a = Variable("a", lowBound=0, upBound=3, ini_value=[0, 1, 2, 3], cat="Permutation")
+    assert a.value() == [0, 1, 2, 3]
+    assert a[1] == 1
+    assert a[1:3] == [1, 2]
+    assert list(a) == [0, 1, 2, 3]
+    assert len(a) == 4
+    a.setValue([3, 2, 1, 0])
+    assert a.value() == [3, 2, 1, 0]
+
+
+def test_VarPermutation_view():
+    a = Variable("a", lowBound=0, upBound=3, ini_value=[0, 1, 2, 3], cat="Permutation")
+    view = a.view()
+    assert view.tolist() == [0, 1, 2, 3]
+    with pytest.raises(ValueError):
+        view[0] = 1
+    a.reverse(0, 2)
+    assert view.tolist() == [1, 0, 2, 3]
+
+
+def test_VarPermutation_reverse():
+    a = Variable(
+        "a", lowBound=0, upBound=4, ini_value=[0, 1, 2, 3, 4], cat="Permutation"
+    )
+    a.reverse(1, 4)
+    assert a.value() == [0, 3, 2, 1, 4]
+
+
+def test_VarPermutation_swap():
+    a = Variable(
+        "a", lowBound=0, upBound=4, ini_value=[0, 1, 2, 3, 4], cat="Permutation"
+    )
+    a.swap(1, 3)
+    assert a.value() == [0, 3, 2, 1, 4]
+
+
+def test_VarPermutation_insert():
+    a = Variable(
+        "a", lowBound=0, upBound=4, ini_value=[0, 1, 2, 3, 4], cat="Permutation"
+    )
+    a.insert(1, 3)
+    assert a.value() == [0, 2, 3, 1, 4]
+    a.insert(3, 0)
+    assert a.value() == [1, 0, 2, 3, 4]
+
+
+def test_VarPermutation_setRandom(a):
+    a.setRandom()
+    assert sorted(a.value()) == [0, 1, 2, 3, 4]
@@ -223,3 +223,36 @@ def test_convert_binarize7():
     prob += x[0] >= 1
     binarize(prob)
     linearize(prob)
+
+
+def test_convert_linearize_shared_products():
+    x = Variable.array("x", 3, cat="Binary")
+    y = Variable("y", lowBound=-2, upBound=3, cat="Integer")
+
+    prob = Problem()
+    prob += x[0] * x[1] - 2 * x[1] * x[0] * x[2] + x[0] * y
+    prob += x[1] * x[0] + x[2] >= 1
+    linearize(prob)
+
+    assert prob.obj.isLinear()
+    assert all(const.isLinear() for const in prob.getConstraints())
+    # x_0*x_1 is shared by the objective and the constraint
+    assert len(prob.matrix_constraints) == 1
+    assert len(prob.matrix_constraints[0]) == 3 + 3 + 4
+
+    prob.solve(solver="ScipyMilp")
+    values = [var.value() for var in x]
+    assert values[0] * values[1] + values[2] >= 1
+    assert prob.obj.value() == 1 - 2 - 2  # x = (1, 1, 1), y = -2
+
+
+def test_convert_linearize_spin():
+    s = Variable.array("s", 2, cat="Spin")
+
+    prob = Problem()
+    prob += s[0] * s[1] + s[0]
+    linearize(prob)
+
+    assert prob.obj.isLinear()
+    prob.solve(solver="ScipyMilp")
+    assert prob.obj.value() == -1 - 1  # s = (-1, 1)
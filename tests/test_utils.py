@@ -93,3 +93,79 @@ def test_dot_graph_Prod(tmpdir):
 
     path = tmpdir.mkdir("save").join("tmp4.txt")
     get_dot_graph(z, path)
+
+
+def test_create_batch_evaluator():
+    from flopt.solvers.solver_utils import create_batch_evaluator
+    from flopt import exp, cos, abs
+
+    x = Variable.array("x", 3)
+    y = Variable("y", ini_value=2)
+    X = np.array([[1, 2, 3], [0.5, -1, 2]])
+    for expression in [
+        x[0] * x[1] ** 2 + 3 * x[2] - x[0] * y + 1,
+        exp(x[0]) + x[1] * x[2],
+        exp(y),
+    ]:
+        values = []
+        for row in X:
+            for var, value in zip(x, row):
+                var.setValue(value)
+            values.append(expression.value())
+        evaluate = create_batch_evaluator(expression, x)
+        assert evaluate(X) == pytest.approx(values)
+
+
+def test_PopulationEncoder():
+    from flopt.solution import Solution
+    from flopt.solvers.solver_utils import PopulationEncoder
+
+    a = Variable("a", lowBound=-1, upBound=1, cat="Continuous")
+    b = Variable("b", lowBound=0, upBound=3, cat="Integer")
+    s = Variable("s", cat="Spin")
+    encoder = PopulationEncoder(Solution([a, b, s]))
+
+    X = encoder.repair(np.array([[0.5, 1.7, 0.2], [-2.0, 5.0, -0.3]]))
+    assert X.tolist() == [[0.5, 2, 1], [-1, 3, -1]]
+
+    X = encoder.random(100)
+    assert np.all((encoder.lb <= X) & (X <= encoder.ub))
+    assert np.all(X[:, 1] == np.round(X[:, 1]))
+    assert set(X[:, 2]) <= {-1, 1}
+
+    solutions = encoder.toSolutions(X[:2])
+    assert [list(solution.value()) for solution in solutions] == X[:2].tolist()
+    assert list(encoder.toSolution(X[0]).value()) == X[0].tolist()
+
+
+def test_create_gradient_evaluator():
+    from flopt.solvers.solver_utils import (
+        create_gradient_evaluator,
+        create_hessp_evaluator,
+    )
+    from flopt import exp, cos, abs
+
+    x = Variable.array("x", 3)
+    y = Variable("y", ini_value=2)
+    values = np.array([0.5, -1.2, 2.0])
+    p = np.array([1.0, 2.0, -1.0])
+    for var, value in zip(x, values):
+        var.setValue(value)
+    for expression in [
+        x[0] ** 3 * x[1] * x[2] ** 2 + 3 * x[1] ** 2 - y * x[2] + 5,
+        exp(x[0]) * x[1] + x[2] * x[2],
+        Sum([xi**2 - 10 * cos(xi * y) for xi in x]) - exp(x[0] - x[2]),
+    ]:
+        gradient = create_gradient_evaluator(expression, x)
+        hessp = create_hessp_evaluator(expression, x)
+        assert gradient(values) == pytest.approx(expression.jac(x).value(), rel=1e-5)
+        assert hessp(values, p) == pytest.approx(
+            expression.hess(x).value().dot(p), rel=1e-4
+        )
+
+    # finite differences for non-differentiable expressions
+    expression = abs(x[0] - 1) + x[1] * x[2]
+    gradient = create_gradient_evaluator(expression, x)
+    hessp = create_hessp_evaluator(expression, x)
+    assert gradient(values) == pytest.approx([-1.0, 2.0, -1.2], rel=1e-5)
+    assert hessp(values, p) == pytest.approx([0.0, -1.0, 2.0], rel=1e-4)